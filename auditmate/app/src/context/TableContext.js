@@ -1,4 +1,4 @@
-import React, { createContext, useState, useEffect, useCallback, useMemo, useContext } from 'react';
+import React, { createContext, useState, useEffect, useCallback, useMemo, useContext, useRef } from 'react';
 import axios from 'axios';
 import debounce from 'lodash.debounce';
 import { useLocation } from 'react-router-dom';
@@ -6,6 +6,47 @@ import { RuleContext } from './RuleContext';
 
 export const TableContext = createContext();
 
+const CHANGE_POLL_INTERVAL = 5000; // 다른 사용자의 변경사항 조회 주기 (ms)
+
+// 서버에서 받은 행의 '검토사항'을 항상 배열로 변환
+const normalizeRow = (row) => ({
+  ...row,
+  검토사항: Array.isArray(row.검토사항)
+    ? row.검토사항
+    : typeof row.검토사항 === 'string' && row.검토사항.trim() !== ''
+      // 괄호 밖 쉼표만 분할
+      ? row.검토사항.split(/,(?![^(]*\))/).map(s => s.trim())
+      : []
+});
+
+// 서버로 보낼 형태 ('검토사항' 배열을 문자열로)
+const toServerRow = (row) => ({
+  ...row,
+  검토사항: Array.isArray(row.검토사항) ? row.검토사항.join(', ') : row.검토사항
+});
+
+// 빈 문자열과 null/undefined는 같은 값으로 비교 (서버도 빈 값은 null로 기록)
+const sameValue = (a, b) => {
+  const emptyA = a === null || a === undefined || a === '';
+  const emptyB = b === null || b === undefined || b === '';
+  return emptyA || emptyB ? emptyA && emptyB : JSON.stringify(a) === JSON.stringify(b);
+};
+
+// 마지막으로 서버와 맞춘 행(syncedRows)과 비교해 바뀐 셀만 [{row_index, column, value}]로 모음
+const collectChanges = (data, syncedRows) => {
+  const changes = [];
+  data.forEach((row, rowIndex) => {
+    const serverRow = toServerRow(row);
+    const synced = syncedRows[rowIndex] ?? {};
+    Object.keys({ ...synced, ...serverRow }).forEach(column => {
+      if (!sameValue(serverRow[column], synced[column])) {
+        changes.push({ row_index: rowIndex, column, value: serverRow[column] ?? null });
+      }
+    });
+  });
+  return changes;
+};
+
 const TableProvider = ({ children }) => {
   const location = useLocation();
   const { ruleLoading, selectedCategoryRule, selectedDocumentRule } = useContext(RuleContext);
@@ -13,31 +54,36 @@ const TableProvider = ({ children }) => {
   const [tableData, setTableData] = useState([]);
   const [tableLoading, setTableLoading] = useState(false);
   const [isEditing, setIsEditing] = useState(false);
+  // 마지막으로 동기화한 폴더 버전과 그 시점의 행 (서버 형태), 읽기 전에는 null
+  const versionRef = useRef(null);
+  const syncedRowsRef = useRef([]);
+  const tableDataRef = useRef(tableData);
   
   const fetchExcelData = useCallback(async () => {
     if (!selectedXlsxFile) return;
+    versionRef.current = null; // 읽는 동안에는 저장/변경 조회 안 함
     setTableData([]); // 데이터 초기화
     setTableLoading(true); // 로딩 시작
 
     try {
-      const response = await axios.post('http://localhost:8000/api/read-xlsx/', {
-        folderName: selectedXlsxFile?.folderName,
-        xlsxFile: selectedXlsxFile?.xlsxFile,
+      // GET으로 요청해 브라우저가 ETag로 재검증하게 함 (파일이 그대로면 서버는 파싱 없이 304 응답)
+      const response = await axios.get('http://localhost:8000/api/read-xlsx/', {
+        params: {
+          folderName: selectedXlsxFile?.folderName,
+          xlsxFile: selectedXlsxFile?.xlsxFile,
+          format: 'compact', // 헤더는 actual_columns로 한 번만 받고 행은 값 배열로 받음
+        },
       });
 
-      const { status, data, message, extra_columns } = response.data;
+      const { status, data, message, extra_columns, actual_columns, version } = response.data;
 
       if (status === 'success') {
-        // '검토사항'을 항상 배열로 변환
-        const normalizedData = data.map(row => ({
-          ...row,
-          검토사항: Array.isArray(row.검토사항)
-            ? row.검토사항
-            : typeof row.검토사항 === 'string' && row.검토사항.trim() !== ''
-              // 괄호 밖 쉼표만 분할
-              ? row.검토사항.split(/,(?![^(]*\))/).map(s => s.trim())
-              : []
-        }));
+        // 값 배열을 {컬럼: 값} 객체로 되돌리고 '검토사항'을 항상 배열로 변환
+        const normalizedData = data.map(values =>
+          normalizeRow(Object.fromEntries(actual_columns.map((column, idx) => [column, values[idx] ?? null])))
+        );
+        syncedRowsRef.current = normalizedData.map(toServerRow);
+        versionRef.current = version ?? 0;
         setTableData(normalizedData);
         setTableLoading(false); // 로딩 완료
       } else if (status === 'warning') {
@@ -61,23 +107,107 @@ const TableProvider = ({ children }) => {
     }
   }, [selectedXlsxFile]); 
 
+  // 서버에서 받은 행 값을 동기화 기준과 표에 반영 (아직 저장하지 않은 로컬 변경 셀은 유지, overwriteRows의 행은 서버 값으로 덮어씀)
+  const applyServerRows = useCallback((rows, totalRows, overwriteRows = new Set()) => {
+    const previousSynced = syncedRowsRef.current;
+    const synced = previousSynced.slice(0, totalRows ?? previousSynced.length);
+    rows.forEach(({ row_index, values }) => {
+      synced[row_index] = { ...(synced[row_index] ?? {}), ...values };
+    });
+    for (let idx = 0; idx < synced.length; idx++) {
+      if (!synced[idx]) synced[idx] = {};
+    }
+    syncedRowsRef.current = synced;
+
+    setTableData(prev => {
+      const next = prev.slice(0, synced.length);
+      rows.forEach(({ row_index, values }) => {
+        const local = next[row_index] ? toServerRow(next[row_index]) : {};
+        const before = previousSynced[row_index] ?? {};
+        const merged = { ...local };
+        Object.entries(values).forEach(([column, value]) => {
+          if (overwriteRows.has(row_index) || sameValue(local[column], before[column])) {
+            merged[column] = value;
+          }
+        });
+        next[row_index] = normalizeRow(merged);
+      });
+      for (let idx = next.length; idx < synced.length; idx++) {
+        next[idx] = next[idx] ?? normalizeRow(synced[idx]);
+      }
+      return next;
+    });
+  }, []);
+
+  // since 버전 이후 바뀐 행만 받아 반영 (기록이 없는 오래된 버전이면 전체를 다시 읽음)
+  const pullChanges = useCallback(async (since = versionRef.current, overwriteRows) => {
+    if (!selectedXlsxFile || since === null) return;
+    try {
+      const response = await axios.get(`http://localhost:8000/api/changes/${selectedXlsxFile.folderName}/`, {
+        params: { since },
+      });
+      const { status, version, reset, rows, totalRows } = response.data;
+      if (status !== 'success') return;
+      if (reset) {
+        fetchExcelData();
+        return;
+      }
+      applyServerRows(rows, totalRows, overwriteRows);
+      versionRef.current = version;
+    } catch (error) {
+      console.error("Error fetching changes:", error);
+    }
+  }, [selectedXlsxFile, fetchExcelData, applyServerRows]);
+
   const saveTableData = useCallback(async (data) => {
-    // 서버로 보낼 때만 변환
-    const dataToSave = data.map(row => ({
-      ...row,
-      검토사항: Array.isArray(row.검토사항) ? row.검토사항.join(', ') : row.검토사항
-    }));
+    // 서버에서 읽기 전(localStorage에서 복원한 표 등)에는 저장하지 않음
+    const baseVersion = versionRef.current;
+    if (baseVersion === null) return;
+
+    // 마지막 동기화 이후 바뀐 셀만 전송 (행 수가 달라졌을 때만 전체 저장)
+    const changes = collectChanges(data, syncedRowsRef.current);
+    const fullSave = data.length !== syncedRowsRef.current.length;
+    if (changes.length === 0 && !fullSave) return;
+
+    const target = {
+      folderName: selectedXlsxFile?.folderName,
+      xlsxFile: selectedXlsxFile?.xlsxFile,
+      lastModified: selectedXlsxFile?.lastModified,
+      baseVersion,
+    };
     try {
-      await axios.post('http://localhost:8000/api/save-xlsx/', {
-        folderName: selectedXlsxFile?.folderName,
-        xlsxFile: selectedXlsxFile?.xlsxFile,
-        lastModified: selectedXlsxFile?.lastModified,
-        data: dataToSave,
+      const response = fullSave
+        ? await axios.post('http://localhost:8000/api/save-xlsx/', { ...target, data: data.map(toServerRow) })
+        : await axios.post('http://localhost:8000/api/patch-xlsx/', { ...target, changes });
+
+      const synced = fullSave ? data.map(toServerRow) : [...syncedRowsRef.current];
+      changes.forEach(({ row_index, column, value }) => {
+        synced[row_index] = { ...(synced[row_index] ?? {}), [column]: value };
       });
+      syncedRowsRef.current = synced;
+
+      const { version } = response.data;
+      if (version > baseVersion + 1) {
+        // 그 사이 다른 사용자가 저장한 행도 받아옴
+        await pullChanges(baseVersion);
+      } else {
+        versionRef.current = version;
+      }
     } catch (error) {
+      if (error.response?.status === 409) {
+        // 다른 사용자가 먼저 수정한 행: 서버 값으로 되돌리고 나머지 변경은 다음 저장에 다시 보냄
+        const { message, conflicts, reset } = error.response.data;
+        alert(message);
+        if (reset) {
+          fetchExcelData();
+        } else {
+          await pullChanges(baseVersion, new Set(conflicts));
+        }
+        return;
+      }
       console.error("Error saving data:", error);
     }
-  }, [selectedXlsxFile]);
+  }, [selectedXlsxFile, pullChanges, fetchExcelData]);
 
   const debouncedSave = useMemo(
     () => debounce((data) => {
@@ -89,9 +219,26 @@ const TableProvider = ({ children }) => {
   
   // 파일이 바뀌면 즉시 데이터 비움
   useEffect(() => {
+    versionRef.current = null;
+    syncedRowsRef.current = [];
     setTableData([]); // 파일이 바뀌면 즉시 데이터 비움
   }, [selectedXlsxFile]);
 
+  useEffect(() => {
+    tableDataRef.current = tableData;
+  }, [tableData]);
+
+  // 표를 보는 동안 주기적으로 다른 사용자의 변경사항 조회 (저장하지 않은 로컬 변경이 있으면 저장 후에 조회)
+  useEffect(() => {
+    if (!location.pathname.includes('/reviewTable/') || !selectedXlsxFile || isEditing) return undefined;
+    const timer = setInterval(() => {
+      if (collectChanges(tableDataRef.current, syncedRowsRef.current).length === 0) {
+        pullChanges();
+      }
+    }, CHANGE_POLL_INTERVAL);
+    return () => clearInterval(timer);
+  }, [location.pathname, selectedXlsxFile, isEditing, pullChanges]);
+
   // 앱 시작 시 localStorage에서 복원
   useEffect(() => {
     const savedFile = localStorage.getItem('selectedXlsxFile');
@@ -0,0 +1,7 @@
+"""
+AuditMate 백엔드 벤치마크
+
+합성 집행내역 원장(ledgers)을 만들어 각 API를 Django 테스트 클라이언트로 호출하고(runner),
+지연시간 백분위수, 최대 RSS, 워크북 파싱 횟수를 JSON으로 기록합니다.
+실행: python manage.py run_benchmarks --sizes 1000,10000 --baseline <이전 결과 JSON>
+"""
@@ -0,0 +1,207 @@
+"""
+xlsx 리더 백엔드 적합성 검사
+
+fast 리더(xlsx_fast_reader)가 openpyxl 읽기 전용 모드와 같은 값 튜플을 만드는지
+여러 행 구간(min_row/max_row)에 대해 비교합니다. 검사용 파일은 두 가지로 만듭니다.
+    - openpyxl로 저장한 파일: 공유 문자열, 날짜/시간/경과 시간, 불리언, 수식(캐시 값 없음), 빈 행/열
+    - 직접 작성한 패키지: 행/셀 좌표 생략, 서식 있는 문자열(rPh 포함), x005F_ 이스케이프, t="d"/"e"/"str",
+      지수 표기 숫자, 범위를 벗어난 날짜, 사용자 지정 날짜 서식, 1904 날짜 체계, 절대 경로 관계
+실행: python manage.py check_reader_conformance [xlsx 파일 ...]
+"""
+import os
+import zipfile
+import warnings
+import datetime
+
+import openpyxl
+
+from ..constants import WORKSHEET_NAME
+from ..xlsx_reader import open_worksheet
+from .ledgers import build_ledger
+
+# 비교할 (min_row, max_row) 구간
+ROW_WINDOWS = ((1, None), (3, None), (1, 4), (2, 6), (6, 40), (20, 25))
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/worksheets/sheet2.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<workbookPr{date1904}/>
+<sheets>
+<sheet name="기타" sheetId="1" r:id="rId1"/>
+<sheet name="{sheet_name}" sheetId="2" r:id="rId2"/>
+</sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="/xl/worksheets/sheet2.xml"/>
+<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId4" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+
+STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<numFmts count="2">
+<numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd hh:mm"/>
+<numFmt numFmtId="165" formatCode="[h]:mm:ss"/>
+</numFmts>
+<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="1"><fill><patternFill patternType="none"/></fill></fills>
+<borders count="1"><border/></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="5">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+</cellXfs>
+</styleSheet>"""
+
+SHARED_STRINGS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="6" uniqueCount="6">
+<si><t>번호</t></si>
+<si><t xml:space="preserve"> 사용일자 </t></si>
+<si><r><rPr><b/></rPr><t>세목</t></r><r><t>명</t></r><rPh sb="0" eb="2"><t>세목</t></rPh></si>
+<si><t>금액_x005F_x000D_</t></si>
+<si><t/></si>
+<si><t>검토사항</t></si>
+</sst>"""
+
+OTHER_SHEET = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<sheetData><row r="1"><c r="A1" t="s"><v>0</v></c></row></sheetData>
+</worksheet>"""
+
+# 행/셀 좌표 생략, 빠진 행과 열, 모든 셀 형식을 섞은 집행내역 시트
+LEDGER_SHEET = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac">
+<dimension ref="A1:B2"/>
+<sheetData>
+<row r="1" spans="1:6" x14ac:dyDescent="0.3"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c><c r="D1" t="s"><v>3</v></c><c r="E1" t="s"><v>4</v></c><c r="F1" t="s"><v>5</v></c></row>
+<row r="2"><c r="A2"><v>1</v></c><c r="B2" s="1"><v>45352</v></c><c r="C2" t="str"><f>"여"&amp;"비"</f><v>여비</v></c><c r="D2" s="4"><v>1234.5</v></c><c r="E2" t="inlineStr"><is><r><t>인라인</t></r><r><rPr><i/></rPr><t xml:space="preserve"> 문자열</t></r></is></c><c r="F2" t="b"><v>1</v></c><c r="H2" s="2"><v>45352.395833333336</v></c></row>
+<row r="5"><c><v>2</v></c><c t="e"><v>#N/A</v></c><c><v>1E-3</v></c><c><v>-2.5e+3</v></c><c s="3"><v>1.25</v></c></row>
+<row><c r="A6"><v>3</v></c><c r="C6" t="d"><v>2024-03-01T09:30:00</v></c><c r="D6"><f>SUM(D2:D5)</f></c><c r="E6" s="0"/></row>
+<row r="8"/>
+<row r="9" spans="1:9"><c r="A9" s="1"><v>10000000000</v></c><c r="D9" t="s"><v>4</v></c><c r="I9"><v>0</v></c></row>
+<row r="12"><c r="B12" t="b"><v>0</v></c><c r="C12" t="s"/><c r="D12" s="1"><v>0.5</v></c></row>
+<row r="30"><c r="AA30"><v>7</v></c></row>
+</sheetData>
+<mergeCells count="1"><mergeCell ref="A30:B30"/></mergeCells>
+</worksheet>"""
+
+
+def build_package_workbook(path, date1904=False, sheet_name=WORKSHEET_NAME):
+    """
+    직접 작성한 xlsx 패키지를 path에 저장합니다.
+    """
+    parts = {
+        "[Content_Types].xml": CONTENT_TYPES,
+        "_rels/.rels": ROOT_RELS,
+        "xl/workbook.xml": WORKBOOK.format(date1904=' date1904="1"' if date1904 else "", sheet_name=sheet_name),
+        "xl/_rels/workbook.xml.rels": WORKBOOK_RELS,
+        "xl/styles.xml": STYLES,
+        "xl/sharedStrings.xml": SHARED_STRINGS,
+        "xl/worksheets/sheet1.xml": OTHER_SHEET,
+        "xl/worksheets/sheet2.xml": LEDGER_SHEET,
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content.encode("utf-8"))
+    return path
+
+
+def build_openpyxl_workbook(path):
+    """
+    openpyxl로 여러 값 형식을 담은 집행내역 시트를 저장합니다. (문자열은 공유 문자열로 저장됨)
+    """
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = WORKSHEET_NAME
+    worksheet.append(["2024년도 연구비 집행내역"])
+    worksheet.append([])
+    worksheet.append(["번호", "사용일자", "세목명", "금액", "소요시간", "확인", "검토사항", "메모"])
+    base = datetime.datetime(2024, 3, 1, 9, 0)
+    for number in range(1, 40):
+        worksheet.append([
+            number,
+            base + datetime.timedelta(days=number, minutes=number * 7),
+            ["여비", "회의비", "재료비 "][number % 3],
+            number * 1000.25 if number % 5 else number * 1000,
+            datetime.timedelta(hours=number % 30, minutes=15),
+            number % 2 == 0,
+            "이상 없음" if number % 4 == 0 else None,
+            f"=D{number + 3}*2" if number % 7 == 0 else None,
+        ])
+    worksheet.cell(row=50, column=12, value=datetime.date(2024, 12, 31))
+    worksheet.cell(row=51, column=2, value=datetime.time(13, 45, 30))
+    workbook.save(path)
+    return path
+
+
+def _build_ledger(path):
+    build_ledger(path, 300)
+    return path
+
+
+def build_conformance_workbooks(work_dir):
+    os.makedirs(work_dir, exist_ok=True)
+    return [
+        build_package_workbook(os.path.join(work_dir, "package.xlsx")),
+        build_package_workbook(os.path.join(work_dir, "package_1904.xlsx"), date1904=True),
+        build_package_workbook(os.path.join(work_dir, "package_fallback.xlsx"), sheet_name="Sheet"),
+        build_openpyxl_workbook(os.path.join(work_dir, "openpyxl.xlsx")),
+        _build_ledger(os.path.join(work_dir, "ledger.xlsx")),
+    ]
+
+
+def read_rows(file_path, backend, min_row=1, max_row=None):
+    # 검사 파일에 일부러 넣은 범위 밖 날짜 등에 대한 openpyxl 경고는 표시하지 않음
+    # (기본 스타일이 없는 검사 파일을 열 때 나오는 경고도 포함하도록 파일을 열기 전에 설정)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with open_worksheet(file_path, fallback_first=True, backend=backend) as worksheet:
+            if worksheet is None:
+                return None, None
+            return worksheet.title, list(worksheet.iter_rows(min_row=min_row, max_row=max_row, values_only=True))
+
+
+def compare_backends(file_path, windows=ROW_WINDOWS):
+    """
+    구간별로 두 백엔드의 결과를 비교해 다른 점 목록을 반환합니다. (같으면 빈 목록)
+    """
+    mismatches = []
+    for min_row, max_row in windows:
+        expected_title, expected = read_rows(file_path, "openpyxl", min_row, max_row)
+        title, actual = read_rows(file_path, "fast", min_row, max_row)
+        window = f"{min_row}~{max_row or ''}"
+        if title != expected_title:
+            mismatches.append(f"{window}: 시트 이름 {title!r} != {expected_title!r}")
+            continue
+        if expected is None:
+            continue
+        if len(actual) != len(expected):
+            mismatches.append(f"{window}: 행 수 {len(actual)} != {len(expected)}")
+        for offset, (row, expected_row) in enumerate(zip(actual, expected)):
+            if row != expected_row or [type(v) for v in row] != [type(v) for v in expected_row]:
+                mismatches.append(f"{window}: {min_row + offset}행 {row!r} != {expected_row!r}")
+                break
+    return mismatches
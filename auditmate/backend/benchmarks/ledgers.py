@@ -0,0 +1,108 @@
+"""
+벤치마크용 합성 집행내역 원장 생성
+
+COMMON_HEADER_COLUMNS 헤더를 가진 "집행내역" 시트를 만들며, 헤더 위에 column_line개의 제목 행을 둡니다.
+검토사항은 앞쪽 review_ratio 비율의 행까지만 채워 진행도가 실제 작업 중인 파일처럼 나오게 합니다.
+쓰기 전용 워크북으로 한 행씩 기록하므로 10만 행도 메모리를 많이 쓰지 않습니다.
+"""
+import random
+import datetime
+
+import openpyxl
+
+from ..constants import WORKSHEET_NAME, COMMON_HEADER_COLUMNS, PROGRESS_COLUMN
+
+LEDGER_HEADERS = list(dict.fromkeys(COMMON_HEADER_COLUMNS))
+
+PHASE_VALUES = ["여비", "회의비", "재료비", "일반수용비", "인건비", "업무추진비"]
+PROOF_VALUES = ["카드", "계좌이체", "세금계산서", "현금영수증"]
+BUDGET_VALUES = ["운영비", "활동비", "연구재료비", "연구활동비"]
+VENDOR_VALUES = ["(주)가나상사", "다라문구", "마바식당", "사아여행사", "자차인쇄", "카타전자"]
+SUMMARY_WORDS = ["출장", "회의", "다과", "교통비", "숙박", "인쇄", "소모품", "장비", "자문", "수당"]
+REVIEW_VALUES = [
+    "카드전표(승인번호: 12345678)",
+    "출장신청서, 출장보고서",
+    "회의록(참석자, 일시)",
+    "세금계산서, 거래명세서",
+    "이상 없음",
+]
+
+DATE_COLUMNS = {"사용일자", "집행실행일자", "사업집행일자"}
+AMOUNT_COLUMNS = {"금액", "집행금액", "인출액(B)", "입금액(C)", "집행금액(A+B)-C", "예산"}
+
+
+def _cell_value(column, row_number, rng, base_date, reviewed):
+    if column in ("번호", "N"):
+        return row_number
+    if column in DATE_COLUMNS:
+        return base_date + datetime.timedelta(days=row_number // 40, minutes=row_number % 600)
+    if column in AMOUNT_COLUMNS:
+        return rng.randrange(1, 5000) * 100
+    if column == "세목명":
+        return rng.choice(PHASE_VALUES)
+    if column == "증빙구분":
+        return rng.choice(PROOF_VALUES)
+    if column in ("비목명", "항목"):
+        return rng.choice(BUDGET_VALUES)
+    if column in ("거래처명", "예금주명"):
+        return rng.choice(VENDOR_VALUES)
+    if column == "회계연도":
+        return base_date.year
+    if column in ("적요", "내역", "집행용도", "집행내역", "세부"):
+        return " ".join(rng.sample(SUMMARY_WORDS, 2))
+    if column == "집행구분":
+        return rng.choice(["일반", "정산"])
+    if column == PROGRESS_COLUMN:
+        return rng.choice(REVIEW_VALUES) if reviewed else None
+    if column in ("메모", "보완사항", "답변", "취소사유"):
+        return "확인 필요" if reviewed and rng.random() < 0.05 else None
+    return None
+
+
+def build_ledger(path, rows, column_line=2, review_ratio=0.4, seed=0):
+    """
+    rows개 데이터 행을 가진 합성 원장을 path에 저장하고 헤더 목록을 반환합니다.
+    """
+    rng = random.Random(seed)
+    base_date = datetime.datetime(2024, 3, 1, 9, 0)
+    reviewed_rows = int(rows * review_ratio)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(WORKSHEET_NAME)
+    for line in range(column_line):
+        worksheet.append([f"{base_date.year}년도 연구비 집행내역" if line == 0 else None])
+    worksheet.append(LEDGER_HEADERS)
+    for row_number in range(1, rows + 1):
+        reviewed = row_number <= reviewed_rows
+        worksheet.append([
+            _cell_value(column, row_number, rng, base_date, reviewed) for column in LEDGER_HEADERS
+        ])
+
+    # 다른 시트가 있는 파일도 흔하므로 작은 참고 시트를 함께 둠
+    summary = workbook.create_sheet("요약")
+    summary.append(["구분", "금액"])
+    summary.append(["합계", None])
+    workbook.save(path)
+    return LEDGER_HEADERS
+
+
+def build_rule():
+    """
+    합성 원장의 세목명/증빙구분 값에 맞춘 documentRule
+    """
+    return {
+        "세목별서류": {
+            "여비": {"사전승인": ["출장신청서"], "수행확인": ["출장보고서"]},
+            "회의비": {"수행과정": ["회의록"]},
+            "업무추진비": {"사전승인": ["업무추진계획서"]},
+        },
+        "증빙구분별서류": {
+            "카드": {"실지급입증": ["카드전표"]},
+            "계좌이체": {"실지급입증": ["이체확인증"]},
+            "세금계산서": {"판매사실입증": ["세금계산서", "거래명세서"]},
+        },
+        "서류별기입항목": {
+            "카드전표": ["승인번호"],
+            "회의록": ["참석자", "일시"],
+        },
+    }
@@ -0,0 +1,318 @@
+"""
+API 벤치마크 실행과 기준 결과 비교
+
+크기별로 합성 원장 하나를 업로드해 두고, 각 시나리오(API 호출)를 iterations번 반복하며
+요청 하나의 지연시간(응답 본문을 끝까지 읽을 때까지), 시트 파싱/스냅숏 읽기 횟수, 최대 RSS를 기록합니다.
+업로드/규칙/내보내기 폴더는 임시 디렉터리로 바꿔 실행하므로 실제 Upload_file 등에는 손대지 않습니다.
+
+결과 JSON 형식
+    {"createdAt", "python", "platform", "sizes", "iterations",
+     "results": {"<행 수>/<시나리오>": {"count", "errors", "minMs", "meanMs", "p50Ms", "p90Ms", "p95Ms", "p99Ms",
+                                       "maxMs", "parses", "snapshotLoads", "peakRssBytes"}}}
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import datetime
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+from django.test import Client
+from django.test.utils import override_settings
+
+from .. import views, job_queue
+from ..constants import METADATA_FILENAME
+from ..workbook_cache import cache_stats, invalidate_sheet_data
+from ..edit_journal import has_pending_entries, compact_journal
+from ..sheet_snapshot import snapshot_path
+from .ledgers import build_ledger, build_rule
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+PERCENTILES = (50, 90, 95, 99)
+RULE_NAME = "benchmark_rule"
+
+
+def peak_rss_bytes():
+    """
+    이 프로세스의 최대 RSS (알 수 없으면 None)
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return peak if sys.platform == "darwin" else peak * 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return None
+
+
+@contextmanager
+def isolated_storage(base_dir):
+    """
+    views/job_queue가 사용하는 저장 폴더를 base_dir 아래로 바꿉니다.
+    """
+    targets = {
+        (views, "UPLOAD_DIR"): os.path.join(base_dir, "Upload_file"),
+        (views, "RULE_DIR"): os.path.join(base_dir, "Rule_file"),
+        (views, "CONTACT_DIR"): os.path.join(base_dir, "Contact_file"),
+        (views, "EXPORT_DIR"): os.path.join(base_dir, "Export_file"),
+        (job_queue, "JOB_DIR"): os.path.join(base_dir, "Job_file"),
+    }
+    original = {key: getattr(*key) for key in targets}
+    for (module, name), path in targets.items():
+        os.makedirs(path, exist_ok=True)
+        setattr(module, name, path)
+    try:
+        yield
+    finally:
+        for (module, name), value in original.items():
+            setattr(module, name, value)
+
+
+def _consume(response):
+    """
+    응답 본문을 끝까지 읽습니다. (스트리밍/파일 응답의 생성 시간까지 측정에 포함)
+    """
+    if getattr(response, "streaming", False):
+        for _ in response.streaming_content:
+            pass
+        response.close()
+    else:
+        response.content
+    return response.status_code
+
+
+class LedgerContext:
+    """
+    크기 하나에 대한 벤치마크 상태 (업로드된 폴더, 원본 파일 경로 등)
+    """
+
+    def __init__(self, client, work_dir, rows, column_line):
+        self.client = client
+        self.work_dir = work_dir
+        self.rows = rows
+        self.source_path = os.path.join(work_dir, f"ledger_{rows}.xlsx")
+        self.headers = build_ledger(self.source_path, rows, column_line=column_line)
+
+        metadata = self.upload().json()["metadata"]
+        self.folder_name = metadata["folderName"]
+        self.xlsx_file = metadata["xlsxFile"]
+        self.folder_path = os.path.join(views.UPLOAD_DIR, self.folder_name)
+        self.file_path = os.path.join(self.folder_path, self.xlsx_file)
+        self.save_data = None
+
+    def upload(self):
+        with open(self.source_path, "rb") as f:
+            response = self.client.post("/api/upload/", {"excel_file": f})
+        return response
+
+    def post_json(self, url, body):
+        return self.client.post(url, json.dumps(body, ensure_ascii=False), content_type="application/json")
+
+    def read_with_backend(self, backend):
+        with override_settings(XLSX_READER_BACKEND=backend):
+            return self.post_json("/api/read-xlsx/", {"folderName": self.folder_name, "xlsxFile": self.xlsx_file})
+
+    def drop_cached_sheet(self):
+        invalidate_sheet_data(self.file_path)
+
+    def drop_snapshot(self):
+        self.drop_cached_sheet()
+        path = snapshot_path(self.file_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def drop_exports(self):
+        shutil.rmtree(os.path.join(views.EXPORT_DIR, self.folder_name), ignore_errors=True)
+
+    def flush_journal(self):
+        # 다음 시나리오 측정 중에 백그라운드 압축이 끼어들지 않도록 남은 저널을 미리 반영
+        if has_pending_entries(self.folder_path):
+            compact_journal(self.folder_path)
+
+    def load_save_data(self):
+        if self.save_data is None:
+            response = self.post_json("/api/read-xlsx/", {"folderName": self.folder_name, "xlsxFile": self.xlsx_file})
+            self.save_data = response.json()["data"]
+        return self.save_data
+
+
+def build_scenarios(ctx):
+    """
+    {시나리오 이름: (반복 전 준비 함수 또는 None, 요청 함수)}
+    파일을 바꾸는 patch/save는 읽기 시나리오 뒤에 실행되도록 순서를 유지합니다.
+    """
+    folder = {"folderName": ctx.folder_name, "xlsxFile": ctx.xlsx_file}
+    download_url = f"/api/download/{ctx.folder_name}/{ctx.xlsx_file}/"
+    query = {
+        **folder,
+        "filters": [
+            {"column": "세목명", "op": "in", "values": ["여비", "회의비"]},
+            {"column": "금액", "op": "range", "min": 10000, "max": 300000},
+        ],
+        "sort": [{"column": "금액", "order": "desc"}],
+        "offset": 0,
+        "limit": 500,
+    }
+    patch_counter = iter(range(10 ** 9))
+
+    def patch_body():
+        row_index = next(patch_counter) % ctx.rows
+        return {**folder, "changes": [{"row_index": row_index, "column": "메모", "value": f"bench {row_index}"}]}
+
+    return {
+        "list_files": (None, lambda: ctx.client.get("/api/files/")),
+        "list_rules": (None, lambda: ctx.client.get("/api/rules/")),
+        "read_xlsx": (None, lambda: ctx.post_json("/api/read-xlsx/", folder)),
+        "read_xlsx_window": (None, lambda: ctx.post_json("/api/read-xlsx/", {**folder, "offset": 0, "limit": 500})),
+        "read_xlsx_compact": (None, lambda: ctx.post_json("/api/read-xlsx/", {**folder, "format": "compact"})),
+        "read_xlsx_snapshot": (ctx.drop_cached_sheet, lambda: ctx.post_json("/api/read-xlsx/", folder)),
+        "read_xlsx_parse": (ctx.drop_snapshot, lambda: ctx.post_json("/api/read-xlsx/", folder)),
+        "read_xlsx_parse_openpyxl": (ctx.drop_snapshot, lambda: ctx.read_with_backend("openpyxl")),
+        "read_xlsx_parse_fast": (ctx.drop_snapshot, lambda: ctx.read_with_backend("fast")),
+        "query_xlsx": (None, lambda: ctx.post_json("/api/query-xlsx/", query)),
+        "evaluate_rules": (None, lambda: ctx.post_json("/api/evaluate-rules/", {**folder, "ruleName": RULE_NAME})),
+        "download_full": (None, lambda: ctx.client.get(download_url)),
+        "download_no_review": (ctx.drop_exports, lambda: ctx.client.get(download_url, {"type": "no_review"})),
+        "patch_xlsx": (None, lambda: ctx.post_json("/api/patch-xlsx/", patch_body())),
+        "save_xlsx": (ctx.load_save_data, lambda: ctx.post_json("/api/save-xlsx/", {**folder, "data": ctx.save_data})),
+        "cache_stats": (None, lambda: ctx.client.get("/api/cache-stats/")),
+        "upload": (None, ctx.upload),
+    }
+
+
+SCENARIO_NAMES = (
+    "list_files", "list_rules", "read_xlsx", "read_xlsx_window", "read_xlsx_compact", "read_xlsx_snapshot",
+    "read_xlsx_parse", "read_xlsx_parse_openpyxl", "read_xlsx_parse_fast", "query_xlsx", "evaluate_rules",
+    "download_full", "download_no_review", "patch_xlsx", "save_xlsx", "cache_stats", "upload",
+)
+
+
+def summarize(durations, errors, parses, snapshot_loads, peak_rss):
+    timings = np.array(durations) * 1000 if durations else np.zeros(1)
+    summary = {
+        "count": len(durations),
+        "errors": errors,
+        "minMs": round(float(timings.min()), 3),
+        "meanMs": round(float(timings.mean()), 3),
+    }
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}Ms"] = round(float(np.percentile(timings, percentile)), 3)
+    summary.update({
+        "maxMs": round(float(timings.max()), 3),
+        "parses": parses,
+        "snapshotLoads": snapshot_loads,
+        "peakRssBytes": peak_rss,
+    })
+    return summary
+
+
+def run_scenario(prepare, request, iterations):
+    durations = []
+    errors = 0
+    before = cache_stats()
+    for _ in range(iterations):
+        if prepare is not None:
+            prepare()
+        started = time.perf_counter()
+        status_code = _consume(request())
+        durations.append(time.perf_counter() - started)
+        if status_code >= 400:
+            errors += 1
+    after = cache_stats()
+    return summarize(
+        durations, errors,
+        after["parses"] - before["parses"],
+        after["snapshotLoads"] - before["snapshotLoads"],
+        peak_rss_bytes(),
+    )
+
+
+def _write_rule(rule_dir):
+    folder_path = os.path.join(rule_dir, RULE_NAME)
+    os.makedirs(folder_path, exist_ok=True)
+    with open(os.path.join(folder_path, "documentRule.json"), "w", encoding="utf-8") as f:
+        json.dump(build_rule(), f, ensure_ascii=False)
+    with open(os.path.join(folder_path, METADATA_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"folderName": RULE_NAME, "documentRule": "documentRule.json", "categoryRule": {}}, f, ensure_ascii=False)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, iterations=5, scenarios=None, column_line=2, log=print):
+    """
+    벤치마크를 실행하고 결과 dict를 반환합니다.
+    """
+    scenarios = list(scenarios or SCENARIO_NAMES)
+    unknown = [name for name in scenarios if name not in SCENARIO_NAMES]
+    if unknown:
+        raise ValueError(f"알 수 없는 시나리오입니다: {', '.join(unknown)}")
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="auditmate_bench_")
+    try:
+        with isolated_storage(work_dir):
+            _write_rule(views.RULE_DIR)
+            client = Client()
+            for rows in sizes:
+                log(f"[{rows}행] 원장 생성 및 업로드")
+                ctx = LedgerContext(client, work_dir, rows, column_line)
+                available = build_scenarios(ctx)
+                for name in scenarios:
+                    prepare, request = available[name]
+                    summary = run_scenario(prepare, request, iterations)
+                    ctx.flush_journal()
+                    results[f"{rows}/{name}"] = summary
+                    log(f"  {name:<20} p50 {summary['p50Ms']:>10.1f}ms  p95 {summary['p95Ms']:>10.1f}ms  "
+                        f"parses {summary['parses']}  errors {summary['errors']}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "createdAt": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": list(sizes),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def compare_results(current, baseline, threshold=0.2, metric="p50Ms", min_delta_ms=1.0):
+    """
+    기준 결과보다 metric이 threshold 비율 넘게(그리고 min_delta_ms 넘게) 느려진 항목 목록을 반환합니다.
+    기준 결과에 없는 항목은 비교하지 않습니다.
+    """
+    regressions = []
+    for key, summary in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base or metric not in base:
+            continue
+        before, after = base[metric], summary[metric]
+        if after > before * (1 + threshold) and after - before > min_delta_ms:
+            regressions.append({
+                "key": key,
+                "baseline": before,
+                "current": after,
+                "ratio": round(after / before, 3) if before else None,
+            })
+    return regressions
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,228 @@
+"""
+업로드 폴더 카탈로그 (settings.DATABASES의 SQLite)
+
+metadata.json이 원본이고, UploadFolder 테이블은 목록 조회/정렬/필터링을 인덱스로 처리하기 위한 사본입니다.
+save_metadata가 metadata를 저장할 때마다 해당 행을 갱신하고, 폴더 삭제 시 행을 지웁니다.
+디스크와 어긋난 경우(서버 밖에서 폴더를 추가/삭제한 경우 등)는 reconcile_catalog 명령으로 다시 만듭니다.
+"""
+import os
+import datetime
+
+from django.db import DatabaseError
+
+from .models import UploadFolder
+
+# list_files의 sort 파라미터 -> 정렬 필드
+SORT_FIELDS = {
+    "folderName": "folder_name",
+    "lastModified": "last_modified",
+    "progress": "progress",
+    "ruleName": "rule_name",
+}
+
+# 카탈로그의 last_modified 형식 (문자열 비교로 정렬/범위 조회)
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+# metadata의 lastModified로 쓰였던 다른 형식 (xlsx 없이 업로드한 폴더 등)
+LEGACY_DATETIME_FORMATS = ("%Y%m%d_%H%M%S",)
+
+
+def normalize_last_modified(value):
+    """
+    metadata의 lastModified를 DATETIME_FORMAT 문자열로 맞춥니다. (해석할 수 없는 값은 그대로 둠)
+    """
+    if not value:
+        return ""
+    value = str(value)
+    for fmt in (DATETIME_FORMAT, *LEGACY_DATETIME_FORMATS):
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime(DATETIME_FORMAT)
+        except ValueError:
+            continue
+    try:
+        return datetime.datetime.fromisoformat(value).strftime(DATETIME_FORMAT)
+    except ValueError:
+        return value
+
+
+def _parse_bound(value):
+    """
+    조회 조건의 날짜/시각 문자열을 (datetime, 날짜만 주어졌는지)로 해석합니다. (형식이 다르면 ValueError)
+    """
+    try:
+        return datetime.datetime.strptime(value, DATE_FORMAT), True
+    except ValueError:
+        return datetime.datetime.strptime(value, DATETIME_FORMAT), False
+
+
+def _folder_fields(metadata):
+    fingerprint = metadata.get("fingerprint") or {}
+    stats = metadata.get("progressStats") or {}
+    return {
+        "xlsx_file": metadata.get("xlsxFile"),
+        "column_line": metadata.get("columnLine") or 0,
+        "progress": metadata.get("progress") or 0,
+        "total_rows": stats.get("totalRows"),
+        "last_filled_row": stats.get("lastFilledRow"),
+        "rule_name": metadata.get("ruleName"),
+        "last_modified": normalize_last_modified(metadata.get("lastModified")),
+        "fingerprint_mtime": fingerprint.get("mtime"),
+        "fingerprint_size": fingerprint.get("size"),
+    }
+
+
+def sync_folder(folder_name, metadata):
+    """
+    폴더 하나의 metadata를 카탈로그에 반영합니다.
+    """
+    return UploadFolder.objects.update_or_create(folder_name=folder_name, defaults=_folder_fields(metadata))[0]
+
+
+def remove_folder(folder_name):
+    UploadFolder.objects.filter(folder_name=folder_name).delete()
+
+
+def _read_folder_metadata(upload_dir, folder_name):
+    """
+    디스크의 폴더에서 카탈로그에 넣을 metadata를 만듭니다. (metadata.json이 없으면 xlsx 파일명만 채움)
+    """
+    # 순환 import 방지 (metadata.save_metadata가 이 모듈을 사용)
+    from .metadata import load_metadata
+
+    folder_path = os.path.join(upload_dir, folder_name)
+    metadata = load_metadata(folder_path)
+    if not metadata.get("xlsxFile"):
+        xlsx_files = sorted(f for f in os.listdir(folder_path) if f.endswith(".xlsx"))
+        metadata["xlsxFile"] = xlsx_files[0] if xlsx_files else None
+    return metadata
+
+
+def sync_with_disk(upload_dir):
+    """
+    Upload_file의 폴더 목록과 카탈로그를 비교해 빠진 폴더는 추가하고 사라진 폴더는 지웁니다.
+    (이미 카탈로그에 있는 폴더의 metadata.json은 다시 읽지 않습니다)
+    """
+    on_disk = {
+        name for name in os.listdir(upload_dir) if os.path.isdir(os.path.join(upload_dir, name))
+    }
+    cataloged = set(UploadFolder.objects.values_list("folder_name", flat=True))
+
+    for folder_name in on_disk - cataloged:
+        sync_folder(folder_name, _read_folder_metadata(upload_dir, folder_name))
+    removed = cataloged - on_disk
+    if removed:
+        UploadFolder.objects.filter(folder_name__in=removed).delete()
+    return len(on_disk - cataloged), len(removed)
+
+
+def reconcile(upload_dir):
+    """
+    카탈로그 전체를 디스크의 metadata.json 기준으로 다시 만듭니다.
+    반환값: (반영한 폴더 수, 지운 행 수)
+    """
+    on_disk = sorted(
+        name for name in os.listdir(upload_dir) if os.path.isdir(os.path.join(upload_dir, name))
+    ) if os.path.isdir(upload_dir) else []
+    for folder_name in on_disk:
+        sync_folder(folder_name, _read_folder_metadata(upload_dir, folder_name))
+    removed, _ = UploadFolder.objects.exclude(folder_name__in=on_disk).delete()
+    return len(on_disk), removed
+
+
+def _modified_range(modified_from, modified_to):
+    """
+    수정 시각 조회 조건을 DATETIME_FORMAT 문자열 경계 (시작(이상), 끝, 끝을 제외하는지)로 바꿉니다.
+    modified_to가 날짜만이면 다음 날 0시 전까지입니다. (형식이 다르면 ValueError)
+    """
+    start = end = None
+    end_exclusive = False
+    if modified_from:
+        start = _parse_bound(modified_from)[0].strftime(DATETIME_FORMAT)
+    if modified_to:
+        end, end_exclusive = _parse_bound(modified_to)
+        if end_exclusive:
+            end += datetime.timedelta(days=1)
+        end = end.strftime(DATETIME_FORMAT)
+    return start, end, end_exclusive
+
+
+def _sort_key(sort):
+    """
+    sort 파라미터를 (list_files 항목의 키, 내림차순 여부)로 바꿉니다. (지원하지 않는 기준이면 ValueError)
+    """
+    key = sort.lstrip("-")
+    if key not in SORT_FIELDS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+    return key, sort.startswith("-")
+
+
+def query_folders(rule_name=None, progress_min=None, progress_max=None,
+                  modified_from=None, modified_to=None, sort=None):
+    """
+    조건에 맞는 UploadFolder queryset을 반환합니다.
+    modified_from/modified_to는 "YYYY-MM-DD" 또는 "YYYY-MM-DD HH:MM:SS" 문자열이며 (형식이 다르면 ValueError)
+    modified_to가 날짜만이면 그 날 전체를 포함합니다.
+    sort는 SORT_FIELDS의 키이며 앞에 '-'를 붙이면 내림차순입니다.
+    """
+    queryset = UploadFolder.objects.all()
+    if rule_name:
+        queryset = queryset.filter(rule_name=rule_name)
+    if progress_min is not None:
+        queryset = queryset.filter(progress__gte=progress_min)
+    if progress_max is not None:
+        queryset = queryset.filter(progress__lte=progress_max)
+    start, end, end_exclusive = _modified_range(modified_from, modified_to)
+    if start:
+        queryset = queryset.filter(last_modified__gte=start)
+    if end:
+        queryset = queryset.filter(**{"last_modified__lt" if end_exclusive else "last_modified__lte": end})
+
+    if sort:
+        key, descending = _sort_key(sort)
+        field = SORT_FIELDS[key]
+        queryset = queryset.order_by(f"-{field}" if descending else field, "folder_name")
+    return queryset
+
+
+def filter_list_items(items, rule_name=None, progress_min=None, progress_max=None,
+                      modified_from=None, modified_to=None, sort=None):
+    """
+    카탈로그를 쓸 수 없을 때(migrate 전) 디스크에서 만든 list_files 항목에 query_folders와 같은 조건과 정렬을 적용합니다.
+    """
+    start, end, end_exclusive = _modified_range(modified_from, modified_to)
+    sort_key = _sort_key(sort) if sort else None
+
+    result = []
+    for item in items:
+        progress = item["progress"] or 0
+        last_modified = item["lastModified"]
+        if rule_name and item["ruleName"] != rule_name:
+            continue
+        if progress_min is not None and progress < progress_min:
+            continue
+        if progress_max is not None and progress > progress_max:
+            continue
+        if start and last_modified < start:
+            continue
+        if end and (last_modified >= end if end_exclusive else last_modified > end):
+            continue
+        result.append(item)
+
+    # 폴더명 순으로 정렬한 뒤 (안정 정렬) 정렬 기준을 적용해 같은 값끼리는 폴더명 순을 유지
+    # (빈 값은 SQLite와 같이 오름차순에서 앞, 내림차순에서 뒤)
+    result.sort(key=lambda item: item["folderName"])
+    if sort_key:
+        key, descending = sort_key
+        result.sort(key=lambda item: (item[key] is not None, item[key]), reverse=descending)
+    return result
+
+
+def catalog_ready():
+    """
+    카탈로그 테이블을 사용할 수 있는지 (migrate 전이면 False)
+    """
+    try:
+        UploadFolder.objects.exists()
+        return True
+    except DatabaseError:
+        return False
@@ -0,0 +1,281 @@
+"""
+업로드 폴더별 버전과 행 단위 변경 기록(change feed)
+
+폴더의 metadata.json에 단조 증가하는 version을 두고, 저장(save-xlsx/patch-xlsx/작업 큐 저장)으로 바뀐 셀을
+폴더의 changes.jsonl에 버전마다 한 줄씩 기록합니다. 클라이언트는 /api/changes/<folder>/?since=<version>으로
+그 버전 이후 바뀐 행의 값만 받아 자기 표에 덮어씌우므로, 동기화 트래픽은 바뀐 양에 비례합니다.
+
+기록 형식 (셀 값은 read-xlsx 응답과 같은 JSON 형태, 빈 문자열은 None)
+    {"version": 3, "totalRows": 120, "lastModified": ..., "rows": {"5": {"메모": [이전 값, 새 값]}}}
+
+저장 요청에 baseVersion이 있으면 그 버전 이후 다른 요청이 바꾼 행과 겹치는지 행 단위로 검사합니다.
+    - 다른 요청이 바꾼 행을 클라이언트가 그대로(이전 값으로) 보냈으면 서버의 현재 행을 유지
+    - 클라이언트도 그 행을 바꿨으면 충돌로 보고 저장하지 않음
+
+기록과 metadata 갱신은 호출하는 쪽이 folder_lock(folder_path) 안에서 수행해야 합니다.
+기록은 최근 CHANGE_LOG_MAX_ENTRIES개 버전만 유지하며, 그보다 오래된 버전을 기준으로 한 요청은 전체를 다시 읽어야 합니다.
+"""
+import os
+import json
+import math
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .constants import CHANGES_FILENAME
+from .folder_lock import atomic_write
+from .edit_journal import replaced_rows, apply_patches_to_values
+
+_encoder = DjangoJSONEncoder()
+
+
+def folder_version(metadata):
+    return metadata.get("version", 0)
+
+
+def comparable(value):
+    """
+    비교/기록용 셀 값 (read-xlsx 응답으로 클라이언트가 받는 값과 같은 형태, 빈 값은 None)
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return _encoder.default(value)
+
+
+def _row_values(row):
+    """
+    행 dict에서 값이 있는 셀만 비교용 값으로 모은 dict (행이 없으면 빈 dict)
+    """
+    values = {}
+    for column, value in (row or {}).items():
+        value = comparable(value)
+        if value is not None:
+            values[column] = value
+    return values
+
+
+class CurrentSheet:
+    """
+    캐시된 시트 데이터에 아직 xlsx에 반영되지 않은 저널을 덮어씌운 현재 데이터
+    """
+
+    def __init__(self, sheet_data, entries):
+        pending_rows = replaced_rows(entries)
+        if pending_rows is not None:
+            self._dicts = pending_rows
+            self.headers, self._rows = None, None
+        elif sheet_data is not None:
+            self._dicts = None
+            self.headers, self._rows = apply_patches_to_values(sheet_data.headers, sheet_data.rows, entries)
+        else:
+            self._dicts, self.headers, self._rows = [], None, None
+
+    @property
+    def total_rows(self):
+        return len(self._dicts) if self._dicts is not None else len(self._rows)
+
+    def row(self, row_index):
+        if self._dicts is not None:
+            return self._dicts[row_index]
+        return dict(zip(self.headers, self._rows[row_index]))
+
+    def cell(self, row_index, column):
+        if self._dicts is not None:
+            return self._dicts[row_index].get(column)
+        row = self._rows[row_index]
+        try:
+            col_idx = self.headers.index(column)
+        except ValueError:
+            return None
+        return row[col_idx] if col_idx < len(row) else None
+
+
+def diff_rows(current, data):
+    """
+    현재 데이터를 data로 전체 교체할 때 바뀌는 셀 {행 순번: {컬럼: [이전 값, 새 값]}} (없어지는 행은 모든 셀이 None으로)
+    """
+    changed = {}
+    for row_index in range(max(current.total_rows, len(data))):
+        before = _row_values(current.row(row_index)) if row_index < current.total_rows else {}
+        after = _row_values(data[row_index]) if row_index < len(data) else {}
+        if before == after:
+            continue
+        changed[row_index] = {
+            column: [before.get(column), after.get(column)]
+            for column in dict.fromkeys([*before, *after])
+            if before.get(column) != after.get(column)
+        }
+    return changed
+
+
+def diff_changes(current, changes):
+    """
+    셀 단위 변경사항(validate_changes 결과)으로 바뀌는 셀 {행 순번: {컬럼: [이전 값, 새 값]}}
+    """
+    changed = {}
+    for change in changes:
+        row_index, column = change["row_index"], change["column"]
+        cells = changed.setdefault(row_index, {})
+        before = cells[column][0] if column in cells else comparable(current.cell(row_index, column))
+        cells[column] = [before, comparable(change.get("value"))]
+
+    for row_index in list(changed):
+        cells = {column: pair for column, pair in changed[row_index].items() if pair[0] != pair[1]}
+        if cells:
+            changed[row_index] = cells
+        else:
+            del changed[row_index]
+    return changed
+
+
+def _changes_path(folder_path):
+    return os.path.join(folder_path, CHANGES_FILENAME)
+
+
+def _read_log(folder_path):
+    path = _changes_path(folder_path)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print(f"변경 기록 읽기 오류: {path}")
+    return entries
+
+
+def changes_since(folder_path, metadata, since):
+    """
+    since 버전 이후의 기록 항목 목록 (기록이 남아 있지 않은 버전이면 None)
+    """
+    version = folder_version(metadata)
+    if since > version:
+        return None
+    if since == version:
+        return []
+    entries = [entry for entry in _read_log(folder_path) if entry["version"] > since]
+    # since 다음 버전부터 빠짐없이 남아 있어야 함
+    if not entries or entries[0]["version"] != since + 1:
+        return None
+    return entries
+
+
+def summarize(entries):
+    """
+    기록 항목을 행별로 합칩니다.
+    {행 순번: {"version": 마지막으로 바뀐 버전, "before": 처음 바뀌기 전 값, "values": 마지막 값}}
+    """
+    rows = {}
+    for entry in entries:
+        for key, cells in entry.get("rows", {}).items():
+            row = rows.setdefault(int(key), {"version": 0, "before": {}, "values": {}})
+            row["version"] = entry["version"]
+            for column, (before, after) in cells.items():
+                row["before"].setdefault(column, before)
+                row["values"][column] = after
+    return rows
+
+
+def record_changes(folder_path, metadata, changed, total_rows, last_modified=None):
+    """
+    바뀐 셀을 새 버전으로 기록하고 metadata의 version을 올립니다. (바뀐 셀이 없으면 버전을 그대로 둠)
+    metadata 저장은 호출하는 쪽에서 합니다.
+    """
+    version = folder_version(metadata)
+    if not changed:
+        return version
+
+    version += 1
+    entry = {
+        "version": version,
+        "totalRows": total_rows,
+        "lastModified": last_modified,
+        "rows": {str(row_index): cells for row_index, cells in sorted(changed.items())},
+    }
+    path = _changes_path(folder_path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    # 오래된 버전 정리 (파일이 최대 개수의 두 배가 되면 최근 항목만 남기고 다시 씀)
+    max_entries = getattr(settings, "CHANGE_LOG_MAX_ENTRIES", 1000)
+    entries = None
+    if version % max_entries == 0:
+        entries = _read_log(folder_path)
+    if entries and len(entries) >= 2 * max_entries:
+        with atomic_write(path) as f:
+            for kept in entries[-max_entries:]:
+                f.write(json.dumps(kept, ensure_ascii=False, default=str) + "\n")
+
+    metadata["version"] = version
+    return version
+
+
+def reconcile_rows(history, current, data):
+    """
+    baseVersion 이후 다른 요청이 바꾼 행(history, summarize 결과)과 전체 교체 데이터를 맞춥니다.
+    클라이언트가 이전 값 그대로 보낸 행은 서버의 현재 행으로 바꾸고, 클라이언트도 바꾼 행은 충돌로 모읍니다.
+    (맞춘 data, 충돌한 행 순번 목록)을 반환합니다.
+    """
+    merged = list(data)
+    conflicts = []
+    for row_index, change in sorted(history.items()):
+        server = _row_values(current.row(row_index)) if row_index < current.total_rows else None
+        client = _row_values(data[row_index]) if row_index < len(data) else None
+        if client == server:
+            continue
+
+        # 기준 버전 당시의 행 = 현재 행에서 그 뒤 바뀐 셀만 이전 값으로 되돌린 행
+        base = dict(server or {})
+        for column, before in change["before"].items():
+            if before is None:
+                base.pop(column, None)
+            else:
+                base[column] = before
+        if client == base and server is not None and client is not None:
+            merged[row_index] = {column: server.get(column) for column in dict.fromkeys([*data[row_index], *server])}
+        else:
+            conflicts.append(row_index)
+    return merged, conflicts
+
+
+def patch_conflicts(history, current, changes):
+    """
+    baseVersion 이후 다른 요청이 바꾼 행에 현재와 다른 값을 쓰려는 변경사항의 행 순번 목록
+    """
+    return sorted({
+        change["row_index"] for change in changes
+        if change["row_index"] in history
+        and comparable(change.get("value")) != comparable(current.cell(change["row_index"], change["column"]))
+    })
+
+
+def change_feed(folder_path, metadata, since):
+    """
+    /api/changes 응답 내용
+    since 이후 바뀐 행만 {row_index, version, values}로 반환하고, 기록이 없는 버전이면 reset을 표시합니다.
+    """
+    version = folder_version(metadata)
+    entries = changes_since(folder_path, metadata, since)
+    if entries is None:
+        return {"version": version, "since": since, "reset": True, "rows": [], "totalRows": None}
+
+    rows = summarize(entries)
+    return {
+        "version": version,
+        "since": since,
+        "reset": False,
+        "rows": [
+            {"row_index": row_index, "version": row["version"], "values": row["values"]}
+            for row_index, row in sorted(rows.items())
+        ],
+        "totalRows": entries[-1]["totalRows"] if entries else None,
+    }
@@ -0,0 +1,113 @@
+"""
+조건부 GET(ETag / Last-Modified) 검증값과 304 응답
+
+읽기 응답을 만들기 전에 파일의 수정 시각(ns)과 크기, 요청 파라미터만으로 강한 ETag를 계산하고,
+클라이언트가 보낸 If-None-Match(또는 If-Modified-Since)가 일치하면 시트를 파싱하지 않고 304를 반환합니다.
+응답에는 Cache-Control: no-cache를 붙여 브라우저가 캐시된 응답을 쓰기 전에 항상 다시 확인하게 합니다.
+
+검증값은 응답 내용을 만들기 전에 계산해야 합니다. (그래야 그 사이 파일이 바뀌어도 이전 ETag에 새 내용이 붙지 않음)
+Last-Modified는 초 단위이므로 현재 초에 바뀐 파일에는 붙이지 않고 ETag로만 검증합니다. (settled_last_modified 참고)
+"""
+import os
+import time
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .constants import METADATA_FILENAME, JOURNAL_FILENAME, COMPACTING_SUFFIX, ALLOWED_EXTENSIONS
+
+
+def file_stamp(path):
+    """
+    (mtime_ns, size) (파일이 없으면 None)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def latest_mtime(stamps):
+    """
+    스탬프 목록 중 가장 최근 수정 시각 (초, Last-Modified용)
+    """
+    mtimes = [stamp[0] for stamp in stamps if stamp]
+    return max(mtimes) // 1_000_000_000 if mtimes else None
+
+
+def sheet_validators(folder_path, file_path, params):
+    """
+    read-xlsx 응답의 (ETag, Last-Modified)
+    xlsx, metadata(columnLine), 아직 반영되지 않은 저널(압축 중인 파일 포함)의 스탬프와 응답 형식/구간 파라미터로 계산합니다.
+    """
+    journal_path = os.path.join(folder_path, JOURNAL_FILENAME)
+    stamps = (
+        file_stamp(file_path),
+        file_stamp(os.path.join(folder_path, METADATA_FILENAME)),
+        file_stamp(journal_path),
+        file_stamp(journal_path + COMPACTING_SUFFIX),
+    )
+    return make_etag("sheet", stamps, params), latest_mtime(stamps)
+
+
+def folder_list_validators(upload_dir, params):
+    """
+    업로드 폴더 목록 응답의 (ETag, Last-Modified)
+    폴더마다 metadata.json과 xlsx 파일의 스탬프, 그리고 조회 조건으로 계산합니다.
+    Last-Modified에는 업로드 폴더 자체의 수정 시각도 넣습니다. (폴더를 지우거나 예전 수정 시각의 파일로 폴더를
+    추가해도 목록이 바뀌었음을 알 수 있도록)
+    """
+    stamps = []
+    with os.scandir(upload_dir) as folders:
+        for folder in sorted(folders, key=lambda entry: entry.name):
+            if not folder.is_dir():
+                continue
+            with os.scandir(folder.path) as files:
+                for entry in sorted(files, key=lambda entry: entry.name):
+                    if entry.name == METADATA_FILENAME or entry.name.endswith(ALLOWED_EXTENSIONS[0]):
+                        stat = entry.stat()
+                        stamps.append((folder.name, entry.name, (stat.st_mtime_ns, stat.st_size)))
+    return make_etag("files", stamps, params), latest_mtime([file_stamp(upload_dir), *(stamp for _, _, stamp in stamps)])
+
+
+def settled_last_modified(last_modified):
+    """
+    Last-Modified로 쓸 수 있는 수정 시각 (현재 초 이후이면 None)
+    초 단위 값은 같은 초 안에 파일이 다시 바뀌어도 그대로이므로, 그 값을 받은 클라이언트의
+    If-Modified-Since만으로는 변경을 알 수 없어 이전 내용에 304를 반환하게 됩니다.
+    """
+    if last_modified is None or last_modified >= int(time.time()):
+        return None
+    return last_modified
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    GET/HEAD 요청의 검증값이 일치하면 304 응답을, 아니면 None을 반환합니다.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    last_modified = settled_last_modified(last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    응답에 ETag, Last-Modified, Cache-Control: no-cache를 붙입니다.
+    """
+    response["ETag"] = etag
+    last_modified = settled_last_modified(last_modified)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
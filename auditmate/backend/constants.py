@@ -6,6 +6,16 @@ AuditMate Backend 상수 정의
 WORKSHEET_NAME = "집행내역"
 ALLOWED_EXTENSIONS = [".xlsx", ".xls"]
 METADATA_FILENAME = "metadata.json"
+JOURNAL_FILENAME = "journal.jsonl"
+CHANGES_FILENAME = "changes.jsonl"
+# 압축 중인 저널 (journal.jsonl.compacting)
+COMPACTING_SUFFIX = ".compacting"
+# 시트 스냅숏 (.<xlsx 파일명>.snapshot)
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# read-xlsx 구간(페이지) 조회 관련 상수
+DEFAULT_PAGE_LIMIT = 500
+MAX_PAGE_LIMIT = 5000
 
 # 컬럼명 상수
 REVIEW_COLUMNS = ["검토사항", "메모"]
@@ -32,6 +42,8 @@ class Messages:
     RULE_NAME_UPDATE_SUCCESS = "규칙명이 성공적으로 변경되었습니다"
     RULE_DELETE_SUCCESS = "{} 검토 규칙이 성공적으로 삭제되었습니다"
     EXCEL_READ_SUCCESS = "엑셀 파일을 성공적으로 불러왔습니다"
+    JOB_ACCEPTED = "작업이 등록되었습니다. 작업 상태를 조회해 완료 여부를 확인하세요"
+    BATCH_UPLOAD_DONE = "{}개 파일 중 {}개가 업로드되었습니다"
     
     # 에러 메시지
     UPLOAD_DIR_NOT_EXISTS = "업로드 폴더를 찾을 수 없습니다. 시스템 관리자에게 문의하세요"
@@ -51,6 +63,20 @@ class Messages:
     MISSING_FILENAME = "파일명이 제공되지 않았습니다"
     MISSING_FOLDER_RULE_NAME = "폴더명과 규칙명을 모두 입력해주세요"
     MISSING_FOLDER_NAME = "폴더명을 입력해주세요"
+    INVALID_PAGE_PARAMS = "offset과 limit은 0 이상의 정수여야 합니다"
+    INVALID_QUERY = "행 조회 조건이 올바르지 않습니다: {}"
+    INVALID_TABLE_FORMAT = "응답 형식(format)은 rows, compact, columnar 중 하나여야 합니다"
+    INVALID_LIST_PARAMS = "목록 조회 조건이 올바르지 않습니다: {}"
+    RULE_NOT_SELECTED = "검토 규칙이 지정되지 않았습니다"
+    UNSUPPORTED_FILE_TYPE = "지원하지 않는 파일 형식입니다. .xlsx 파일 또는 .xlsx 파일을 묶은 .zip 파일을 올려주세요"
+    NO_FILES_UPLOADED = "업로드된 파일이 없습니다"
+    JOB_NOT_FOUND = "요청한 작업을 찾을 수 없습니다"
+    JOB_RESULT_NOT_READY = "작업 결과 파일이 아직 준비되지 않았습니다"
+    JOB_INTERRUPTED = "서버가 다시 시작되어 작업이 중단되었습니다. 다시 요청해주세요"
+    FOLDER_LOCKED = "다른 저장 작업이 진행 중입니다. 잠시 후 다시 시도해주세요"
+    INVALID_VERSION = "버전(since, baseVersion)은 0 이상의 정수여야 합니다"
+    SAVE_CONFLICT = "다른 사용자가 먼저 수정한 행({}번째)이 있어 저장하지 못했습니다. 최신 내용을 불러온 뒤 다시 저장해주세요"
+    SYNC_RESET_REQUIRED = "기준 버전의 변경 기록이 남아 있지 않습니다. 전체 데이터를 다시 불러와주세요"
     
     CORE_COLUMNS_MISSING = "필수 컬럼이 누락되었습니다: {}. 자동으로 생성합니다"
 
@@ -62,4 +88,6 @@ DEFAULT_METADATA_STRUCTURE = {
     "progress": 0,
     "ruleName": None,
     "columnLine": 0,
+    "fingerprint": None,
+    "version": 0,
 }
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+업로드 폴더별 편집 저널(write-behind)
+
+save-xlsx/patch-xlsx 요청은 워크북을 바로 저장하지 않고 폴더의 journal.jsonl에 한 줄씩 추가한 뒤 즉시 응답합니다.
+백그라운드 압축기(compactor)가 일정 주기로, 또는 편집이 멈춘 뒤에 저널을 xlsx에 반영하고,
+다운로드 시에는 그 자리에서 반영합니다. 읽기 요청은 아직 반영되지 않은 저널 내용을 덮어씌워 최신 상태를 봅니다.
+
+저널 항목 형식
+    {"op": "replace", "data": [...], "lastModified": ...}   데이터 영역 전체 교체 (save-xlsx)
+    {"op": "patch", "changes": [...], "lastModified": ...}  셀 단위 변경 (patch-xlsx)
+"""
+import os
+import json
+import time
+import threading
+import datetime
+
+import openpyxl
+from django.conf import settings
+
+from .constants import JOURNAL_FILENAME, COMPACTING_SUFFIX, WORKSHEET_NAME
+from .instrumentation import span, timed
+from .folder_lock import folder_lock, temp_path_for, replace_file
+from .metadata import get_file_fingerprint, load_metadata, save_metadata, apply_progress_stats
+from .xlsx_reader import scan_progress, progress_from_rows
+from .xlsx_writer import (
+    rewrite_data_rows, data_row_positions, get_column_map, apply_cell_changes, save_data_rows
+)
+from .workbook_cache import invalidate_sheet_data, refresh_sheet_data
+
+
+_registry_lock = threading.Lock()
+# 압축 대기 중인 폴더: {folder_path: (첫 항목 시각, 마지막 항목 시각)}
+_pending = {}
+_compactor = None
+
+
+def journal_enabled():
+    return getattr(settings, "EDIT_JOURNAL_ENABLED", True)
+
+
+def _journal_paths(folder_path):
+    journal_path = os.path.join(folder_path, JOURNAL_FILENAME)
+    return journal_path + COMPACTING_SUFFIX, journal_path
+
+
+def _mark_pending(folder_path, timestamp):
+    key = os.path.abspath(folder_path)
+    with _registry_lock:
+        first, _ = _pending.get(key, (timestamp, timestamp))
+        _pending[key] = (first, timestamp)
+
+
+@timed("file_write")
+def append_entry(folder_path, entry):
+    """
+    저널에 항목을 한 줄 추가합니다.
+    """
+    line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+    with folder_lock(folder_path, "journal"):
+        with open(os.path.join(folder_path, JOURNAL_FILENAME), "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+    _mark_pending(folder_path, time.time())
+
+
+def read_entries(folder_path):
+    """
+    아직 xlsx에 반영되지 않은 저널 항목을 순서대로 반환합니다. (압축 중인 저널 포함)
+    """
+    entries = []
+    for path in _journal_paths(folder_path):
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # 쓰는 도중 잘린 마지막 줄은 무시
+                    print(f"저널 항목 읽기 오류: {path}")
+    return entries
+
+
+def has_pending_entries(folder_path):
+    return any(os.path.exists(path) for path in _journal_paths(folder_path))
+
+
+def apply_patches(rows, entries, offset=0):
+    """
+    patch 항목을 rows(전체 또는 offset부터 시작하는 구간)에 덮어씌웁니다.
+    """
+    for entry in entries:
+        if entry.get("op") != "patch":
+            continue
+        for change in entry.get("changes", []):
+            position = change["row_index"] - offset
+            if 0 <= position < len(rows):
+                rows[position][change["column"]] = change.get("value")
+    return rows
+
+
+def apply_patches_to_values(headers, rows, entries, offset=0):
+    """
+    apply_patches와 같지만 값 튜플 행에 적용합니다. 바뀐 행만 새 튜플로 만들고 나머지는 그대로 공유합니다.
+    헤더에 없는 컬럼을 바꾸는 항목이 있으면 헤더 뒤에 추가한 (headers, rows)를 반환합니다.
+    """
+    headers = list(headers)
+    positions = {header: idx for idx, header in enumerate(headers)}
+    patched = {}
+    for entry in entries:
+        if entry.get("op") != "patch":
+            continue
+        for change in entry.get("changes", []):
+            position = change["row_index"] - offset
+            if not 0 <= position < len(rows):
+                continue
+            col_idx = positions.get(change["column"])
+            if col_idx is None:
+                col_idx = positions[change["column"]] = len(headers)
+                headers.append(change["column"])
+            row = patched.get(position)
+            if row is None:
+                row = patched[position] = list(rows[position])
+            row.extend([None] * (col_idx + 1 - len(row)))
+            row[col_idx] = change.get("value")
+    if patched:
+        rows = list(rows)
+        for position, row in patched.items():
+            rows[position] = tuple(row)
+    return headers, rows
+
+
+def replaced_rows(entries):
+    """
+    replace 항목이 있으면 마지막 replace 데이터에 그 이후의 patch를 덮어씌운 전체 행을 반환합니다.
+    replace 항목이 없으면 None을 반환합니다.
+    """
+    last_replace = None
+    for idx, entry in enumerate(entries):
+        if entry.get("op") == "replace":
+            last_replace = idx
+    if last_replace is None:
+        return None
+
+    rows = [dict(row) for row in entries[last_replace].get("data", [])]
+    return apply_patches(rows, entries[last_replace + 1:])
+
+
+def overlay_rows(rows, entries):
+    """
+    xlsx에서 읽은 전체 행에 저널 내용을 덮어씌워 최신 상태를 만듭니다.
+    """
+    if not entries:
+        return rows
+    pending_rows = replaced_rows(entries)
+    if pending_rows is not None:
+        return pending_rows
+    return apply_patches(rows, entries)
+
+
+def _fold_entries(file_path, column_line, entries, dest_path):
+    """
+    저널 항목을 반영한 xlsx를 dest_path에 저장하고 진행도 통계를 반환합니다. (집행내역 시트가 없으면 None)
+    replace 항목만 있으면 마지막 replace만 save_data_rows로 저장하고,
+    patch 항목이 있으면 워크북을 메모리에 읽어 순서대로 반영합니다.
+    """
+    if not any(entry.get("op") == "patch" for entry in entries):
+        data = next((e.get("data", []) for e in reversed(entries) if e.get("op") == "replace"), None)
+        if data is not None:
+            if not save_data_rows(file_path, column_line, data, dest_path=dest_path):
+                return None
+            return progress_from_rows(data)
+
+    with span("workbook_load"):
+        workbook = openpyxl.load_workbook(file_path)
+    if WORKSHEET_NAME not in workbook.sheetnames:
+        return None
+    worksheet = workbook[WORKSHEET_NAME]
+
+    positions = None
+    for entry in entries:
+        if entry.get("op") == "replace":
+            rewrite_data_rows(worksheet, column_line, entry.get("data", []))
+            positions = None
+        elif entry.get("op") == "patch":
+            if positions is None:
+                width = len(get_column_map(worksheet, column_line))
+                positions = data_row_positions(worksheet, column_line, width)
+            try:
+                apply_cell_changes(worksheet, column_line, positions, entry.get("changes", []))
+            except ValueError as e:
+                print(f"저널 patch 반영 오류: {e}")
+
+    stats = scan_progress(worksheet, column_line)
+    with span("workbook_save"):
+        workbook.save(dest_path)
+    return stats
+
+
+def compact_journal(folder_path):
+    """
+    저널을 xlsx에 반영하고 진행도/지문을 metadata에 기록한 뒤 저널을 비웁니다.
+    다른 스레드나 프로세스가 같은 폴더를 압축 중이면 끝날 때까지 기다립니다.
+    """
+    compacting_path, journal_path = _journal_paths(folder_path)
+
+    with folder_lock(folder_path, "compaction", timeout=None):
+        # 새 항목은 새 저널 파일에 쌓이도록 현재 저널을 압축용 파일로 옮김
+        with folder_lock(folder_path, "journal"):
+            with _registry_lock:
+                _pending.pop(os.path.abspath(folder_path), None)
+            if os.path.exists(journal_path):
+                if os.path.exists(compacting_path):
+                    # 이전 압축이 실패해 남은 항목 뒤에 이어붙임
+                    # (남은 파일이 쓰는 도중 잘린 줄로 끝나면 줄을 바꿔서 첫 새 항목이 그 줄에 붙지 않게 함)
+                    truncated = False
+                    with open(compacting_path, "rb") as f:
+                        if f.seek(0, os.SEEK_END) > 0:
+                            f.seek(-1, os.SEEK_END)
+                            truncated = f.read(1) != b"\n"
+                    with open(journal_path, "r", encoding="utf-8") as src, \
+                            open(compacting_path, "a", encoding="utf-8") as dst:
+                        if truncated:
+                            dst.write("\n")
+                        dst.write(src.read())
+                    os.remove(journal_path)
+                else:
+                    os.replace(journal_path, compacting_path)
+
+        if not os.path.exists(compacting_path):
+            return False
+
+        entries = []
+        with open(compacting_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        print(f"저널 항목 읽기 오류: {compacting_path}")
+
+        metadata = load_metadata(folder_path)
+        xlsx_file = metadata.get("xlsxFile")
+        file_path = os.path.join(folder_path, xlsx_file) if xlsx_file else None
+        if not file_path or not os.path.exists(file_path):
+            os.remove(compacting_path)
+            return False
+
+        column_line = metadata.get("columnLine", 0)
+        # 임시 파일 저장은 잠금 밖에서 하고, xlsx 교체와 metadata 갱신만 폴더 잠금 안에서 수행
+        tmp_path = temp_path_for(file_path)
+        try:
+            stats = _fold_entries(file_path, column_line, entries, tmp_path)
+            if stats is None:
+                os.remove(compacting_path)
+                return False
+            last_modified = next((e.get("lastModified") for e in reversed(entries) if e.get("lastModified")), None)
+            with folder_lock(folder_path):
+                replace_file(tmp_path, file_path)
+                invalidate_sheet_data(file_path)
+
+                # 압축하는 동안 다른 요청이 저장한 metadata를 덮어쓰지 않도록 다시 읽어서 갱신
+                metadata = load_metadata(folder_path)
+                metadata["fingerprint"] = get_file_fingerprint(file_path)
+                # 그 사이 새 저널 항목이 쌓였으면 진행도/수정 시각은 그 요청들이 이미 기록한 값을 유지
+                if not os.path.exists(journal_path):
+                    apply_progress_stats(metadata, stats)
+                    metadata["lastModified"] = last_modified or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                save_metadata(folder_path, metadata)
+                # 반영한 항목은 xlsx 교체와 같은 잠금 안에서 지워야 읽는 쪽이 두 번 반영하지 않음
+                os.remove(compacting_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return True
+
+
+def _compact_due_folders():
+    idle_seconds = getattr(settings, "JOURNAL_IDLE_SECONDS", 2)
+    max_age = getattr(settings, "JOURNAL_MAX_AGE", 30)
+    now = time.time()
+
+    with _registry_lock:
+        due = [
+            folder_path for folder_path, (first, last) in _pending.items()
+            if now - last >= idle_seconds or now - first >= max_age
+        ]
+
+    for folder_path in due:
+        if not os.path.isdir(folder_path):
+            with _registry_lock:
+                _pending.pop(folder_path, None)
+            continue
+        try:
+            if compact_journal(folder_path):
+                # 백그라운드에서 새 xlsx의 스냅숏을 미리 만들어 다음 읽기가 파싱하지 않게 함
+                metadata = load_metadata(folder_path)
+                refresh_sheet_data(os.path.join(folder_path, metadata["xlsxFile"]), metadata.get("columnLine", 0))
+        except Exception as e:
+            print(f"저널 압축 오류 ({folder_path}): {e}")
+
+
+def _compactor_loop():
+    interval = getattr(settings, "JOURNAL_COMPACT_INTERVAL", 5)
+    while True:
+        time.sleep(interval)
+        _compact_due_folders()
+
+
+def start_compactor(upload_dir):
+    """
+    백그라운드 압축기 스레드를 한 번만 시작합니다.
+    시작할 때 이전 실행에서 남은 저널도 압축 대기 목록에 올립니다.
+    """
+    global _compactor
+    with _registry_lock:
+        if _compactor is not None:
+            return
+        _compactor = threading.Thread(target=_compactor_loop, name="journal-compactor", daemon=True)
+
+    if os.path.isdir(upload_dir):
+        for folder_name in os.listdir(upload_dir):
+            folder_path = os.path.join(upload_dir, folder_name)
+            if os.path.isdir(folder_path) and has_pending_entries(folder_path):
+                _mark_pending(folder_path, 0)
+
+    _compactor.start()
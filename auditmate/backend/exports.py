@@ -0,0 +1,231 @@
+"""
+다운로드용 파일 생성 함수 (요청 스레드와 작업 큐 워커에서 함께 사용)
+"""
+import io
+import os
+import uuid
+import zipfile
+
+import openpyxl
+
+from .constants import WORKSHEET_NAME, REVIEW_COLUMNS, Messages
+from .instrumentation import timed
+from .folder_lock import is_internal_file
+from .xlsx_fast_reader import UnsupportedWorkbook
+from .xlsx_zip_writer import write_sheet_values
+
+
+class WorksheetNotFound(Exception):
+    pass
+
+
+def _excluded_columns(header_values):
+    """
+    헤더 행 값에서 제외할 열('검토사항', '메모')의 인덱스(0-based) 집합
+    """
+    return {
+        col_idx for col_idx, cell_value in enumerate(header_values)
+        if cell_value and str(cell_value).strip() in REVIEW_COLUMNS
+    }
+
+
+@timed("export")
+def export_workbook(file_path, column_line, download_type, target):
+    """
+    워크북을 target 경로에 저장합니다.
+    download_type이 'no_review'이면 집행내역 시트에서 '검토사항', '메모' 열을 제거합니다.
+
+    집행내역 시트만 읽기 전용으로 한 행씩 읽어 새 시트로 쓰고 다른 시트, 스타일 등은 원본 zip 항목을 그대로 복사하므로
+    (xlsx_zip_writer.write_sheet_values) 시트 크기와 관계없이 메모리 사용량이 일정하고 다른 시트의 서식도 유지됩니다.
+    집행내역 시트에는 셀 서식 없이 값과 수식만 옮깁니다.
+    그렇게 쓸 수 없는 파일이면 모든 시트를 쓰기 전용 워크북으로 옮깁니다. (이때는 모든 시트의 서식이 빠짐)
+    """
+    source = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        # "집행내역" 시트 확인
+        if WORKSHEET_NAME not in source.sheetnames:
+            raise WorksheetNotFound(Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME))
+
+        try:
+            write_sheet_values(file_path, target, _export_rows(source[WORKSHEET_NAME], column_line, download_type))
+            return
+        except (UnsupportedWorkbook, ValueError) as e:
+            print(f"집행내역 시트만 바꿔 쓸 수 없어 모든 시트를 다시 씁니다 ({file_path}): {e}")
+
+        output = openpyxl.Workbook(write_only=True)
+        for sheet_name in source.sheetnames:
+            source_sheet = source[sheet_name]
+            output_sheet = output.create_sheet(sheet_name)
+            if sheet_name == WORKSHEET_NAME:
+                rows = _export_rows(source_sheet, column_line, download_type)
+            else:
+                if hasattr(source_sheet, "reset_dimensions"):
+                    source_sheet.reset_dimensions()
+                rows = source_sheet.iter_rows(values_only=True)
+            for row in rows:
+                output_sheet.append(row)
+        output.save(target)
+    finally:
+        source.close()
+
+
+def _export_rows(source_sheet, column_line, download_type):
+    """
+    내보낼 집행내역 시트의 행을 순서대로 반환합니다. ('no_review'이면 헤더 기준으로 검토 열을 뺀 행)
+    """
+    if hasattr(source_sheet, "reset_dimensions"):
+        source_sheet.reset_dimensions()
+    rows = source_sheet.iter_rows(values_only=True)
+    if download_type != 'no_review':
+        yield from rows
+        return
+
+    # 헤더 행(column_line 기준)보다 위의 행을 먼저 버퍼에 담아 두었다가, 헤더에서 제외할 열을 정한 뒤 기록
+    header_row = column_line + 1 if column_line > 0 else 1
+    pending = []
+    excluded = None
+    for row_idx, row in enumerate(rows, 1):
+        if excluded is None:
+            pending.append(row)
+            if row_idx < header_row:
+                continue
+            excluded = _excluded_columns(row)
+            for pending_row in pending:
+                yield _drop_columns(pending_row, excluded)
+            pending = None
+            continue
+        yield _drop_columns(row, excluded)
+    # 시트가 헤더 행보다 짧은 경우
+    yield from pending or []
+
+
+def _drop_columns(row, excluded):
+    if not excluded:
+        return row
+    return [cell_value for col_idx, cell_value in enumerate(row) if col_idx not in excluded]
+
+
+def export_cache_path(cache_dir, file_path, download_type):
+    """
+    원본 파일의 (mtime, size)와 다운로드 종류로 만든 캐시 파일 경로
+    """
+    stat = os.stat(file_path)
+    file_name = os.path.basename(file_path)
+    return os.path.join(cache_dir, f"{download_type}_{stat.st_mtime_ns}_{stat.st_size}_{file_name}")
+
+
+def cached_export(file_path, column_line, download_type, cache_dir):
+    """
+    내보낸 파일의 경로를 반환합니다. 'full'이면 원본 파일을 그대로 사용하고,
+    그 외에는 (원본 mtime, 종류)별로 한 번만 만들어 cache_dir에 보관합니다.
+    """
+    if download_type != 'no_review':
+        # 원본을 그대로 내려주되, 기존과 같이 집행내역 시트가 없으면 오류
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            if WORKSHEET_NAME not in workbook.sheetnames:
+                raise WorksheetNotFound(Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME))
+        finally:
+            workbook.close()
+        return file_path
+
+    cache_path = export_cache_path(cache_dir, file_path, download_type)
+    if os.path.exists(cache_path):
+        return cache_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        export_workbook(file_path, column_line, download_type, tmp_path)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # 같은 파일/종류의 이전 버전 캐시 정리
+    prefix = f"{download_type}_"
+    suffix = f"_{os.path.basename(file_path)}"
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path != cache_path and name.startswith(prefix) and name.endswith(suffix):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return cache_path
+
+
+# 이미 압축된 형식이라 다시 deflate해도 크기가 줄지 않는 파일은 그대로 저장
+STORED_EXTENSIONS = (".xlsx", ".xls", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".pdf", ".hwpx")
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """
+    zipfile이 쓰는 바이트를 모아 두었다가 꺼내 갈 수 있게 하는 쓰기 전용 버퍼
+    (seek을 지원하지 않으므로 zipfile은 각 항목 뒤에 data descriptor를 붙여 순서대로 씁니다)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_folder_zip(folder_path):
+    """
+    폴더 안의 파일 전체를 상대경로 그대로 압축한 zip을 조각(bytes) 단위로 생성합니다. (서버 내부 파일은 제외)
+    파일은 ZIP_CHUNK_SIZE씩 읽어 쓰므로 폴더 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for root, _, files in os.walk(folder_path):
+            for f in files:
+                # 임시 파일, 스냅숏, 저널, 변경 기록 등은 제외
+                if is_internal_file(f):
+                    continue
+                abs_path = os.path.join(root, f)
+                rel_path = os.path.relpath(abs_path, folder_path)
+                zip_info = zipfile.ZipInfo.from_file(abs_path, arcname=rel_path)
+                if f.lower().endswith(STORED_EXTENSIONS):
+                    zip_info.compress_type = zipfile.ZIP_STORED
+                else:
+                    zip_info.compress_type = zipfile.ZIP_DEFLATED
+
+                force_zip64 = zip_info.file_size > zipfile.ZIP64_LIMIT
+                with open(abs_path, "rb") as src, zip_file.open(zip_info, "w", force_zip64=force_zip64) as dest:
+                    while True:
+                        chunk = src.read(ZIP_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        data = buffer.drain()
+                        if data:
+                            yield data
+                data = buffer.drain()
+                if data:
+                    yield data
+    # 중앙 디렉터리(central directory)는 ZipFile을 닫을 때 기록됨
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def write_folder_zip(folder_path, target):
+    """
+    폴더 전체 zip을 target(경로)에 기록합니다.
+    """
+    with open(target, "wb") as f:
+        for chunk in iter_folder_zip(folder_path):
+            f.write(chunk)
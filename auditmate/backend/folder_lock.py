@@ -0,0 +1,253 @@
+"""
+폴더 단위 잠금(프로세스 간)과 원자적 파일 쓰기
+
+여러 워커 프로세스가 같은 업로드/규칙 폴더의 metadata.json, xlsx, 저널을 읽고-수정하고-쓰기 때문에
+쓰기 쪽은 folder_lock()으로 폴더별 잠금을 잡고, 모든 쓰기는 같은 폴더의 임시 파일에 쓴 뒤 os.replace로 교체합니다.
+읽기는 잠금을 잡지 않으며 교체가 원자적이므로 항상 마지막으로 완성된 파일을 읽습니다.
+
+    folder_lock(folder_path, name)  폴더 잠금 (같은 스레드 안에서는 다시 잡을 수 있음)
+        name=None          metadata.json 읽기-수정-쓰기, xlsx 교체
+        name="journal"     저널 추가/압축용 파일로 옮기기
+        name="compaction"  저널 압축 전체 (같은 폴더를 두 프로세스가 동시에 압축하지 않도록)
+    atomic_write(path)              임시 파일에 쓰고 교체하는 open() 대용
+    save_workbook_atomic(wb, path)  워크북을 임시 파일에 저장하고 교체
+    is_internal_file(name)          폴더 안에 서버가 만드는 내부 파일인지 (zip 다운로드에서 제외)
+    remove_folder_locks(path)       지운 폴더의 잠금 파일 정리
+
+잠금 파일은 폴더 안이 아니라 FOLDER_LOCK_DIR(기본 BASE_DIR/Lock_file)에 두므로
+폴더 zip 다운로드에 섞이지 않고, 잠금 중에도 폴더를 지울 수 있습니다.
+"""
+import os
+import time
+import uuid
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .constants import JOURNAL_FILENAME, CHANGES_FILENAME, COMPACTING_SUFFIX, SNAPSHOT_SUFFIX, Messages
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TEMP_SUFFIX = ".tmp"
+# 서버가 폴더 안에 만드는 파일 (임시 파일과 시트 스냅숏은 is_internal_file에서 이름 형식으로 확인)
+INTERNAL_FILENAMES = (JOURNAL_FILENAME, JOURNAL_FILENAME + COMPACTING_SUFFIX, CHANGES_FILENAME)
+# folder_lock의 잠금 이름 (None은 폴더 잠금)
+LOCK_NAMES = (None, "journal", "compaction")
+# 잠금을 기다릴 때 다시 시도하는 간격 (초)
+POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 0.1
+
+_registry_lock = threading.Lock()
+_locks = {}
+
+
+class FolderLockTimeout(TimeoutError):
+    pass
+
+
+def lock_dir():
+    return str(getattr(settings, "FOLDER_LOCK_DIR", os.path.join(settings.BASE_DIR, "Lock_file")))
+
+
+def _lock_path(folder_path, name):
+    key = os.path.normcase(os.path.abspath(folder_path))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(lock_dir(), f"{digest}.{name or 'folder'}.lock")
+
+
+def _try_lock(fd):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _is_lock_file(fd, path):
+    """
+    열어 둔 fd가 아직 path의 잠금 파일인지 확인합니다.
+    """
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(path))
+    except FileNotFoundError:
+        return False
+
+
+class _FolderLock:
+    """
+    한 폴더(와 잠금 이름)의 잠금. 프로세스 안에서는 RLock으로, 프로세스 사이에서는 잠금 파일로 막습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self.thread_lock.acquire(timeout=-1 if timeout is None else max(timeout, 0)):
+            return False
+        if self.depth:
+            self.depth += 1
+            return True
+
+        interval = POLL_INTERVAL
+        while True:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                self.thread_lock.release()
+                raise
+            while not _try_lock(fd):
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    self.thread_lock.release()
+                    return False
+                time.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+            # 기다리는 동안 잠금 파일이 지워졌으면(remove_folder_locks) 새 잠금 파일로 다시 잡음
+            if _is_lock_file(fd, self.path):
+                break
+            _unlock(fd)
+            os.close(fd)
+        self.fd = fd
+        self.depth = 1
+        return True
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            fd, self.fd = self.fd, None
+            try:
+                _unlock(fd)
+            finally:
+                os.close(fd)
+        self.thread_lock.release()
+
+
+def _get_lock(folder_path, name):
+    path = _lock_path(folder_path, name)
+    with _registry_lock:
+        if path not in _locks:
+            _locks[path] = _FolderLock(path)
+        return _locks[path]
+
+
+@contextmanager
+def folder_lock(folder_path, name=None, timeout=-1):
+    """
+    폴더 잠금을 잡습니다. timeout(초)이 지나도 못 잡으면 FolderLockTimeout을 발생시킵니다.
+    timeout=-1이면 FOLDER_LOCK_TIMEOUT 설정값, None이면 무기한, 0이면 한 번만 시도합니다.
+    """
+    if timeout == -1:
+        timeout = getattr(settings, "FOLDER_LOCK_TIMEOUT", 30)
+    lock = _get_lock(folder_path, name)
+    if not lock.acquire(timeout):
+        raise FolderLockTimeout(Messages.FOLDER_LOCKED)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def remove_folder_locks(folder_path):
+    """
+    지운 폴더의 잠금 파일을 정리합니다. 각 잠금을 잡은 채로 지우며, 다른 쪽이 사용 중인 잠금은 그대로 둡니다.
+    (지운 잠금 파일을 기다리던 쪽은 잠금을 잡은 뒤 새 잠금 파일로 다시 잡음)
+    """
+    for name in LOCK_NAMES:
+        lock = _get_lock(folder_path, name)
+        if not lock.acquire(0):
+            continue
+        try:
+            os.remove(lock.path)
+        except OSError:
+            # 이미 없거나, Windows에서 다른 프로세스가 열어 둔 잠금 파일
+            pass
+        finally:
+            lock.release()
+
+
+def temp_path_for(path):
+    """
+    path와 같은 폴더의 임시 파일 경로 (같은 파일 시스템이어야 os.replace가 원자적)
+    """
+    folder_path, file_name = os.path.split(path)
+    return os.path.join(folder_path, f".{file_name}.{uuid.uuid4().hex}{TEMP_SUFFIX}")
+
+
+def is_internal_file(file_name):
+    """
+    업로드/규칙 폴더 안에 서버가 만드는 내부 파일인지 확인합니다.
+    (저장 중인 임시 파일, 시트 스냅숏, 편집 저널과 압축 중인 저널, 변경 기록)
+    """
+    return (
+        file_name.endswith(TEMP_SUFFIX)
+        or (file_name.startswith(".") and file_name.endswith(SNAPSHOT_SUFFIX))
+        or file_name in INTERNAL_FILENAMES
+    )
+
+
+def replace_file(tmp_path, path, attempts=5):
+    """
+    임시 파일로 path를 교체합니다.
+    (Windows에서는 다른 프로세스가 path를 읽는 중이면 교체가 잠시 실패하므로 몇 번 다시 시도)
+    """
+    for attempt in range(attempts):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(POLL_INTERVAL * (attempt + 1))
+
+
+@contextmanager
+def atomic_write(path, mode="w", encoding="utf-8"):
+    """
+    임시 파일에 쓰고 블록이 정상적으로 끝나면 path를 교체합니다. 실패하면 path는 그대로 남습니다.
+    """
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        replace_file(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_workbook_atomic(workbook, path):
+    """
+    openpyxl 워크북을 임시 파일에 저장한 뒤 path를 교체합니다.
+    """
+    tmp_path = temp_path_for(path)
+    try:
+        workbook.save(tmp_path)
+        replace_file(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,240 @@
+"""
+요청 단위 시간 측정과 집계 지표
+
+    span(name)              워크북 로드, 행 스캔, 진행도 계산 등 구간의 소요 시간을 잽니다. (@timed(name) 데코레이터도 같음)
+    RequestTimingMiddleware 요청마다 구간별 소요 시간 합계를 모아 "backend.timing" 로거에 JSON 한 줄로 남기고,
+                            요청 수와 지연시간 히스토그램을 집계합니다.
+    render_metrics()        집계 지표를 Prometheus 텍스트 형식으로 반환합니다. (/api/metrics/)
+
+같은 이름의 구간이 중첩되면(예: update_progress_stats 안의 scan_progress) 바깥 구간만 기록합니다.
+지표는 프로세스별로 집계되며 워커 프로세스(작업 큐, 배치 업로드)에서 실행된 구간은 포함되지 않습니다.
+
+PROFILE_SAMPLE_RATE > 0이면 그 비율의 요청을 cProfile로 실행하고,
+PROFILE_SLOW_MS 이상 걸린 요청의 프로파일만 PROFILE_DIR에 .prof 파일로 저장합니다.
+"""
+import os
+import json
+import time
+import bisect
+import random
+import logging
+import cProfile
+import datetime
+import threading
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger("backend.timing")
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 현재 요청의 구간 기록 ({이름: [합계 초, 횟수]}) / 실행 중인 구간 이름
+_request_spans = ContextVar("request_spans", default=None)
+_active_spans = ContextVar("active_spans", default=())
+
+
+class Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += seconds
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {(view, method, status): 요청 수}
+        self.requests = {}
+        # {view: Histogram}
+        self.request_durations = {}
+        # {구간 이름: Histogram}
+        self.span_durations = {}
+
+    def observe_request(self, view, method, status, seconds):
+        with self.lock:
+            key = (view, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_durations.setdefault(view, Histogram()).observe(seconds)
+
+    def observe_span(self, name, seconds):
+        with self.lock:
+            self.span_durations.setdefault(name, Histogram()).observe(seconds)
+
+
+_registry = MetricsRegistry()
+
+
+@contextmanager
+def span(name):
+    """
+    블록의 소요 시간을 구간 name으로 기록합니다.
+    """
+    active = _active_spans.get()
+    if name in active:
+        yield
+        return
+    token = _active_spans.set(active + (name,))
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _active_spans.reset(token)
+        _registry.observe_span(name, elapsed)
+        spans = _request_spans.get()
+        if spans is not None:
+            total = spans.setdefault(name, [0.0, 0])
+            total[0] += elapsed
+            total[1] += 1
+
+
+def timed(name):
+    """
+    함수 실행 전체를 구간 name으로 기록하는 데코레이터
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is not None and match.url_name:
+        return match.url_name
+    return "unmatched"
+
+
+class RequestTimingMiddleware:
+    """
+    요청별 구간 소요 시간 기록, 요청 지표 집계, 느린 요청 cProfile 저장
+    (스트리밍 응답은 응답 객체를 돌려줄 때까지의 시간만 측정됩니다)
+    """
+
+    _profile_lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        spans = {}
+        token = _request_spans.set(spans)
+        profiler = self._start_profiler()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self._profile_lock.release()
+            _request_spans.reset(token)
+
+        view = _view_name(request)
+        _registry.observe_request(view, request.method, response.status_code, elapsed)
+        if profiler is not None and elapsed * 1000 >= getattr(settings, "PROFILE_SLOW_MS", 1000):
+            self._dump_profile(profiler, view, elapsed)
+        self._log(request, view, response.status_code, elapsed, spans)
+        return response
+
+    def _start_profiler(self):
+        rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0)
+        if not rate or random.random() >= rate:
+            return None
+        # cProfile은 동시에 하나만 실행할 수 있으므로 다른 요청을 프로파일 중이면 건너뜀
+        if not self._profile_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            self._profile_lock.release()
+            return None
+        return profiler
+
+    def _dump_profile(self, profiler, view, elapsed):
+        profile_dir = getattr(settings, "PROFILE_DIR", os.path.join(settings.BASE_DIR, "Profile_file"))
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            profiler.dump_stats(os.path.join(profile_dir, f"{timestamp}_{view}_{int(elapsed * 1000)}ms.prof"))
+        except OSError as e:
+            print(f"프로파일 저장 오류: {e}")
+
+    def _log(self, request, view, status, elapsed, spans):
+        if not getattr(settings, "REQUEST_TIMING_LOG", True):
+            return
+        duration_ms = elapsed * 1000
+        if duration_ms < getattr(settings, "REQUEST_TIMING_LOG_MIN_MS", 0):
+            return
+        logger.info(json.dumps({
+            "view": view,
+            "method": request.method,
+            "path": request.path,
+            "status": status,
+            "durationMs": round(duration_ms, 3),
+            "spans": {
+                name: {"ms": round(total * 1000, 3), "count": count}
+                for name, (total, count) in sorted(spans.items())
+            },
+        }, ensure_ascii=False))
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+
+
+def _render_histogram(lines, metric, label_name, histograms):
+    lines.append(f"# TYPE {metric} histogram")
+    for label_value, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for upper, bucket_count in zip(BUCKETS, histogram.bucket_counts):
+            cumulative += bucket_count
+            lines.append(f"{metric}_bucket{{{_labels(**{label_name: label_value, 'le': upper})}}} {cumulative}")
+        lines.append(f"{metric}_bucket{{{_labels(**{label_name: label_value, 'le': '+Inf'})}}} {histogram.count}")
+        lines.append(f"{metric}_sum{{{_labels(**{label_name: label_value})}}} {histogram.total:.6f}")
+        lines.append(f"{metric}_count{{{_labels(**{label_name: label_value})}}} {histogram.count}")
+
+
+def render_metrics(extra_counters=None, extra_gauges=None):
+    """
+    집계 지표를 Prometheus 텍스트 형식(0.0.4)으로 만듭니다.
+    extra_counters/extra_gauges: {지표 이름: 값} (시트 캐시 통계 등)
+    """
+    lines = []
+    with _registry.lock:
+        lines.append("# HELP auditmate_requests_total 처리한 HTTP 요청 수")
+        lines.append("# TYPE auditmate_requests_total counter")
+        for (view, method, status), count in sorted(_registry.requests.items()):
+            lines.append(f"auditmate_requests_total{{{_labels(view=view, method=method, status=status)}}} {count}")
+
+        lines.append("# HELP auditmate_request_duration_seconds 요청 처리 시간")
+        _render_histogram(lines, "auditmate_request_duration_seconds", "view", _registry.request_durations)
+        lines.append("# HELP auditmate_span_duration_seconds 구간(워크북 로드, 행 스캔 등)별 소요 시간")
+        _render_histogram(lines, "auditmate_span_duration_seconds", "span", _registry.span_durations)
+
+    for name, value in sorted((extra_counters or {}).items()):
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    for name, value in sorted((extra_gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
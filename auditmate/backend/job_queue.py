@@ -0,0 +1,399 @@
+"""
+무거운 워크북 작업을 위한 로컬 작업 큐
+
+작업 상태는 Job_file/jobs.sqlite3에 기록하고, 실제 작업은 프로세스 풀에서 실행합니다.
+요청 스레드는 작업을 등록하고 작업 id만 돌려주며, 클라이언트는 /api/jobs/<id>/로 상태와 진행률을 조회하고
+결과 파일이 있으면 /api/jobs/<id>/result/에서 받아갑니다. 외부 브로커가 필요 없습니다.
+
+작업 상태: queued -> running -> done | error
+
+여러 서버 프로세스가 같은 DB를 쓰므로 작업마다 등록한 프로세스(owner)를 기록하고, 풀을 가진 프로세스는
+job_owners 테이블에 JOB_HEARTBEAT_INTERVAL초마다 살아 있음을 남깁니다.
+JOB_HEARTBEAT_TIMEOUT초 넘게 소식이 없는 프로세스의 작업만 정리하므로 살아 있는 프로세스의 작업은 건드리지 않습니다.
+    - 실행 중이던 작업은 실패로 표시
+    - 대기 중이던 작업은 정리하는 프로세스가 넘겨받아 자기 풀에 넣음
+정리는 하트비트 스레드가 수행하며, 모든 프로세스를 통틀어 JOB_HEARTBEAT_INTERVAL초에 한 번만 실행됩니다.
+"""
+import os
+import json
+import time
+import uuid
+import socket
+import shutil
+import sqlite3
+import datetime
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .constants import WORKSHEET_NAME, PROGRESS_COLUMN, Messages
+from .process_pool import create_process_pool
+from .folder_lock import folder_lock
+from .metadata import get_file_fingerprint, load_metadata, save_metadata, apply_progress_stats
+from .xlsx_reader import progress_from_rows
+from .xlsx_writer import normalize_review_value, save_data_rows
+from .exports import cached_export, write_folder_zip
+from .edit_journal import has_pending_entries, compact_journal
+from .upload_pipeline import analyze_workbook, build_metadata
+from .workbook_cache import get_sheet_data, refresh_sheet_data
+from .change_feed import CurrentSheet, changes_since, summarize, diff_rows, record_changes, reconcile_rows
+
+JOB_DIR = os.path.join(settings.BASE_DIR, "Job_file")
+JOB_DB_FILENAME = "jobs.sqlite3"
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+
+_executor = None
+_executor_lock = threading.Lock()
+# 이 프로세스의 작업 소유자 id (호스트:pid:임의값, pid가 재사용되어도 겹치지 않음)
+_owner = None
+
+
+@contextmanager
+def _connect(job_dir):
+    """
+    작업 DB 연결 (블록이 끝나면 커밋하고 닫습니다)
+    """
+    connection = sqlite3.connect(os.path.join(job_dir, JOB_DB_FILENAME), timeout=30)
+    connection.row_factory = sqlite3.Row
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+def init_db(job_dir):
+    os.makedirs(job_dir, exist_ok=True)
+    with _connect(job_dir) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                owner TEXT
+            )
+            """
+        )
+        # owner 컬럼이 없던 이전 DB
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            connection.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        connection.execute("CREATE TABLE IF NOT EXISTS job_owners (owner TEXT PRIMARY KEY, heartbeat REAL NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS job_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+        connection.execute("INSERT OR IGNORE INTO job_meta (key, value) VALUES ('recovered_at', 0)")
+
+
+def _update_job(job_dir, job_id, **fields):
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{key} = ?" for key in fields)
+    with _connect(job_dir) as connection:
+        connection.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+
+def result_dir(job_dir, job_id):
+    return os.path.join(job_dir, job_id)
+
+
+# ---- 작업 핸들러 (워커 프로세스에서 실행) ----
+# 각 핸들러는 (params, job_result_dir, report) 를 받아 결과 dict를 반환합니다.
+# 결과 파일을 만들면 결과 dict의 "resultFile"에 파일명을 담습니다.
+
+def _analyze_upload(params, job_result_dir, report):
+    """
+    업로드된 파일의 컬럼 행 탐지와 진행도 계산 후 metadata.json 생성
+    """
+    analysis = analyze_workbook(params["filePath"])
+    if "error" in analysis:
+        shutil.rmtree(params["folderPath"], ignore_errors=True)
+        raise RuntimeError(analysis["error"])
+    report(80)
+    metadata = build_metadata(params["folderName"], params["filePath"], analysis, params.get("ruleName"))
+    save_metadata(params["folderPath"], metadata)
+    return {"metadata": metadata, "columnFill": analysis["columnFill"]}
+
+
+def _save_sheet(params, job_result_dir, report):
+    """
+    집행내역 데이터 영역 전체 교체 저장 (save-xlsx의 비동기 버전)
+    """
+    folder_path = params["folderPath"]
+    file_path = params["filePath"]
+    data = params["data"]
+
+    # 먼저 저널을 반영해 두어야 나중에 압축될 이전 편집이 이 저장을 덮어쓰지 않음
+    if has_pending_entries(folder_path):
+        compact_journal(folder_path)
+    report(20)
+
+    last_modified = params.get("lastModified") or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # 다른 워커의 저장과 섞이지 않도록 metadata 읽기부터 저장까지 폴더 잠금 안에서 수행
+    with folder_lock(folder_path):
+        metadata = load_metadata(folder_path)
+        column_line = metadata.get("columnLine", 0)
+
+        # baseVersion 이후 다른 요청이 바꾼 행과 맞추고 (save-xlsx와 같음), 바뀐 행을 변경 기록에 남김
+        current = CurrentSheet(get_sheet_data(file_path, column_line), [])
+        # 검토사항은 저장 형식으로 바꾼 뒤 현재 행과 비교
+        for row in data:
+            row[PROGRESS_COLUMN] = normalize_review_value(row.get(PROGRESS_COLUMN))
+        if params.get("baseVersion") is not None:
+            history = changes_since(folder_path, metadata, params["baseVersion"])
+            if history is None:
+                raise RuntimeError(Messages.SYNC_RESET_REQUIRED)
+            data, conflicts = reconcile_rows(summarize(history), current, data)
+            if conflicts:
+                raise RuntimeError(Messages.SAVE_CONFLICT.format(", ".join(str(row_index + 1) for row_index in conflicts)))
+
+        changed = diff_rows(current, data)
+
+        if not save_data_rows(file_path, column_line, data):
+            raise RuntimeError(Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME))
+        report(60)
+
+        version = record_changes(folder_path, metadata, changed, len(data), last_modified)
+        apply_progress_stats(metadata, progress_from_rows(data))
+        metadata["fingerprint"] = get_file_fingerprint(file_path)
+        metadata["lastModified"] = last_modified
+        save_metadata(folder_path, metadata)
+    refresh_sheet_data(file_path, column_line)
+    return {"progress": metadata["progress"], "version": version}
+
+
+def _export_xlsx(params, job_result_dir, report):
+    """
+    다운로드용 xlsx 생성 (download의 type=no_review 등)
+    """
+    folder_path = params["folderPath"]
+    if has_pending_entries(folder_path):
+        compact_journal(folder_path)
+    report(20)
+
+    file_name = params["fileName"]
+    column_line = load_metadata(folder_path).get("columnLine", 0)
+    export_path = cached_export(
+        os.path.join(folder_path, file_name), column_line, params.get("downloadType", "full"), params["cacheDir"]
+    )
+    report(90)
+    shutil.copyfile(export_path, os.path.join(job_result_dir, file_name))
+    return {"resultFile": file_name}
+
+
+def _folder_zip(params, job_result_dir, report):
+    """
+    폴더 전체 zip 생성 (규칙 폴더 다운로드)
+    """
+    file_name = params["fileName"]
+    write_folder_zip(params["folderPath"], os.path.join(job_result_dir, file_name))
+    return {"resultFile": file_name}
+
+
+HANDLERS = {
+    "analyze_upload": _analyze_upload,
+    "save_sheet": _save_sheet,
+    "export_xlsx": _export_xlsx,
+    "folder_zip": _folder_zip,
+}
+
+
+def run_job(job_dir, job_id):
+    """
+    워커 프로세스에서 작업 하나를 실행합니다.
+    queued 상태인 작업만 running으로 바꿔 가져가므로 같은 작업이 두 번 실행되지 않습니다.
+    """
+    with _connect(job_dir) as connection:
+        claimed = connection.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (STATUS_RUNNING, time.time(), job_id, STATUS_QUEUED),
+        ).rowcount
+        row = connection.execute("SELECT kind, params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if not claimed or row is None:
+        return
+
+    job_result_dir = result_dir(job_dir, job_id)
+    os.makedirs(job_result_dir, exist_ok=True)
+
+    def report(percent):
+        _update_job(job_dir, job_id, progress=float(percent))
+
+    try:
+        result = HANDLERS[row["kind"]](json.loads(row["params"]), job_result_dir, report)
+        _update_job(
+            job_dir, job_id, status=STATUS_DONE, progress=100.0,
+            result=json.dumps(result, ensure_ascii=False, default=str)
+        )
+    except Exception as e:
+        print(f"작업 실행 오류 ({row['kind']} {job_id}): {e}")
+        _update_job(job_dir, job_id, status=STATUS_ERROR, error=str(e))
+
+
+# ---- 요청 스레드 쪽 API ----
+
+def _heartbeat_interval():
+    return getattr(settings, "JOB_HEARTBEAT_INTERVAL", 10)
+
+
+def _heartbeat(job_dir, owner):
+    with _connect(job_dir) as connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO job_owners (owner, heartbeat) VALUES (?, ?)", (owner, time.time())
+        )
+
+
+def _claim_recovery(job_dir):
+    """
+    마지막 정리 후 JOB_HEARTBEAT_INTERVAL초가 지났으면 이번 정리를 맡습니다. (여러 프로세스 중 하나만 True)
+    """
+    now = time.time()
+    with _connect(job_dir) as connection:
+        return connection.execute(
+            "UPDATE job_meta SET value = ? WHERE key = 'recovered_at' AND value <= ?",
+            (now, now - _heartbeat_interval()),
+        ).rowcount == 1
+
+
+def _recover_jobs(job_dir, executor, owner):
+    """
+    하트비트가 끊긴 프로세스가 남긴 작업을 정리합니다.
+    실행 중이던 작업은 실패로 표시하고, 대기 중이던 작업은 owner가 넘겨받아 풀에 넣고, 오래된 작업은 결과와 함께 지웁니다.
+    """
+    now = time.time()
+    stale_before = now - getattr(settings, "JOB_HEARTBEAT_TIMEOUT", 60)
+    max_age = getattr(settings, "JOB_RESULT_MAX_AGE", 24 * 60 * 60)
+    adopted = []
+    with _connect(job_dir) as connection:
+        live = {
+            row["owner"] for row in connection.execute(
+                "SELECT owner FROM job_owners WHERE heartbeat >= ?", (stale_before,)
+            )
+        }
+        orphaned = [
+            row for row in connection.execute(
+                "SELECT id, status, owner FROM jobs WHERE status IN (?, ?)", (STATUS_QUEUED, STATUS_RUNNING)
+            )
+            if row["owner"] not in live
+        ]
+        for row in orphaned:
+            if row["status"] == STATUS_RUNNING:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (STATUS_ERROR, Messages.JOB_INTERRUPTED, now, row["id"], STATUS_RUNNING),
+                )
+            elif connection.execute(
+                "UPDATE jobs SET owner = ? WHERE id = ? AND status = ? AND owner IS ?",
+                (owner, row["id"], STATUS_QUEUED, row["owner"]),
+            ).rowcount:
+                adopted.append(row["id"])
+
+        expired = [
+            row["id"] for row in connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (STATUS_DONE, STATUS_ERROR, now - max_age),
+            )
+        ]
+        connection.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+        connection.execute("DELETE FROM job_owners WHERE heartbeat < ?", (stale_before,))
+
+    for job_id in expired:
+        shutil.rmtree(result_dir(job_dir, job_id), ignore_errors=True)
+    for job_id in adopted:
+        executor.submit(run_job, job_dir, job_id)
+
+
+def _heartbeat_loop(job_dir, executor, owner):
+    """
+    이 프로세스가 살아 있음을 기록하고, 차례가 오면 다른 프로세스가 남긴 작업을 정리합니다.
+    """
+    while True:
+        try:
+            _heartbeat(job_dir, owner)
+            if _claim_recovery(job_dir):
+                _recover_jobs(job_dir, executor, owner)
+        except Exception as e:
+            print(f"작업 큐 하트비트 오류: {e}")
+        time.sleep(_heartbeat_interval())
+
+
+def get_executor():
+    """
+    작업용 프로세스 풀 (처음 사용할 때 DB를 준비하고 하트비트 스레드를 시작합니다)
+    """
+    global _executor, _owner
+    with _executor_lock:
+        if _executor is None:
+            init_db(JOB_DIR)
+            _owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            # 첫 작업을 등록하기 전에 하트비트를 남겨야 다른 프로세스가 이 작업을 넘겨받지 않음
+            _heartbeat(JOB_DIR, _owner)
+            _executor = create_process_pool("JOB_WORKERS")
+            threading.Thread(
+                target=_heartbeat_loop, args=(JOB_DIR, _executor, _owner), name="job-heartbeat", daemon=True
+            ).start()
+        return _executor
+
+
+def submit_job(kind, params):
+    """
+    작업을 등록하고 풀에 넣은 뒤 작업 id를 반환합니다.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+    executor = get_executor()
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _connect(JOB_DIR) as connection:
+        connection.execute(
+            "INSERT INTO jobs (id, kind, params, status, progress, created_at, updated_at, owner)"
+            " VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+            (job_id, kind, json.dumps(params, ensure_ascii=False, default=str), STATUS_QUEUED, now, now, _owner),
+        )
+    executor.submit(run_job, JOB_DIR, job_id)
+    return job_id
+
+
+def get_job(job_id):
+    """
+    작업 상태를 dict로 반환합니다. 없으면 None을 반환합니다.
+    """
+    if not os.path.exists(os.path.join(JOB_DIR, JOB_DB_FILENAME)):
+        return None
+    with _connect(JOB_DIR) as connection:
+        row = connection.execute(
+            "SELECT id, kind, status, progress, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    if row is None:
+        return None
+    return {
+        "id": row["id"],
+        "kind": row["kind"],
+        "status": row["status"],
+        "progress": row["progress"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "createdAt": datetime.datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+        "updatedAt": datetime.datetime.fromtimestamp(row["updated_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def get_result_path(job):
+    """
+    완료된 작업의 결과 파일 경로 (결과 파일이 없으면 None)
+    """
+    if job["status"] != STATUS_DONE or not job["result"] or not job["result"].get("resultFile"):
+        return None
+    path = os.path.join(result_dir(JOB_DIR, job["id"]), job["result"]["resultFile"])
+    return path if os.path.exists(path) else None
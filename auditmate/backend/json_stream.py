@@ -0,0 +1,139 @@
+"""
+큰 표 데이터 응답의 압축 형식 JSON 인코딩과 스트리밍 (read-xlsx의 format 옵션)
+
+기본 형식(rows)은 행마다 {헤더: 값} dict를 만들고 응답 전체를 한 번에 JSON 문자열로 만들기 때문에
+큰 시트에서는 헤더 문자열이 행 수만큼 반복되고 응답 크기의 몇 배 메모리를 씁니다.
+compact / columnar 형식은 헤더를 actual_columns로 한 번만 보내고, 값 튜플을 그대로 CHUNK_ROWS행씩 인코딩해 바로 내보냅니다.
+
+    rows      "data": [{헤더: 값, ...}, ...]          (기존 형식)
+    compact   "data": [[값, ...], ...]                (행마다 actual_columns 순서의 값 배열)
+    columnar  "data": [[열 값, ...], ...]             (actual_columns 순서대로 열마다 전체 행의 값 배열)
+
+형식은 ?format=, 요청 body의 format, Accept 헤더(application/vnd.auditmate.compact+json 등) 순서로 정합니다.
+ujson이 있으면 사용하고 없으면 표준 json 모듈로 인코딩합니다. 날짜/시간은 JsonResponse와 같은 문자열로,
+Decimal은 숫자로, numpy 값은 파이썬 값으로, NaN/Infinity는 null로 바꿉니다.
+"""
+import json
+import math
+import decimal
+import datetime
+
+import numpy as np
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .instrumentation import span
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+ROWS_FORMAT = "rows"
+COMPACT_FORMAT = "compact"
+COLUMNAR_FORMAT = "columnar"
+TABLE_FORMATS = (ROWS_FORMAT, COMPACT_FORMAT, COLUMNAR_FORMAT)
+
+# 한 번에 인코딩해서 내보내는 행 수
+CHUNK_ROWS = 2000
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def response_format(request, body=None):
+    """
+    요청한 표 응답 형식 (지정하지 않았으면 rows, 알 수 없는 형식이면 None)
+    """
+    table_format = request.GET.get("format") or (body or {}).get("format")
+    if not table_format:
+        accept = request.headers.get("Accept", "")
+        table_format = next(
+            (name for name in TABLE_FORMATS if f"application/vnd.auditmate.{name}+json" in accept),
+            ROWS_FORMAT,
+        )
+    return table_format if table_format in TABLE_FORMATS else None
+
+
+def _default(value):
+    """
+    JSON이 직접 지원하지 않는 값 변환 (날짜/시간은 DjangoJSONEncoder와 같은 형식)
+    """
+    # 집행내역에서 가장 흔한 값(초 단위 날짜)은 DjangoJSONEncoder를 거치지 않고 바로 변환
+    if type(value) is datetime.datetime and not value.microsecond and value.tzinfo is None:
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return _django_encoder.default(value)
+
+
+def _finite(value):
+    """
+    NaN/Infinity를 None으로 바꾼 값 (list/tuple/dict 안쪽까지)
+    """
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (np.generic, decimal.Decimal)):
+        value = _default(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _encode(value):
+    if ujson is not None:
+        return ujson.dumps(value, ensure_ascii=False, allow_nan=False, default=_default).encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def dumps(value):
+    """
+    value를 UTF-8 JSON 바이트로 인코딩합니다.
+    """
+    try:
+        return _encode(value)
+    except (ValueError, OverflowError):
+        # NaN/Infinity가 있는 드문 경우에만 값을 한 번 더 훑어서 null로 바꿈
+        return _encode(_finite(value))
+
+
+def _pad(row, width):
+    return row if len(row) >= width else tuple(row) + (None,) * (width - len(row))
+
+
+def iter_table_json(payload, rows, width, table_format):
+    """
+    payload 뒤에 "data"로 rows를 붙인 JSON 객체를 조각(bytes)으로 만들어 냅니다.
+    rows는 값 튜플(또는 리스트) 목록이며 width보다 짧은 행은 뒤를 None으로 채웁니다. (없던 핵심 컬럼)
+    """
+    yield dumps(payload)[:-1] + (b',"data":[' if payload else b'"data":[')
+    if table_format == COLUMNAR_FORMAT:
+        for col_idx in range(width):
+            with span("json_encode"):
+                encoded = dumps([row[col_idx] if col_idx < len(row) else None for row in rows])
+            yield encoded if col_idx == 0 else b"," + encoded
+    else:
+        for start in range(0, len(rows), CHUNK_ROWS):
+            with span("json_encode"):
+                chunk = [_pad(row, width) for row in rows[start:start + CHUNK_ROWS]]
+                encoded = dumps(chunk)[1:-1]
+            yield encoded if start == 0 else b"," + encoded
+    yield b"]}"
+
+
+def table_response(payload, rows, width, table_format, status=200):
+    """
+    compact/columnar 형식의 표 응답 (조각 단위로 스트리밍)
+    """
+    response = StreamingHttpResponse(
+        iter_table_json(payload, rows, width, table_format),
+        content_type="application/json",
+        status=status,
+    )
+    response["X-Table-Format"] = table_format
+    return response
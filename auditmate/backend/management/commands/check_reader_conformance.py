@@ -0,0 +1,31 @@
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.benchmarks.conformance import build_conformance_workbooks, compare_backends
+
+
+class Command(BaseCommand):
+    help = "fast xlsx 리더가 openpyxl 읽기 전용 모드와 같은 값을 읽는지 검사합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="*", help="추가로 검사할 xlsx 파일 (기본: 합성 검사 파일만)")
+
+    def handle(self, *args, **options):
+        failed = 0
+        with tempfile.TemporaryDirectory(prefix="auditmate_conformance_") as work_dir:
+            for file_path in build_conformance_workbooks(work_dir) + options["files"]:
+                try:
+                    mismatches = compare_backends(file_path)
+                except Exception as e:
+                    mismatches = [f"읽기 오류: {e}"]
+                if mismatches:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"불일치: {file_path}"))
+                    for mismatch in mismatches:
+                        self.stdout.write(f"  {mismatch}")
+                else:
+                    self.stdout.write(f"일치: {file_path}")
+        if failed:
+            raise CommandError(f"{failed}개 파일에서 두 리더의 결과가 다릅니다")
+        self.stdout.write(self.style.SUCCESS("모든 파일에서 두 리더의 결과가 같습니다"))
@@ -0,0 +1,15 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend.catalog import reconcile
+
+
+class Command(BaseCommand):
+    help = "Upload_file 폴더의 metadata.json을 기준으로 업로드 폴더 카탈로그를 다시 만듭니다"
+
+    def handle(self, *args, **options):
+        upload_dir = os.path.join(settings.BASE_DIR, "Upload_file")
+        synced, removed = reconcile(upload_dir)
+        self.stdout.write(self.style.SUCCESS(f"카탈로그 재구성 완료: {synced}개 폴더 반영, {removed}개 행 삭제"))
@@ -0,0 +1,72 @@
+import os
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment, override_settings
+
+from backend.benchmarks.runner import (
+    DEFAULT_SIZES, SCENARIO_NAMES, run_benchmarks, compare_results, save_results, load_results,
+)
+
+
+class Command(BaseCommand):
+    help = "합성 집행내역 원장으로 백엔드 API 벤치마크를 실행하고 결과를 JSON으로 저장합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                            help="원장 행 수 목록 (쉼표로 구분)")
+        parser.add_argument("--iterations", type=int, default=5, help="시나리오별 반복 횟수")
+        parser.add_argument("--scenarios", default="", help=f"실행할 시나리오 (기본: 전체) {', '.join(SCENARIO_NAMES)}")
+        parser.add_argument("--column-line", type=int, default=2, help="헤더 위 제목 행 수 (columnLine)")
+        parser.add_argument("--no-journal", action="store_true", help="편집 저널 없이 xlsx에 바로 저장하며 측정")
+        parser.add_argument("--output", help="결과 JSON 경로 (기본: Benchmark_file/benchmark_<시각>.json)")
+        parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+        parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 지연시간 증가 비율")
+        parser.add_argument("--metric", default="p50Ms", help="비교할 지표 (p50Ms, p95Ms 등)")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError:
+            raise CommandError(f"잘못된 --sizes 값입니다: {options['sizes']}")
+        scenarios = [name.strip() for name in options["scenarios"].split(",") if name.strip()] or None
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = load_results(options["baseline"])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"기준 결과를 읽을 수 없습니다: {e}")
+
+        # 카탈로그 등 DB 쓰기는 테스트용 DB에서 수행
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(EDIT_JOURNAL_ENABLED=not options["no_journal"]):
+                results = run_benchmarks(
+                    sizes=sizes, iterations=options["iterations"], scenarios=scenarios,
+                    column_line=options["column_line"], log=self.stdout.write,
+                )
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = options["output"] or os.path.join(
+            settings.BASE_DIR, "Benchmark_file", f"benchmark_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        save_results(results, output)
+        self.stdout.write(self.style.SUCCESS(f"벤치마크 결과 저장: {output}"))
+
+        if baseline is not None:
+            regressions = compare_results(results, baseline, threshold=options["threshold"], metric=options["metric"])
+            for item in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"  {item['key']}: {item['baseline']}ms -> {item['current']}ms (x{item['ratio']})"
+                ))
+            if regressions:
+                raise CommandError(f"기준 결과 대비 {len(regressions)}개 항목이 {options['threshold']:.0%} 넘게 느려졌습니다")
+            self.stdout.write(self.style.SUCCESS("기준 결과 대비 회귀 없음"))
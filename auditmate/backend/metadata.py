@@ -0,0 +1,83 @@
+"""
+업로드 폴더의 metadata.json 읽기/쓰기 및 파일 지문(fingerprint) 관리
+"""
+import os
+import json
+
+from .constants import METADATA_FILENAME
+from .instrumentation import span
+from .folder_lock import atomic_write
+
+
+def get_file_fingerprint(file_path):
+    """
+    파일의 수정 시각(mtime)과 크기(size)로 지문을 만듭니다.
+    파일이 없으면 None을 반환합니다.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def is_fingerprint_current(metadata, file_path):
+    """
+    metadata.json에 저장된 지문이 디스크의 파일과 일치하는지 확인합니다.
+    """
+    stored = metadata.get("fingerprint")
+    if not stored:
+        return False
+    return stored == get_file_fingerprint(file_path)
+
+
+def load_metadata(folder_path):
+    """
+    폴더의 metadata.json을 읽어 dict로 반환합니다. 없거나 읽을 수 없으면 빈 dict를 반환합니다.
+    """
+    metadata_path = os.path.join(folder_path, METADATA_FILENAME)
+    if not os.path.exists(metadata_path):
+        return {}
+    try:
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Metadata 파일 읽기 오류: {e}")
+        return {}
+
+
+def save_metadata(folder_path, metadata):
+    """
+    폴더의 metadata.json을 저장합니다. (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완성된 파일을 봅니다)
+    읽기-수정-쓰기를 하는 쪽은 folder_lock(folder_path) 안에서 load_metadata부터 호출해야 다른 워커의 변경을 덮어쓰지 않습니다.
+    """
+    metadata_path = os.path.join(folder_path, METADATA_FILENAME)
+    with span("file_write"):
+        with atomic_write(metadata_path) as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=4)
+    with span("catalog_sync"):
+        sync_catalog(folder_path, metadata)
+
+
+def sync_catalog(folder_path, metadata):
+    """
+    저장한 metadata를 업로드 폴더 카탈로그에도 반영합니다.
+    카탈로그는 사본이므로 반영에 실패해도 저장은 실패로 처리하지 않습니다. (다음 목록 조회나 reconcile_catalog에서 맞춰짐)
+    """
+    try:
+        from .catalog import sync_folder
+        sync_folder(os.path.basename(os.path.normpath(folder_path)), metadata)
+    except Exception as e:
+        print(f"카탈로그 갱신 오류: {e}")
+
+
+def apply_progress_stats(metadata, stats):
+    """
+    scan_progress 결과(진행도와 통계)를 metadata에 기록합니다.
+    통계는 이후 셀 단위 저장 시 진행도를 증분 계산하는 데 사용됩니다.
+    """
+    metadata["progress"] = stats["progress"]
+    metadata["progressStats"] = {
+        "totalRows": stats["totalRows"],
+        "lastFilledRow": stats["lastFilledRow"],
+    }
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadFolder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('folder_name', models.CharField(max_length=255, unique=True)),
+                ('xlsx_file', models.CharField(blank=True, max_length=255, null=True)),
+                ('column_line', models.IntegerField(default=0)),
+                ('progress', models.FloatField(db_index=True, default=0)),
+                ('total_rows', models.IntegerField(blank=True, null=True)),
+                ('last_filled_row', models.IntegerField(blank=True, null=True)),
+                ('rule_name', models.CharField(blank=True, db_index=True, max_length=255, null=True)),
+                ('last_modified', models.CharField(blank=True, db_index=True, default='', max_length=32)),
+                ('fingerprint_mtime', models.BigIntegerField(blank=True, null=True)),
+                ('fingerprint_size', models.BigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['folder_name'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+import datetime
+
+from django.db import migrations
+
+
+def normalize_last_modified(apps, schema_editor):
+    """
+    xlsx 없이 업로드한 폴더 등에서 "%Y%m%d_%H%M%S" 형식으로 들어간 last_modified를 "%Y-%m-%d %H:%M:%S"로 맞춤
+    """
+    UploadFolder = apps.get_model("backend", "UploadFolder")
+    for folder in UploadFolder.objects.exclude(last_modified=""):
+        try:
+            value = datetime.datetime.strptime(folder.last_modified, "%Y%m%d_%H%M%S")
+        except ValueError:
+            continue
+        folder.last_modified = value.strftime("%Y-%m-%d %H:%M:%S")
+        folder.save(update_fields=["last_modified"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_last_modified, migrations.RunPython.noop),
+    ]
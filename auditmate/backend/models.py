@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class UploadFolder(models.Model):
+    """
+    Upload_file/<폴더>/metadata.json 내용을 목록 조회/정렬/필터링용으로 옮겨 둔 카탈로그
+    원본은 항상 metadata.json이며, 이 테이블은 metadata를 저장할 때마다 함께 갱신됩니다.
+    """
+    folder_name = models.CharField(max_length=255, unique=True)
+    xlsx_file = models.CharField(max_length=255, null=True, blank=True)
+    column_line = models.IntegerField(default=0)
+    progress = models.FloatField(default=0, db_index=True)
+    total_rows = models.IntegerField(null=True, blank=True)
+    last_filled_row = models.IntegerField(null=True, blank=True)
+    rule_name = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    # metadata의 lastModified 문자열 ("%Y-%m-%d %H:%M:%S" 형식이라 문자열 비교로 정렬/범위 조회 가능)
+    last_modified = models.CharField(max_length=32, blank=True, default="", db_index=True)
+    fingerprint_mtime = models.BigIntegerField(null=True, blank=True)
+    fingerprint_size = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["folder_name"]
+
+    def to_list_item(self):
+        """
+        list_files 응답 항목 형식
+        """
+        return {
+            "folderName": self.folder_name,
+            "xlsxFile": self.xlsx_file,
+            "lastModified": self.last_modified,
+            "progress": self.progress,
+            "ruleName": self.rule_name,
+        }
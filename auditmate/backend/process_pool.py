@@ -0,0 +1,22 @@
+"""
+백그라운드 작업용 프로세스 풀 생성
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+
+
+def create_process_pool(workers_setting):
+    """
+    settings의 workers_setting 값(없으면 CPU 코어 수)만큼 워커를 두는 프로세스 풀을 만듭니다.
+    요청 스레드와 압축기 스레드가 도는 프로세스를 fork하면 잠금 상태까지 복제되어 워커가 멈출 수 있으므로
+    모든 플랫폼에서 spawn 방식으로 워커를 띄웁니다.
+    """
+    max_workers = getattr(settings, workers_setting, None) or os.cpu_count() or 1
+    # 워커에서도 metadata 저장 시 카탈로그(ORM)를 갱신하므로 Django를 초기화해 둠
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup
+    )
@@ -0,0 +1,195 @@
+"""
+검토 규칙(documentRule) 평가 엔진
+
+규칙 폴더를 조회 테이블로 컴파일한 뒤, 집행내역 전체 행을 세목명/증빙구분/검토사항 값으로 factorize하여
+서로 다른 조합마다 한 번씩만 평가하고 그 결과를 전체 행에 벡터 연산으로 펼칩니다.
+행 수가 많아도 실제 계산량은 조합 수에 비례합니다.
+
+documentRule 구조
+    세목별서류:     {세목명: {사전승인|수행과정|수행확인: [서류, ...]}}
+    증빙구분별서류: {증빙구분: {판매사실입증|실지급입증|보완보조서류: [서류, ...]}}
+    서류별기입항목: {서류: [기입항목, ...]}
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .constants import PROGRESS_COLUMN
+
+PHASE_KEY = "세목별서류"
+PROOF_KEY = "증빙구분별서류"
+FIELDS_KEY = "서류별기입항목"
+PHASE_COLUMN = "세목명"
+PROOF_COLUMN = "증빙구분"
+
+# 괄호 밖 쉼표만 분할 (프론트엔드의 검토사항 분할 규칙과 동일)
+REVIEW_SPLIT_PATTERN = re.compile(r",(?![^(]*\))")
+REVIEW_ITEM_PATTERN = re.compile(r"^(?P<doc>[^(]*?)\s*(?:\((?P<fields>.*)\))?$")
+
+
+def flatten_documents(value):
+    """
+    {구분: [서류, ...]} 또는 [서류, ...] 형태의 값을 순서를 유지한 서류 목록으로 펼칩니다.
+    """
+    if isinstance(value, dict):
+        docs = [doc for group in value.values() for doc in flatten_documents(group)]
+    elif isinstance(value, (list, tuple)):
+        docs = [str(doc) for doc in value]
+    elif value:
+        docs = [str(value)]
+    else:
+        docs = []
+    return list(dict.fromkeys(docs))
+
+
+class CompiledRule:
+    def __init__(self, document_rule):
+        document_rule = document_rule or {}
+        self.phase_docs = {
+            str(key).strip(): tuple(flatten_documents(value))
+            for key, value in (document_rule.get(PHASE_KEY) or {}).items()
+        }
+        self.proof_docs = {
+            str(key).strip(): tuple(flatten_documents(value))
+            for key, value in (document_rule.get(PROOF_KEY) or {}).items()
+        }
+        self.doc_fields = {
+            str(doc): tuple(fields or [])
+            for doc, fields in (document_rule.get(FIELDS_KEY) or {}).items()
+        }
+
+    def required_documents(self, phase, proof):
+        return list(dict.fromkeys(self.phase_docs.get(phase, ()) + self.proof_docs.get(proof, ())))
+
+
+def compile_rule(rule_info):
+    """
+    load_rule_from_folder 결과를 CompiledRule로 변환합니다.
+    """
+    return CompiledRule(rule_info.get("documentRule"))
+
+
+def parse_review(review):
+    """
+    검토사항 문자열을 {서류: {기입항목: 값}} dict로 변환합니다.
+    예) "견적서(금액: 1000, 일자: ), 영수증" -> {"견적서": {"금액": "1000", "일자": ""}, "영수증": {}}
+    """
+    checked = {}
+    if not review:
+        return checked
+    if isinstance(review, (list, tuple)):
+        items = [str(item) for item in review]
+    else:
+        items = REVIEW_SPLIT_PATTERN.split(str(review))
+
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        match = REVIEW_ITEM_PATTERN.match(item)
+        doc = match.group("doc").strip() if match else item
+        fields = {}
+        if match and match.group("fields"):
+            for pair in match.group("fields").split(","):
+                if ":" in pair:
+                    key, value = pair.split(":", 1)
+                    fields[key.strip()] = value.strip()
+        checked[doc] = fields
+    return checked
+
+
+def _evaluate_combination(compiled, phase, proof, review):
+    required = compiled.required_documents(phase, proof)
+    checked = parse_review(review)
+    missing_documents = [doc for doc in required if doc not in checked]
+    missing_fields = {}
+    for doc, values in checked.items():
+        missing = [field for field in compiled.doc_fields.get(doc, ()) if not values.get(field)]
+        if missing:
+            missing_fields[doc] = missing
+    return required, missing_documents, missing_fields
+
+
+def _normalize_column(values):
+    """
+    조인 키로 쓸 수 있도록 값을 공백 제거된 문자열로 바꿉니다. (빈값은 "")
+    """
+    series = pd.Series(values, dtype=object)
+    return series.where(series.notna(), "").astype(str).str.strip()
+
+
+def evaluate_rows(compiled, columns, length):
+    """
+    {컬럼명: 값 목록} 형태의 열 데이터를 평가해 행별 결과 배열을 반환합니다.
+    반환값: (required_documents, missing_documents, missing_fields) 각각 행 수 길이의 object 배열
+    """
+    empty = [None] * length
+    phases = _normalize_column(columns.get(PHASE_COLUMN, empty))
+    proofs = _normalize_column(columns.get(PROOF_COLUMN, empty))
+    reviews = _normalize_column(columns.get(PROGRESS_COLUMN, empty))
+
+    # 세 키를 각각 factorize한 뒤 하나의 정수 키로 합쳐 서로 다른 조합만 추림
+    phase_codes, phase_values = pd.factorize(phases)
+    proof_codes, proof_values = pd.factorize(proofs)
+    review_codes, review_values = pd.factorize(reviews)
+    combined = (
+        phase_codes.astype(np.int64) * len(proof_values) + proof_codes
+    ) * max(len(review_values), 1) + review_codes
+    unique_keys, inverse = np.unique(combined, return_inverse=True)
+
+    required = np.empty(len(unique_keys), dtype=object)
+    missing_docs = np.empty(len(unique_keys), dtype=object)
+    missing_fields = np.empty(len(unique_keys), dtype=object)
+    review_count = max(len(review_values), 1)
+    for idx, key in enumerate(unique_keys):
+        key = int(key)
+        review_code = key % review_count
+        rest = key // review_count
+        phase = phase_values[rest // len(proof_values)]
+        proof = proof_values[rest % len(proof_values)]
+        review = review_values[review_code] if len(review_values) else ""
+        required[idx], missing_docs[idx], missing_fields[idx] = _evaluate_combination(
+            compiled, phase, proof, review
+        )
+
+    return required[inverse], missing_docs[inverse], missing_fields[inverse]
+
+
+def evaluate_sheet(compiled, headers, rows, only_missing=False):
+    """
+    시트 전체를 평가해 행별 필요 서류와 누락 서류/기입항목을 반환합니다.
+    rows는 값 튜플(헤더 순서) 또는 {헤더: 값} dict 목록입니다.
+    """
+    wanted = [PHASE_COLUMN, PROOF_COLUMN, PROGRESS_COLUMN]
+    if rows and isinstance(rows[0], dict):
+        columns = {column: [row.get(column) for row in rows] for column in wanted}
+    else:
+        positions = {header: idx for idx, header in enumerate(headers)}
+        columns = {
+            column: [row[positions[column]] for row in rows]
+            for column in wanted if column in positions
+        }
+
+    required, missing_docs, missing_fields = evaluate_rows(compiled, columns, len(rows))
+
+    results = []
+    rows_with_findings = 0
+    for row_index in range(len(rows)):
+        has_findings = bool(missing_docs[row_index]) or bool(missing_fields[row_index])
+        if has_findings:
+            rows_with_findings += 1
+        if only_missing and not has_findings:
+            continue
+        results.append({
+            "row_index": row_index,
+            "required_documents": required[row_index],
+            "missing_documents": missing_docs[row_index],
+            "missing_fields": missing_fields[row_index],
+        })
+
+    return {
+        "total_rows": len(rows),
+        "rows_with_findings": rows_with_findings,
+        "results": results,
+    }
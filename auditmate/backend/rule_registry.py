@@ -0,0 +1,222 @@
+"""
+규칙 폴더 레지스트리
+
+Rule_file/ 아래 각 규칙 폴더의 metadata.json과 documentRule JSON을 한 번만 읽고 컴파일해 보관합니다.
+두 파일의 (mtime, size)를 함께 기억해 두었다가 달라진 경우에만 다시 읽으며,
+upload_rules/save_rule/delete_rule은 해당 폴더 항목을 직접 무효화합니다.
+"""
+import os
+import json
+import hashlib
+import datetime
+import threading
+
+from .constants import METADATA_FILENAME
+from .instrumentation import span, timed
+from .rule_engine import compile_rule
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _format_mtime(path):
+    return datetime.datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _document_rule_path(folder_path, metadata):
+    document_rule_filename = metadata.get("documentRule") if isinstance(metadata, dict) else None
+    if not document_rule_filename:
+        return None
+    return os.path.join(folder_path, document_rule_filename)
+
+
+def _read_metadata(folder_path):
+    metadata_path = os.path.join(folder_path, METADATA_FILENAME)
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_rule_from_folder(folder_path, folder_name):
+    """
+    개별 규칙 폴더에서 규칙 정보를 로딩하는 함수
+    uploadTime이 없으면 metadata.json(없으면 폴더)의 수정 시각을 사용합니다.
+    """
+    metadata_path = os.path.join(folder_path, METADATA_FILENAME)
+    default_upload_time = _format_mtime(metadata_path if os.path.exists(metadata_path) else folder_path)
+
+    # 기본값 설정
+    result = {
+        "folderName": folder_name,
+        "documentRule": {},
+        "categoryRule": {},
+        "uploadTime": default_upload_time,
+    }
+
+    if os.path.exists(metadata_path):
+        try:
+            metadata = _read_metadata(folder_path)
+
+            # 메타데이터에서 정보 추출
+            result["uploadTime"] = metadata.get("uploadTime", default_upload_time)
+            result["categoryRule"] = metadata.get("categoryRule", {})
+
+            # documentRule 파일 로딩
+            document_rule_path = _document_rule_path(folder_path, metadata)
+            if document_rule_path:
+                if os.path.exists(document_rule_path):
+                    with open(document_rule_path, "r", encoding="utf-8") as f:
+                        result["documentRule"] = json.load(f)
+                else:
+                    print(f"Warning: documentRule 파일이 존재하지 않음 - {document_rule_path}")
+
+        except Exception as e:
+            print(f"Error: 메타데이터 로딩 실패 ({folder_name}): {e}")
+
+    else:
+        print(f"Warning: metadata.json이 없음 - {folder_name}")
+
+    return result
+
+
+class RuleEntry:
+    """
+    로딩된 규칙 정보와, 다시 읽어야 하는지 판단하기 위한 파일 스탬프
+    """
+
+    def __init__(self, info, document_rule_path, stamp):
+        self.info = info
+        self.document_rule_path = document_rule_path
+        self.stamp = stamp
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            with span("rule_load"):
+                self._compiled = compile_rule(self.info)
+        return self._compiled
+
+    @property
+    def summary(self):
+        category_rule = self.info.get("categoryRule") or {}
+        return {
+            "folderName": self.info["folderName"],
+            "uploadTime": self.info.get("uploadTime"),
+            "categoryKeys": list(category_rule.keys()) if isinstance(category_rule, dict) else [],
+        }
+
+
+class RuleRegistry:
+    def __init__(self):
+        self.entries = {}
+        # 실제로 규칙 파일을 읽은 횟수
+        self.loads = 0
+        self.lock = threading.Lock()
+
+    def _is_current(self, entry, folder_path):
+        """
+        metadata.json과 documentRule 파일이 로딩 시점과 같은지 stat만으로 확인합니다.
+        (metadata가 그대로면 documentRule 경로도 그대로입니다)
+        """
+        metadata_stamp = _file_stamp(os.path.join(folder_path, METADATA_FILENAME))
+        if metadata_stamp != entry.stamp[0]:
+            return False
+        document_stamp = _file_stamp(entry.document_rule_path) if entry.document_rule_path else None
+        return document_stamp == entry.stamp[1]
+
+    @timed("rule_load")
+    def _load(self, folder_path, folder_name):
+        metadata_stamp = _file_stamp(os.path.join(folder_path, METADATA_FILENAME))
+        try:
+            document_rule_path = _document_rule_path(folder_path, _read_metadata(folder_path) or {})
+        except Exception:
+            document_rule_path = None
+        document_stamp = _file_stamp(document_rule_path) if document_rule_path else None
+
+        info = load_rule_from_folder(folder_path, folder_name)
+        return RuleEntry(info, document_rule_path, (metadata_stamp, document_stamp))
+
+    def get(self, rule_dir, folder_name):
+        """
+        규칙 폴더의 RuleEntry를 반환합니다. 파일이 바뀌었으면 다시 읽습니다.
+        """
+        folder_path = os.path.join(rule_dir, folder_name)
+        if not os.path.isdir(folder_path):
+            self.invalidate(folder_name)
+            return None
+
+        with self.lock:
+            entry = self.entries.get(folder_name)
+        if entry is not None and self._is_current(entry, folder_path):
+            return entry
+
+        entry = self._load(folder_path, folder_name)
+        with self.lock:
+            self.entries[folder_name] = entry
+            self.loads += 1
+        return entry
+
+    def list(self, rule_dir):
+        """
+        모든 규칙 폴더의 RuleEntry를 폴더명 순으로 반환합니다.
+        """
+        folder_names = sorted(
+            name for name in os.listdir(rule_dir) if os.path.isdir(os.path.join(rule_dir, name))
+        )
+        with self.lock:
+            for name in [name for name in self.entries if name not in folder_names]:
+                del self.entries[name]
+        entries = (self.get(rule_dir, name) for name in folder_names)
+        return [entry for entry in entries if entry is not None]
+
+    def invalidate(self, folder_name=None):
+        with self.lock:
+            if folder_name is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(folder_name, None)
+
+
+_registry = RuleRegistry()
+
+
+def get_rule(rule_dir, folder_name):
+    return _registry.get(rule_dir, folder_name)
+
+
+def list_rule_entries(rule_dir):
+    return _registry.list(rule_dir)
+
+
+def invalidate_rule(folder_name=None):
+    _registry.invalidate(folder_name)
+
+
+def rules_etag(entries, mode):
+    """
+    규칙 목록 응답의 ETag (폴더명과 파일 스탬프로 계산하므로 내용이 바뀌지 않으면 그대로입니다)
+    """
+    digest = hashlib.sha1(mode.encode("utf-8"))
+    for entry in entries:
+        digest.update(repr((entry.info["folderName"], entry.stamp)).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def rules_last_modified(rule_dir, entries):
+    """
+    규칙 목록 응답의 Last-Modified (규칙 폴더 자체와 규칙 파일 중 가장 최근 수정 시각, 초)
+    규칙을 지우거나 추가하면 규칙 폴더의 수정 시각이 바뀌므로 파일 시각만으로 놓치는 목록 변경도 반영됩니다.
+    """
+    mtimes = [stamp[0] for entry in entries for stamp in entry.stamp if stamp]
+    try:
+        mtimes.append(os.stat(rule_dir).st_mtime_ns)
+    except OSError:
+        pass
+    return max(mtimes) // 1_000_000_000 if mtimes else None
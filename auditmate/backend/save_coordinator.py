@@ -0,0 +1,236 @@
+"""
+파일별 저장 조정기 (single-flight)
+
+저널을 쓰지 않을 때(EDIT_JOURNAL_ENABLED = False) save-xlsx/patch-xlsx는 요청마다 워크북을 다시 씁니다.
+여러 탭이나 검토자가 같은 파일을 자동 저장하면 같은 파일의 쓰기가 겹치므로, 파일마다 쓰기는 한 번에 하나만 실행하고
+그동안 들어온 요청은 대기 중인 묶음(SaveBatch) 하나에 셀 단위로 합칩니다. (같은 셀은 나중 요청의 값이 이김)
+
+    - 대기 중인 묶음이 없던 요청이 쓰기를 맡고(leader), 이전 쓰기가 끝난 지 SAVE_MIN_INTERVAL초가 지난 뒤 묶음을 씀
+    - 그 사이 들어온 요청(follower)은 묶음에 합쳐진 뒤 쓰기가 끝나기를 기다렸다가 같은 결과를 받음 (직접 쓰지 않음)
+    - 쓰는 동안 새로 쌓인 묶음은 기다리던 요청 중 하나가 이어서 씀
+
+따라서 파일당 워크북 쓰기는 클라이언트 수와 관계없이 SAVE_MIN_INTERVAL초에 한 번 이하입니다.
+조정은 프로세스 안에서 이루어지며, 다른 워커 프로세스와의 쓰기 순서는 기존처럼 folder_lock이 보장합니다.
+저널을 쓸 때는 요청이 저널에만 추가되고 워크북 쓰기는 압축기가 모아서 하므로 이 모듈을 거치지 않습니다.
+"""
+import os
+import time
+import datetime
+import threading
+
+import openpyxl
+from django.conf import settings
+
+from .constants import WORKSHEET_NAME, PROGRESS_COLUMN
+from .instrumentation import span
+from .folder_lock import folder_lock, save_workbook_atomic
+from .metadata import get_file_fingerprint, load_metadata, save_metadata, apply_progress_stats
+from .xlsx_reader import progress_from_rows
+from .xlsx_writer import (
+    normalize_review_value, save_data_rows, apply_cell_changes, update_progress_stats, has_emptied_rows
+)
+from .exports import WorksheetNotFound
+from .workbook_cache import get_sheet_data, carry_sheet_data, carry_saved_rows, refresh_sheet_data
+from .change_feed import CurrentSheet, diff_rows, diff_changes, record_changes
+
+_condition = threading.Condition()
+# 파일별 쓰기 상태: {절대경로: _FileState}
+_states = {}
+_stats = {"requests": 0, "writes": 0, "failed": 0, "coalesced": 0}
+
+
+class SaveBatch:
+    """
+    한 번에 쓸 요청 묶음
+    rows: 마지막 전체 교체 데이터 (셀 변경만 있으면 None), cells: {(행 순번, 컬럼): 값} (요청 순서대로 덮어씀)
+    """
+
+    def __init__(self):
+        self.rows = None
+        self.cells = {}
+        self.last_modified = None
+        self.requests = 0
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def add_rows(self, data, changed, last_modified):
+        """
+        전체 교체 요청을 합칩니다. changed는 현재 데이터와 비교해 이 요청이 바꾼 셀(diff_rows 결과)입니다.
+        이 요청이 바꾸지 않은 셀에 대해서는 먼저 합쳐진 요청의 값이 유지됩니다.
+        """
+        self.rows = data
+        for row_index, cells in changed.items():
+            for column, (_, value) in cells.items():
+                self.cells.pop((row_index, column), None)
+                self.cells[(row_index, column)] = value
+        self.last_modified = last_modified
+
+    def add_changes(self, changes, last_modified):
+        """
+        셀 단위 변경 요청(validate_changes 결과)을 합칩니다.
+        """
+        for change in changes:
+            key = (change["row_index"], change["column"])
+            self.cells.pop(key, None)
+            self.cells[key] = change["value"]
+        self.last_modified = last_modified
+
+
+class _FileState:
+    def __init__(self):
+        self.running = False
+        self.pending = None
+        self.last_write = 0.0
+
+
+def _min_interval():
+    return getattr(settings, "SAVE_MIN_INTERVAL", 1.0)
+
+
+def submit_save(folder_path, file_path, merge):
+    """
+    merge(batch)로 요청을 대기 중인 묶음에 합치고, 그 묶음이 저장되면 결과 dict를 반환합니다.
+    결과의 coalesced는 다른 요청의 쓰기에 합쳐져 직접 쓰지 않았는지 여부입니다.
+    쓰기가 실패하면 묶음에 합쳐진 모든 요청에서 같은 예외가 발생합니다.
+    """
+    key = os.path.abspath(file_path)
+    with _condition:
+        state = _states.get(key)
+        if state is None:
+            state = _states[key] = _FileState()
+        if state.pending is None:
+            state.pending = SaveBatch()
+        batch = state.pending
+        merge(batch)
+        batch.requests += 1
+        _stats["requests"] += 1
+        # 쓰기가 진행 중이면 기다렸다가, 내 묶음이 써졌으면 결과를 받고 아니면 다음 쓰기를 맡음
+        while state.running and not batch.done:
+            _condition.wait()
+        leader = not batch.done
+        if leader:
+            state.running = True
+
+    if not leader:
+        return _batch_result(batch, coalesced=True)
+
+    try:
+        # 이전 쓰기 직후이면 간격을 채울 때까지 기다리며 그동안 들어온 요청도 같은 묶음에 합침
+        delay = state.last_write + _min_interval() - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        with _condition:
+            state.pending = None
+        try:
+            batch.result = write_batch(folder_path, file_path, batch)
+        except Exception as e:
+            batch.error = e
+    finally:
+        with _condition:
+            batch.done = True
+            state.running = False
+            state.last_write = time.monotonic()
+            # 실패한 쓰기는 writes에 넣지 않고 따로 셈
+            _stats["writes" if batch.error is None else "failed"] += 1
+            _stats["coalesced"] += batch.requests - 1
+            # 상태(마지막 쓰기 시각)는 남겨 두어 이어서 들어온 요청도 간격을 지키게 함
+            _condition.notify_all()
+    return _batch_result(batch, coalesced=False)
+
+
+def _batch_result(batch, coalesced):
+    if batch.error is not None:
+        raise batch.error
+    return {**batch.result, "coalesced": coalesced}
+
+
+def write_batch(folder_path, file_path, batch):
+    """
+    묶음을 워크북에 쓰고 변경 기록, 진행도, metadata를 갱신합니다. {progress, version}을 반환합니다.
+    전체 교체가 있으면 마지막 교체 데이터에 셀 변경을 덮어씌워 데이터 영역을 다시 쓰고,
+    셀 변경만 있으면 해당 셀만 수정합니다.
+    """
+    last_modified = batch.last_modified or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    refresh = False
+    with folder_lock(folder_path):
+        metadata = load_metadata(folder_path)
+        column_line = metadata.get("columnLine", 0)
+        sheet_data = get_sheet_data(file_path, column_line)
+        if sheet_data is None:
+            raise WorksheetNotFound(WORKSHEET_NAME)
+        current = CurrentSheet(sheet_data, [])
+
+        if batch.rows is not None:
+            data = [dict(row) for row in batch.rows]
+            for (row_index, column), value in batch.cells.items():
+                if row_index < len(data):
+                    data[row_index][column] = value
+            for row in data:
+                row[PROGRESS_COLUMN] = normalize_review_value(row.get(PROGRESS_COLUMN))
+            changed = diff_rows(current, data)
+
+            # 기존 파일 구조 유지하면서 데이터만 업데이트 ("집행내역" 시트가 없으면 False)
+            backend = save_data_rows(file_path, column_line, data)
+            if not backend:
+                raise WorksheetNotFound(WORKSHEET_NAME)
+            # 저장한 데이터로 진행도 계산 (워크북을 다시 읽지 않음)
+            stats = progress_from_rows(data)
+            fingerprint = get_file_fingerprint(file_path)
+            total_rows = len(data)
+            # 저장한 행을 그대로 캐시로 옮기고, 그럴 수 없을 때만 잠금을 푼 뒤 새 파일을 다시 파싱
+            refresh = not (
+                backend == "zip"
+                and carry_saved_rows(file_path, column_line, sheet_data.headers, data, fingerprint)
+            )
+        else:
+            changes = [
+                {"row_index": row_index, "column": column, "value": value}
+                for (row_index, column), value in batch.cells.items()
+            ]
+            changed = diff_changes(current, changes)
+
+            with span("workbook_load"):
+                workbook = openpyxl.load_workbook(file_path)
+            if WORKSHEET_NAME not in workbook.sheetnames:
+                raise WorksheetNotFound(WORKSHEET_NAME)
+            worksheet = workbook[WORKSHEET_NAME]
+            touched_rows = apply_cell_changes(worksheet, column_line, sheet_data.sheet_rows, changes)
+
+            stats = update_progress_stats(worksheet, column_line, metadata.get("progressStats"), changes)
+            # 모든 값이 비워진 행이 생기거나 헤더가 추가되면 캐시된 행 위치를 다시 만들어야 함
+            layout_changed = (
+                has_emptied_rows(worksheet, touched_rows, len(sheet_data.headers))
+                or any(change["column"] not in sheet_data.headers for change in changes)
+            )
+
+            old_fingerprint = get_file_fingerprint(file_path)
+            with span("workbook_save"):
+                save_workbook_atomic(workbook, file_path)
+
+            # 행 위치가 그대로면 캐시된 시트 데이터에 변경사항만 반영해 계속 사용
+            fingerprint = get_file_fingerprint(file_path)
+            if layout_changed:
+                refresh_sheet_data(file_path, column_line)
+            else:
+                carry_sheet_data(file_path, column_line, old_fingerprint, fingerprint, changes, stats)
+            total_rows = sheet_data.total_rows
+
+        version = record_changes(folder_path, metadata, changed, total_rows, last_modified)
+        apply_progress_stats(metadata, stats)
+        metadata["fingerprint"] = fingerprint
+        metadata["lastModified"] = last_modified
+        save_metadata(folder_path, metadata)
+
+    if refresh:
+        # 새 파일로 스냅숏을 다시 만들어 두어 이후 읽기가 xlsx를 파싱하지 않게 함
+        refresh_sheet_data(file_path, column_line)
+    return {"progress": metadata["progress"], "version": version}
+
+
+def save_stats():
+    """
+    조정기를 거친 저장 요청 수, 성공한 워크북 쓰기 수, 실패한 쓰기 수, 다른 요청의 쓰기에 합쳐진 요청 수
+    """
+    with _condition:
+        return dict(_stats)
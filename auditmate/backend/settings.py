@@ -39,9 +39,11 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'corsheaders',
+    'backend',
 ]
 
 MIDDLEWARE = [
+    'backend.instrumentation.RequestTimingMiddleware',  # 요청별 구간 시간 기록 / 지표 집계
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -125,3 +127,64 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# AuditMate edit journal (write-behind autosave)
+# save-xlsx/patch-xlsx append to a per-folder journal and a background compactor folds it into the xlsx.
+
+EDIT_JOURNAL_ENABLED = True
+JOURNAL_COMPACT_INTERVAL = 5  # seconds between compactor runs
+JOURNAL_IDLE_SECONDS = 2  # compact once a folder has had no edits for this long
+JOURNAL_MAX_AGE = 30  # compact at the latest this long after the first pending edit
+
+# Parsed sheet cache (headers, row values, progress) shared by the xlsx views, keyed by path + mtime/size.
+WORKBOOK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Columnar sidecar snapshot (.<xlsx>.snapshot) of the parsed sheet, loaded on cache misses instead of re-parsing the xlsx.
+WORKBOOK_SNAPSHOT_ENABLED = True
+
+# Batch upload: number of worker processes analyzing workbooks (None = one per CPU core).
+UPLOAD_WORKERS = None
+
+# Background job queue (Job_file/jobs.sqlite3) for async upload analysis, full saves and exports.
+JOB_WORKERS = None  # worker processes (None = one per CPU core)
+JOB_RESULT_MAX_AGE = 24 * 60 * 60  # seconds to keep finished jobs and their result files
+JOB_HEARTBEAT_INTERVAL = 10  # seconds between a server process's heartbeats (and cleanup runs across all processes)
+JOB_HEARTBEAT_TIMEOUT = 60  # jobs of a process silent for this long are marked interrupted or taken over
+
+# Request instrumentation (backend.instrumentation): per-request timing breakdowns and /api/metrics/.
+REQUEST_TIMING_LOG = True  # log one JSON line per request to the "backend.timing" logger
+REQUEST_TIMING_LOG_MIN_MS = 0  # only log requests at least this slow
+PROFILE_SAMPLE_RATE = 0  # fraction of requests run under cProfile (0 = off)
+PROFILE_SLOW_MS = 1000  # keep a profile only when the request took at least this long
+PROFILE_DIR = BASE_DIR / "Profile_file"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "backend.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# Per-folder locking (backend.folder_lock): writers lock a folder across worker processes,
+# readers never lock and always see the last fully written file.
+FOLDER_LOCK_DIR = BASE_DIR / "Lock_file"
+FOLDER_LOCK_TIMEOUT = 30  # seconds a save waits for another writer before returning 503
+
+# xlsx reader backend (backend.xlsx_reader): "fast" iterparses the 집행내역 sheet XML directly,
+# "openpyxl" uses openpyxl read-only mode. Check with: python manage.py check_reader_conformance
+XLSX_READER_BACKEND = "fast"
+
+# xlsx writer for full saves (backend.xlsx_writer.save_data_rows): "zip" regenerates only the
+# 집행내역 sheet XML and copies every other zip member as-is, "openpyxl" reloads and re-saves the workbook.
+XLSX_WRITER_BACKEND = "zip"
+
+# Per-folder version and row-level change feed (backend.change_feed, /api/changes/<folder>/?since=<version>).
+CHANGE_LOG_MAX_ENTRIES = 1000  # versions kept in changes.jsonl; older baseVersion/since values require a full reload
+
+# Single-flight save coordinator (backend.save_coordinator) for direct saves (EDIT_JOURNAL_ENABLED = False):
+# concurrent saves to one file are merged per cell and written at most once per this many seconds.
+SAVE_MIN_INTERVAL = 1.0
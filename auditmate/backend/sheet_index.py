@@ -0,0 +1,184 @@
+"""
+집행내역 행 조회(필터/정렬/구간)를 위한 열 단위 인덱스
+
+시트 데이터가 캐시에 올라올 때 SheetData에 붙어 함께 보관되며, 열 인덱스는 처음 조회될 때 만들어집니다.
+    숫자 열:  정렬된 값 배열과 그 순서의 행 번호 배열 (범위 조회는 searchsorted 두 번)
+    범주 열:  factorize한 코드 배열과 값 -> 행 번호 배열 dict (같음/포함 조회)
+    문자 열:  공백 제거한 문자열 Series (부분 문자열 검색, 빈값 검사)
+
+조건 형식 (filters 항목)
+    {"column": "세목명", "op": "eq", "value": "여비"}
+    {"column": "증빙구분", "op": "in", "values": ["카드", "계좌이체"]}
+    {"column": "금액", "op": "range", "min": 0, "max": 100000}      (min/max 중 하나만 있어도 됨)
+    {"column": "검토사항", "op": "empty"} / {"column": "검토사항", "op": "notEmpty"}
+    {"column": "적요", "op": "contains", "value": "출장"}
+정렬 형식 (sort 항목)
+    {"column": "금액", "order": "asc" | "desc"}
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _to_text(values):
+    """
+    값을 공백 제거된 문자열로 바꿉니다. (빈값은 "")
+    """
+    series = pd.Series(values, dtype=object)
+    return series.where(series.notna(), "").astype(str).str.strip()
+
+
+def _to_number(values):
+    """
+    값을 float으로 바꿉니다. 숫자로 읽을 수 없는 값은 NaN이며, "1,000" 같은 천 단위 구분 문자열도 읽습니다.
+    """
+    series = pd.Series(values, dtype=object)
+    text = series.where(~series.map(lambda v: isinstance(v, str)), series.astype(str).str.replace(",", "", regex=False))
+    return pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+
+
+class NumericIndex:
+    def __init__(self, values):
+        self.values = _to_number(values)
+        # NaN은 argsort 결과의 끝에 모임
+        self.order = np.argsort(self.values, kind="stable")
+        self.sorted_values = self.values[self.order]
+        self.valid_count = int(np.count_nonzero(~np.isnan(self.values)))
+
+    def range_rows(self, minimum=None, maximum=None):
+        sorted_valid = self.sorted_values[:self.valid_count]
+        start = 0 if minimum is None else np.searchsorted(sorted_valid, minimum, side="left")
+        end = self.valid_count if maximum is None else np.searchsorted(sorted_valid, maximum, side="right")
+        return self.order[start:end]
+
+
+class CategoryIndex:
+    def __init__(self, text):
+        self.codes, self.uniques = pd.factorize(text, sort=True)
+        order = np.argsort(self.codes, kind="stable")
+        boundaries = np.searchsorted(self.codes[order], np.arange(len(self.uniques) + 1))
+        self.rows_by_value = {
+            value: order[boundaries[code]:boundaries[code + 1]]
+            for code, value in enumerate(self.uniques)
+        }
+
+    def rows_for(self, values):
+        arrays = [self.rows_by_value[str(value).strip()] for value in values if str(value).strip() in self.rows_by_value]
+        if not arrays:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(arrays)
+
+
+class SheetIndex:
+    """
+    한 시트(헤더 + 값 튜플 행)에 대한 열별 인덱스 모음
+    """
+
+    def __init__(self, headers, rows):
+        self.headers = list(headers)
+        self.rows = rows
+        self.length = len(rows)
+        self.positions = {header: idx for idx, header in enumerate(self.headers)}
+        self._text = {}
+        self._numeric = {}
+        self._category = {}
+        self._lock = threading.Lock()
+
+    def _column_values(self, column):
+        if column not in self.positions:
+            raise QueryError(f"알 수 없는 컬럼입니다: {column}")
+        col_idx = self.positions[column]
+        return [row[col_idx] for row in self.rows]
+
+    def _cached(self, cache, column, build):
+        with self._lock:
+            index = cache.get(column)
+        if index is None:
+            index = build(column)
+            with self._lock:
+                cache[column] = index
+        return index
+
+    def text(self, column):
+        return self._cached(self._text, column, lambda c: _to_text(self._column_values(c)))
+
+    def numeric(self, column):
+        return self._cached(self._numeric, column, lambda c: NumericIndex(self._column_values(c)))
+
+    def category(self, column):
+        return self._cached(self._category, column, lambda c: CategoryIndex(self.text(c)))
+
+    def _mask_from_rows(self, row_ids):
+        mask = np.zeros(self.length, dtype=bool)
+        mask[row_ids] = True
+        return mask
+
+    def filter_mask(self, condition):
+        column = condition.get("column")
+        op = condition.get("op")
+        if op == "eq":
+            return self._mask_from_rows(self.category(column).rows_for([condition.get("value")]))
+        if op == "in":
+            values = condition.get("values")
+            if not isinstance(values, list):
+                raise QueryError("in 조건에는 values 목록이 필요합니다")
+            return self._mask_from_rows(self.category(column).rows_for(values))
+        if op == "range":
+            try:
+                minimum = None if condition.get("min") in (None, "") else float(condition["min"])
+                maximum = None if condition.get("max") in (None, "") else float(condition["max"])
+            except (TypeError, ValueError):
+                raise QueryError("range 조건의 min/max는 숫자여야 합니다")
+            return self._mask_from_rows(self.numeric(column).range_rows(minimum, maximum))
+        if op == "empty":
+            return (self.text(column) == "").to_numpy()
+        if op == "notEmpty":
+            return (self.text(column) != "").to_numpy()
+        if op == "contains":
+            needle = str(condition.get("value") or "").strip()
+            return self.text(column).str.contains(needle, regex=False).to_numpy()
+        raise QueryError(f"지원하지 않는 조건입니다: {op}")
+
+    def _sort_key(self, column, descending):
+        """
+        lexsort용 정렬 키 (숫자 열이면 숫자로, 아니면 문자열 순서 코드로 정렬하며 빈값은 항상 뒤로)
+        """
+        numeric = self.numeric(column)
+        if numeric.valid_count and numeric.valid_count >= np.count_nonzero(self.text(column) != ""):
+            key = numeric.values
+            missing = np.isnan(key)
+            key = np.where(missing, 0, -key if descending else key)
+        else:
+            category = self.category(column)
+            codes = category.codes.astype(np.int64)
+            missing = (self.text(column) == "").to_numpy()
+            key = -codes if descending else codes
+        return missing, key
+
+    def query(self, filters=None, sort=None):
+        """
+        조건에 맞는 행 번호(0-based 데이터 행 순번) 배열을 정렬 순서대로 반환합니다.
+        """
+        mask = np.ones(self.length, dtype=bool)
+        for condition in filters or []:
+            if not isinstance(condition, dict):
+                raise QueryError(f"잘못된 조건 형식입니다: {condition}")
+            mask &= self.filter_mask(condition)
+        row_ids = np.flatnonzero(mask)
+
+        if sort:
+            keys = []
+            # lexsort는 마지막 키가 1순위이므로 뒤에서부터 쌓음
+            for spec in reversed(sort):
+                if not isinstance(spec, dict):
+                    raise QueryError(f"잘못된 정렬 형식입니다: {spec}")
+                missing, key = self._sort_key(spec.get("column"), spec.get("order") == "desc")
+                keys.append(key[row_ids])
+                keys.append(missing[row_ids])
+            row_ids = row_ids[np.lexsort(keys)]
+        return row_ids
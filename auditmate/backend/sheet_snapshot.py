@@ -0,0 +1,267 @@
+"""
+집행내역 데이터 영역의 열 단위 스냅숏 파일 (업로드 폴더의 .<xlsx 파일명>.snapshot)
+
+xlsx XML 파싱은 백엔드에서 가장 비싼 작업이므로, 한 번 파싱한 시트 데이터를 열별 배열로 저장해 두고
+캐시 미스 때 xlsx 대신 이 파일을 읽습니다. 스냅숏에는 만들 때의 xlsx 지문(mtime, size)과 columnLine이 기록되어 있어
+xlsx가 바뀌었으면 쓰지 않고 xlsx를 다시 파싱해 새로 만듭니다. 다운로드(내보내기)는 계속 xlsx를 원본으로 사용합니다.
+
+파일 구조
+    MAGIC(8바이트) + manifest 길이(uint64) + manifest(JSON)
+    + 64바이트 경계에 맞춘 배열 버퍼들 (manifest의 arrays에 데이터 영역 기준 offset, dtype, 길이 기록)
+파일 전체를 np.memmap으로 열고 각 배열은 복사 없이 view로 읽습니다.
+
+열 형식 (모든 형식에 빈값 마스크가 함께 저장됨)
+    int / float / bool:  int64 / float64 / bool 배열
+    datetime:            datetime64[us] 배열
+    text:                값을 "\\x00"으로 이은 UTF-8 바이트 (xlsx 문자열에는 \\x00이 들어갈 수 없음)
+    mixed:               형식이 섞인 열은 값마다 형식 태그를 붙인 JSON 바이트
+"""
+import os
+import json
+import uuid
+import struct
+import datetime
+from array import array
+
+import numpy as np
+from django.conf import settings
+
+from .constants import WORKSHEET_NAME, SNAPSHOT_SUFFIX
+from .instrumentation import timed
+from .metadata import get_file_fingerprint
+
+MAGIC = b"AMSNAP01"
+SNAPSHOT_VERSION = 3
+ALIGNMENT = 64
+TEXT_SEPARATOR = "\x00"
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def snapshot_enabled():
+    return getattr(settings, "WORKBOOK_SNAPSHOT_ENABLED", True)
+
+
+def snapshot_path(file_path):
+    folder_path, file_name = os.path.split(file_path)
+    return os.path.join(folder_path, f".{file_name}{SNAPSHOT_SUFFIX}")
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _column_kind(values):
+    """
+    열 값의 형식 (None은 무시하며 값이 모두 None이면 text)
+    """
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        value_type = type(value)
+        if value_type is bool:
+            current = "bool"
+        elif value_type is int:
+            current = "int" if INT64_MIN <= value <= INT64_MAX else "mixed"
+        elif value_type is float:
+            current = "float"
+        elif value_type is str:
+            current = "text"
+        elif value_type is datetime.datetime and value.tzinfo is None:
+            current = "datetime"
+        else:
+            current = "mixed"
+        if kind is None:
+            kind = current
+        elif kind != current:
+            return "mixed"
+        if kind == "mixed":
+            return kind
+    return kind or "text"
+
+
+def _encode_mixed(value):
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"time": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"timedelta": value.total_seconds()}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def _decode_mixed(value):
+    if not isinstance(value, dict):
+        return value
+    if "datetime" in value:
+        return datetime.datetime.fromisoformat(value["datetime"])
+    if "date" in value:
+        return datetime.date.fromisoformat(value["date"])
+    if "time" in value:
+        return datetime.time.fromisoformat(value["time"])
+    return datetime.timedelta(seconds=value["timedelta"])
+
+
+def _encode_column(values):
+    """
+    열 값 목록을 (형식, 값 배열, 빈값 마스크)로 바꿉니다.
+    """
+    kind = _column_kind(values)
+    mask = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+
+    if kind == "text":
+        joined = TEXT_SEPARATOR.join("" if value is None else value for value in values)
+        # 구분 문자가 값 안에 들어 있으면 나눌 수 없으므로 mixed로 저장
+        if not values or joined.count(TEXT_SEPARATOR) == len(values) - 1:
+            return kind, np.frombuffer(joined.encode("utf-8"), dtype=np.uint8), mask
+        kind = "mixed"
+
+    if kind == "int":
+        data = np.array([0 if value is None else value for value in values], dtype=np.int64)
+    elif kind == "float":
+        data = np.array([0.0 if value is None else value for value in values], dtype=np.float64)
+    elif kind == "bool":
+        data = np.array([bool(value) for value in values], dtype=bool)
+    elif kind == "datetime":
+        data = np.array(values, dtype="datetime64[us]")
+    else:
+        encoded = json.dumps([_encode_mixed(value) for value in values], ensure_ascii=False)
+        data = np.frombuffer(encoded.encode("utf-8"), dtype=np.uint8)
+    return kind, data, mask
+
+
+def _decode_column(kind, data, mask, length):
+    """
+    열 배열을 파이썬 값 목록으로 되돌립니다.
+    """
+    if kind == "text":
+        values = bytes(data).decode("utf-8").split(TEXT_SEPARATOR) if length else []
+    elif kind == "mixed":
+        values = [_decode_mixed(value) for value in json.loads(bytes(data).decode("utf-8"))]
+    else:
+        values = data.tolist()
+    for row_id in np.flatnonzero(mask).tolist():
+        values[row_id] = None
+    return values
+
+
+@timed("file_write")
+def write_snapshot(file_path, sheet_data, fingerprint, sheet_name):
+    """
+    시트 데이터를 스냅숏 파일로 저장합니다. (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 항상 완성된 파일을 봅니다)
+    fingerprint는 sheet_data를 파싱한 xlsx의 지문이며, 그 사이 xlsx가 바뀌었으면 저장하지 않습니다.
+    """
+    if not snapshot_enabled() or not fingerprint or get_file_fingerprint(file_path) != fingerprint:
+        return False
+
+    length = sheet_data.total_rows
+    buffers = []
+    columns = []
+
+    def add_buffer(array_data):
+        buffers.append(np.ascontiguousarray(array_data))
+        return len(buffers) - 1
+
+    width = len(sheet_data.headers)
+    column_values = list(zip(*sheet_data.rows)) if length and width else [() for _ in range(width)]
+    for header, values in zip(sheet_data.headers, column_values):
+        kind, data, mask = _encode_column(list(values))
+        columns.append({"name": header, "kind": kind, "data": add_buffer(data), "mask": add_buffer(mask)})
+    sheet_rows = add_buffer(np.array(sheet_data.sheet_rows, dtype=np.uint64))
+
+    arrays = []
+    offset = 0
+    for buffer in buffers:
+        offset = _align(offset)
+        arrays.append({"offset": offset, "dtype": buffer.dtype.str, "length": len(buffer)})
+        offset += buffer.nbytes
+
+    manifest = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fingerprint,
+        "columnLine": sheet_data.column_line,
+        "sheetName": sheet_name,
+        "headers": sheet_data.headers,
+        "stats": sheet_data.stats,
+        "rowCount": length,
+        "columns": columns,
+        "sheetRows": sheet_rows,
+        "arrays": arrays,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(manifest))
+
+    path = snapshot_path(file_path)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(manifest)))
+            f.write(manifest)
+            for buffer, info in zip(buffers, arrays):
+                f.seek(data_start + info["offset"])
+                f.write(buffer.tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+@timed("snapshot_load")
+def load_snapshot(file_path, fingerprint, column_line, fallback_first):
+    """
+    xlsx 지문과 columnLine이 일치하는 스냅숏이 있으면 SheetData를 만들어 반환하고, 없거나 맞지 않으면 None을 반환합니다.
+    (첫 번째 시트로 대신 만든 스냅숏은 fallback_first=True일 때만 사용)
+    """
+    # 순환 import 방지 (workbook_cache가 이 모듈을 사용)
+    from .workbook_cache import SheetData
+
+    path = snapshot_path(file_path)
+    if not snapshot_enabled() or not fingerprint or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            manifest_length = struct.unpack("<Q", f.read(8))[0]
+            manifest = json.loads(f.read(manifest_length).decode("utf-8"))
+
+        if (
+            manifest.get("version") != SNAPSHOT_VERSION
+            or manifest.get("fingerprint") != fingerprint
+            or manifest.get("columnLine") != column_line
+            or (manifest.get("sheetName") != WORKSHEET_NAME and not fallback_first)
+        ):
+            return None
+
+        data_start = _align(len(MAGIC) + 8 + manifest_length)
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+
+        def view(array_id):
+            info = manifest["arrays"][array_id]
+            dtype = np.dtype(info["dtype"])
+            start = data_start + info["offset"]
+            values = mapped[start:start + info["length"] * dtype.itemsize].view(dtype)
+            if len(values) != info["length"]:
+                raise ValueError("스냅숏 파일이 잘렸습니다")
+            return values
+
+        length = manifest["rowCount"]
+        column_values = [
+            _decode_column(column["kind"], view(column["data"]), view(column["mask"]), length)
+            for column in manifest["columns"]
+        ]
+        sheet_rows = array("L", view(manifest["sheetRows"]).tolist())
+        # 값은 모두 파이썬 객체로 복사했으므로 매핑을 바로 해제 (Windows에서는 매핑 중인 파일을 교체할 수 없음)
+        del view, mapped
+
+        rows = list(zip(*column_values)) if column_values else [() for _ in range(length)]
+        return SheetData(manifest["headers"], rows, sheet_rows, manifest["stats"], column_line)
+    except Exception as e:
+        print(f"스냅숏 읽기 오류 ({path}): {e}")
+        return None
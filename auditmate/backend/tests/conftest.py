@@ -0,0 +1,81 @@
+"""
+백엔드 테스트 공통 설정
+
+Django 설정을 읽고, BASE_DIR/잠금 폴더/카탈로그 DB를 테스트용 임시 폴더로 바꿉니다.
+auditmate 폴더에서 python -m pytest -q 로 실행합니다.
+"""
+import os
+import json
+
+import django
+import openpyxl
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+HEADERS = ["번호", "사용일자", "세목명", "금액", "적요", "검토사항", "메모"]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_base_dir(tmp_path_factory):
+    base_dir = tmp_path_factory.mktemp("base")
+    settings.BASE_DIR = base_dir
+    settings.FOLDER_LOCK_DIR = base_dir / "Lock_file"
+    settings.DATABASES["default"]["NAME"] = str(base_dir / "db.sqlite3")
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+    return base_dir
+
+
+def make_ledger(path, rows, title_rows=1, other_sheet=True):
+    """
+    title_rows개의 제목 행 아래에 헤더와 rows(값 리스트)가 있는 집행내역 xlsx를 만들고 columnLine을 반환합니다.
+    """
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "집행내역"
+    for idx in range(title_rows):
+        worksheet.append([f"제목 {idx}"])
+    worksheet.append(HEADERS)
+    for row in rows:
+        worksheet.append(row)
+    if other_sheet:
+        workbook.create_sheet("기타")["A1"] = "keep me"
+    workbook.save(path)
+    return title_rows
+
+
+def ledger_rows(count):
+    return [
+        [idx + 1, f"2024-01-{idx % 28 + 1:02d}", "여비" if idx % 2 else "회의비", 1000 * (idx + 1), f"적요 {idx}",
+         "영수증" if idx < count // 2 else None, None]
+        for idx in range(count)
+    ]
+
+
+def read_data_rows(path, column_line):
+    """
+    저장된 xlsx의 집행내역 데이터 행 값 목록 (openpyxl로 다시 읽음)
+    """
+    workbook = openpyxl.load_workbook(path)
+    worksheet = workbook["집행내역"]
+    return [
+        list(row) for row in worksheet.iter_rows(min_row=column_line + 2, values_only=True)
+        if any(value is not None for value in row)
+    ]
+
+
+@pytest.fixture
+def ledger_folder(tmp_path):
+    """
+    ledger.xlsx(데이터 6행)와 metadata.json이 있는 업로드 폴더
+    """
+    folder_path = tmp_path / "folder"
+    folder_path.mkdir()
+    column_line = make_ledger(folder_path / "ledger.xlsx", ledger_rows(6))
+    metadata = {"xlsxFile": "ledger.xlsx", "columnLine": column_line, "version": 0}
+    (folder_path / "metadata.json").write_text(json.dumps(metadata, ensure_ascii=False), encoding="utf-8")
+    return str(folder_path)
@@ -0,0 +1,80 @@
+import pytest
+
+from backend.catalog import sync_folder, query_folders, filter_list_items, normalize_last_modified
+from backend.models import UploadFolder
+
+
+@pytest.fixture
+def folders():
+    values = {
+        "f1": "2024-03-01 00:00:00",
+        "f2": "2024-03-01 23:59:59",
+        "f3": "20240302_000000",  # xlsx 없이 업로드한 폴더의 형식
+        "f4": "2024-03-02 12:00:00",
+    }
+    for folder_name, last_modified in values.items():
+        sync_folder(folder_name, {"xlsxFile": None, "lastModified": last_modified})
+    yield
+    UploadFolder.objects.filter(folder_name__in=values).delete()
+
+
+def _names(**filters):
+    return [folder.folder_name for folder in query_folders(sort="lastModified", **filters)]
+
+
+def test_sync_normalizes_last_modified(folders):
+    assert UploadFolder.objects.get(folder_name="f3").last_modified == "2024-03-02 00:00:00"
+    assert normalize_last_modified("2024-03-02T08:30:00") == "2024-03-02 08:30:00"
+    assert normalize_last_modified(None) == ""
+
+
+def test_date_only_upper_bound_includes_whole_day(folders):
+    assert _names(modified_to="2024-03-01") == ["f1", "f2"]
+    assert _names(modified_from="2024-03-02", modified_to="2024-03-02") == ["f3", "f4"]
+    assert _names(modified_to="2024-03-02 00:00:00") == ["f1", "f2", "f3"]
+
+
+def test_invalid_bound_is_rejected(folders):
+    with pytest.raises(ValueError):
+        list(query_folders(modified_to="2024-3-1x"))
+
+
+@pytest.fixture
+def ruled_folders():
+    values = {
+        "g1": {"ruleName": "A", "progress": 30, "lastModified": "2024-03-01 10:00:00"},
+        "g2": {"ruleName": None, "progress": 80, "lastModified": "2024-03-02 10:00:00"},
+        "g3": {"ruleName": "B", "progress": 30, "lastModified": "20240303_000000"},
+        "g4": {"ruleName": "A", "progress": 100, "lastModified": "2024-03-01 09:00:00"},
+    }
+    for folder_name, metadata in values.items():
+        sync_folder(folder_name, {"xlsxFile": None, **metadata})
+    yield values
+    UploadFolder.objects.filter(folder_name__in=values).delete()
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"rule_name": "A"},
+    {"progress_min": 30, "progress_max": 80, "sort": "-progress"},
+    {"modified_from": "2024-03-01 09:30:00", "modified_to": "2024-03-02", "sort": "lastModified"},
+    {"sort": "ruleName"},
+    {"sort": "-ruleName"},
+])
+def test_disk_listing_filters_match_catalog(ruled_folders, filters):
+    # migrate 전 디스크 목록(list_files_from_disk 형식)에도 카탈로그와 같은 조건/정렬 적용
+    items = [
+        {"folderName": name, "xlsxFile": None, "progress": metadata["progress"], "ruleName": metadata["ruleName"],
+         "lastModified": normalize_last_modified(metadata["lastModified"])}
+        for name, metadata in reversed(list(ruled_folders.items()))
+    ]
+    expected = [
+        folder.folder_name for folder in query_folders(**filters) if folder.folder_name in ruled_folders
+    ]
+
+    assert [item["folderName"] for item in filter_list_items(items, **filters)] == expected
+
+
+def test_disk_listing_rejects_unknown_sort():
+    with pytest.raises(ValueError):
+        filter_list_items([], sort="size")
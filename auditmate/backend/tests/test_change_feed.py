@@ -0,0 +1,121 @@
+import json
+
+from backend.change_feed import (
+    CurrentSheet, diff_rows, summarize, reconcile_rows, patch_conflicts, record_changes, changes_since, change_feed
+)
+
+
+def _current(rows):
+    return CurrentSheet(None, [{"op": "replace", "data": rows}])
+
+
+def _history(*changes):
+    """
+    버전마다 {행 순번: {컬럼: [이전 값, 새 값]}}를 받아 summarize 결과를 만듭니다.
+    """
+    return summarize([
+        {"version": version, "rows": {str(row_index): cells for row_index, cells in changed.items()}}
+        for version, changed in enumerate(changes, 1)
+    ])
+
+
+BASE = [
+    {"번호": 1, "메모": None, "검토사항": "영수증"},
+    {"번호": 2, "메모": "원래", "검토사항": None},
+    {"번호": 3, "메모": None, "검토사항": None},
+]
+
+
+def test_untouched_rows_from_stale_client_keep_server_values():
+    # 다른 요청이 2번째 행 메모를 바꾼 뒤, 이전 버전을 가진 클라이언트가 3번째 행만 고쳐 전체 저장
+    server = [dict(row) for row in BASE]
+    server[1]["메모"] = "서버에서 수정"
+    history = _history({1: {"메모": ["원래", "서버에서 수정"]}})
+    client = [dict(row) for row in BASE]
+    client[2]["메모"] = "클라이언트 수정"
+
+    merged, conflicts = reconcile_rows(history, _current(server), client)
+
+    assert conflicts == []
+    assert merged[1]["메모"] == "서버에서 수정"
+    assert merged[2]["메모"] == "클라이언트 수정"
+    assert merged[0] is client[0]
+
+
+def test_client_already_has_server_values():
+    server = [dict(row) for row in BASE]
+    server[0]["메모"] = "같은 값"
+    history = _history({0: {"메모": [None, "같은 값"]}})
+    client = [dict(row) for row in server]
+
+    merged, conflicts = reconcile_rows(history, _current(server), client)
+
+    assert conflicts == []
+    assert merged == client
+
+
+def test_both_sides_changed_same_row_is_conflict():
+    server = [dict(row) for row in BASE]
+    server[1]["메모"] = "서버에서 수정"
+    history = _history({1: {"메모": ["원래", "서버에서 수정"]}})
+    client = [dict(row) for row in BASE]
+    client[1]["검토사항"] = "계약서"  # 다른 컬럼이라도 같은 행이면 충돌
+
+    merged, conflicts = reconcile_rows(history, _current(server), client)
+
+    assert conflicts == [1]
+
+
+def test_rows_added_or_removed_since_base_version_are_conflicts():
+    server = [dict(row) for row in BASE] + [{"번호": 4, "메모": "추가", "검토사항": None}]
+    history = _history({3: {"번호": [None, 4], "메모": [None, "추가"]}})
+    client = [dict(row) for row in BASE][:2]  # 기준 버전 데이터에서 마지막 행을 지워 보냄
+
+    _, conflicts = reconcile_rows(history, _current(server), client)
+
+    assert conflicts == [3]
+
+
+def test_history_uses_first_before_value_across_versions():
+    server = [dict(row) for row in BASE]
+    server[1]["메모"] = "두 번째"
+    history = _history({1: {"메모": ["원래", "첫 번째"]}}, {1: {"메모": ["첫 번째", "두 번째"]}})
+    client = [dict(row) for row in BASE]
+
+    merged, conflicts = reconcile_rows(history, _current(server), client)
+
+    assert conflicts == []
+    assert merged[1]["메모"] == "두 번째"
+
+
+def test_patch_conflicts_only_for_changed_rows_with_different_values():
+    server = [dict(row) for row in BASE]
+    server[1]["메모"] = "서버에서 수정"
+    history = _history({1: {"메모": ["원래", "서버에서 수정"]}})
+    changes = [
+        {"row_index": 1, "column": "메모", "value": "서버에서 수정"},
+        {"row_index": 2, "column": "메모", "value": "다른 행"},
+    ]
+    assert patch_conflicts(history, _current(server), changes) == []
+    changes[0]["value"] = "클라이언트 수정"
+    assert patch_conflicts(history, _current(server), changes) == [1]
+
+
+def test_record_and_feed_round_trip(tmp_path):
+    folder_path = str(tmp_path)
+    metadata = {"version": 0}
+    server = [dict(row) for row in BASE]
+    updated = [dict(row) for row in BASE]
+    updated[0]["메모"] = "메모 추가"
+
+    changed = diff_rows(_current(server), updated)
+    assert changed == {0: {"메모": [None, "메모 추가"]}}
+    assert record_changes(folder_path, metadata, changed, len(updated)) == 1
+    # 바뀐 값이 없으면 버전을 올리지 않음
+    assert record_changes(folder_path, metadata, {}, len(updated)) == 1
+
+    assert changes_since(folder_path, metadata, 1) == []
+    assert changes_since(folder_path, metadata, 2) is None
+    feed = change_feed(folder_path, metadata, 0)
+    assert json.loads(json.dumps(feed))["rows"] == [{"row_index": 0, "version": 1, "values": {"메모": "메모 추가"}}]
+    assert feed["totalRows"] == 3 and feed["reset"] is False
@@ -0,0 +1,79 @@
+import os
+import time
+import shutil
+
+from django.test import RequestFactory
+from django.http import HttpResponse
+from django.utils.http import http_date
+
+from backend.conditional import not_modified, set_validators, folder_list_validators
+from backend.rule_registry import rules_last_modified
+
+ETAG = '"abc"'
+
+
+def _get(**headers):
+    return RequestFactory().get("/api/read-xlsx/", **headers)
+
+
+def test_if_modified_since_is_honored_for_a_past_second():
+    last_modified = int(time.time()) - 10
+    response = not_modified(_get(HTTP_IF_MODIFIED_SINCE=http_date(last_modified)), ETAG, last_modified)
+
+    assert response is not None and response.status_code == 304
+    assert response["Last-Modified"] == http_date(last_modified)
+
+
+def test_if_modified_since_is_ignored_for_the_current_second():
+    # 같은 초 안에 파일이 다시 바뀌어도 Last-Modified가 같으므로 ETag로만 검증
+    last_modified = int(time.time()) + 1
+    request = _get(HTTP_IF_MODIFIED_SINCE=http_date(last_modified))
+
+    assert not_modified(request, ETAG, last_modified) is None
+    response = not_modified(_get(HTTP_IF_NONE_MATCH=ETAG), ETAG, last_modified)
+    assert response.status_code == 304
+    assert "Last-Modified" not in response
+
+
+def test_set_validators_skips_last_modified_for_the_current_second():
+    response = set_validators(HttpResponse(), ETAG, int(time.time()) + 1)
+
+    assert response["ETag"] == ETAG
+    assert "Last-Modified" not in response
+
+
+def _make_folder(upload_dir, name, mtime):
+    folder = upload_dir / name
+    folder.mkdir()
+    for file_name in ("metadata.json", "ledger.xlsx"):
+        (folder / file_name).write_text("x")
+        os.utime(folder / file_name, (mtime, mtime))
+
+
+def test_folder_list_last_modified_changes_when_folders_are_added_or_removed(tmp_path):
+    upload_dir = tmp_path / "Upload_file"
+    upload_dir.mkdir()
+    now = int(time.time())
+    _make_folder(upload_dir, "a", now - 1000)
+    _make_folder(upload_dir, "b", now - 500)
+    os.utime(upload_dir, (now - 2000, now - 2000))
+    _, last_modified = folder_list_validators(str(upload_dir), ())
+    assert last_modified == now - 500
+
+    # 가장 최근 폴더를 지우거나 예전 수정 시각의 파일로 폴더를 추가해도 Last-Modified가 뒤로 가지 않음
+    shutil.rmtree(upload_dir / "b")
+    _, after_delete = folder_list_validators(str(upload_dir), ())
+    assert after_delete > last_modified
+    os.utime(upload_dir, (now - 2000, now - 2000))
+    _make_folder(upload_dir, "c", now - 3000)
+    _, after_add = folder_list_validators(str(upload_dir), ())
+    assert after_add > last_modified
+
+
+def test_rules_last_modified_includes_the_rule_folder(tmp_path):
+    rule_dir = tmp_path / "Rule_file"
+    rule_dir.mkdir()
+    now = int(time.time())
+    os.utime(rule_dir, (now - 100, now - 100))
+
+    assert rules_last_modified(str(rule_dir), []) == now - 100
@@ -0,0 +1,96 @@
+import os
+import json
+
+from backend.constants import JOURNAL_FILENAME, COMPACTING_SUFFIX
+from backend.edit_journal import append_entry, read_entries, overlay_rows, compact_journal, has_pending_entries
+from backend.metadata import load_metadata, get_file_fingerprint
+
+from .conftest import HEADERS, read_data_rows
+
+
+def _row(values):
+    return dict(zip(HEADERS, values))
+
+
+def test_overlay_applies_last_replace_then_later_patches(ledger_folder):
+    append_entry(ledger_folder, {"op": "patch", "changes": [{"row_index": 0, "column": "메모", "value": "먼저"}]})
+    append_entry(ledger_folder, {"op": "replace", "data": [_row([1, None, "여비", 10, "a", None, None])]})
+    append_entry(ledger_folder, {"op": "patch", "changes": [{"row_index": 0, "column": "메모", "value": "나중"}]})
+
+    entries = read_entries(ledger_folder)
+    assert [entry["op"] for entry in entries] == ["patch", "replace", "patch"]
+    rows = overlay_rows([_row([9] * len(HEADERS))], entries)
+    assert len(rows) == 1
+    assert rows[0]["금액"] == 10
+    assert rows[0]["메모"] == "나중"
+
+
+def test_compact_folds_entries_into_xlsx(ledger_folder):
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    data = [_row(row) for row in read_data_rows(file_path, 1)][:4]
+    data[1]["검토사항"] = "영수증"
+    append_entry(ledger_folder, {"op": "replace", "data": data, "lastModified": "2024-02-01 10:00:00"})
+    append_entry(ledger_folder, {
+        "op": "patch", "changes": [{"row_index": 3, "column": "메모", "value": "확인"}],
+        "lastModified": "2024-02-01 10:00:05",
+    })
+
+    assert compact_journal(ledger_folder)
+
+    rows = read_data_rows(file_path, 1)
+    assert len(rows) == 4
+    assert rows[3][HEADERS.index("메모")] == "확인"
+    assert not has_pending_entries(ledger_folder)
+    metadata = load_metadata(ledger_folder)
+    assert metadata["fingerprint"] == get_file_fingerprint(file_path)
+    assert metadata["lastModified"] == "2024-02-01 10:00:05"
+    assert metadata["progressStats"]["totalRows"] == 4
+    # 다시 압축해도 할 일이 없음
+    assert not compact_journal(ledger_folder)
+
+
+def test_compact_replays_compacting_file_left_by_crash(ledger_folder):
+    """
+    이전 압축이 xlsx 반영 전에 중단되어 journal.jsonl.compacting이 남은 경우
+    남은 항목을 먼저, 그 뒤 새 저널 항목을 순서대로 반영합니다.
+    """
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    journal_path = os.path.join(ledger_folder, JOURNAL_FILENAME)
+    leftover = [
+        {"op": "patch", "changes": [{"row_index": 0, "column": "메모", "value": "남은 항목"}]},
+        {"op": "patch", "changes": [{"row_index": 1, "column": "메모", "value": "덮어쓸 값"}]},
+    ]
+    with open(journal_path + COMPACTING_SUFFIX, "w", encoding="utf-8") as f:
+        for entry in leftover:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # 쓰는 도중 잘린 마지막 줄
+        f.write('{"op": "patch", "chan')
+    append_entry(ledger_folder, {"op": "patch", "changes": [{"row_index": 1, "column": "메모", "value": "새 항목"}]})
+
+    # 읽기 쪽은 압축 중인 항목과 새 항목을 모두 봄
+    assert len(read_entries(ledger_folder)) == 3
+
+    assert compact_journal(ledger_folder)
+
+    memo = [row[HEADERS.index("메모")] for row in read_data_rows(file_path, 1)]
+    assert memo[:2] == ["남은 항목", "새 항목"]
+    assert not os.path.exists(journal_path + COMPACTING_SUFFIX)
+    assert not os.path.exists(journal_path)
+
+
+def test_compact_replay_after_crash_following_xlsx_replace_is_idempotent(ledger_folder):
+    """
+    xlsx 교체 후 compacting 파일을 지우기 전에 중단되면 같은 항목이 한 번 더 반영되지만 결과는 같아야 합니다.
+    """
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    entry = {"op": "patch", "changes": [{"row_index": 2, "column": "검토사항", "value": ["영수증", "계약서"]}]}
+    append_entry(ledger_folder, entry)
+    assert compact_journal(ledger_folder)
+    once = read_data_rows(file_path, 1)
+
+    with open(os.path.join(ledger_folder, JOURNAL_FILENAME + COMPACTING_SUFFIX), "w", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    assert compact_journal(ledger_folder)
+
+    assert read_data_rows(file_path, 1) == once
+    assert once[2][HEADERS.index("검토사항")] == "영수증, 계약서"
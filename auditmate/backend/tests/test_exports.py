@@ -0,0 +1,85 @@
+import io
+import datetime
+import zipfile
+
+import openpyxl
+from openpyxl.styles import Font, PatternFill
+
+from backend import exports
+from backend.exports import export_workbook, iter_folder_zip
+from backend.xlsx_fast_reader import UnsupportedWorkbook
+
+from .conftest import HEADERS
+
+
+def _styled_ledger(path):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "집행내역"
+    worksheet.append(["제목"])
+    worksheet.append(HEADERS)
+    worksheet.append([1, datetime.datetime(2024, 1, 5, 9, 30), "여비", 1000, "적요", "영수증", "메모"])
+    worksheet.append([2, datetime.datetime(2024, 1, 6), "회의비", "=D3*2", "적요 2", None, None])
+    worksheet["A1"].font = Font(bold=True)
+
+    other = workbook.create_sheet("기타")
+    other["A1"] = "keep me"
+    other["A1"].font = Font(bold=True, color="FF0000")
+    other["B2"].fill = PatternFill("solid", fgColor="FFFF00")
+    other["B2"] = 3.5
+    other.column_dimensions["A"].width = 40
+    other.merge_cells("C1:D1")
+    workbook.save(path)
+
+
+def _values(path, sheet_name):
+    workbook = openpyxl.load_workbook(path)
+    return [list(row) for row in workbook[sheet_name].iter_rows(values_only=True)]
+
+
+def test_no_review_export_drops_review_columns_and_keeps_other_sheets(tmp_path):
+    source = tmp_path / "ledger.xlsx"
+    _styled_ledger(source)
+    target = tmp_path / "export.xlsx"
+
+    export_workbook(str(source), 1, "no_review", str(target))
+
+    values = _values(target, "집행내역")
+    assert values[1] == [header for header in HEADERS if header not in ("검토사항", "메모")]
+    assert values[2] == [1, datetime.datetime(2024, 1, 5, 9, 30), "여비", 1000, "적요"]
+    assert values[3] == [2, datetime.datetime(2024, 1, 6), "회의비", "=D3*2", "적요 2"]
+
+    other = openpyxl.load_workbook(target)["기타"]
+    assert other["A1"].value == "keep me"
+    assert other["A1"].font.bold and other["A1"].font.color.rgb == "00FF0000"
+    assert other["B2"].fill.fgColor.rgb == "00FFFF00"
+    assert other.column_dimensions["A"].width == 40
+    assert [str(merged) for merged in other.merged_cells.ranges] == ["C1:D1"]
+
+
+def test_fallback_export_matches_zip_export(tmp_path, monkeypatch):
+    source = tmp_path / "ledger.xlsx"
+    _styled_ledger(source)
+    export_workbook(str(source), 1, "no_review", str(tmp_path / "zip.xlsx"))
+
+    def unsupported(*args):
+        raise UnsupportedWorkbook("test")
+
+    monkeypatch.setattr(exports, "write_sheet_values", unsupported)
+    export_workbook(str(source), 1, "no_review", str(tmp_path / "write_only.xlsx"))
+
+    assert _values(tmp_path / "zip.xlsx", "집행내역") == _values(tmp_path / "write_only.xlsx", "집행내역")
+    # 다른 시트는 zip 방식에서만 원본 그대로 (쓰기 전용 워크북은 병합 셀 등이 빠짐)
+    assert _values(tmp_path / "zip.xlsx", "기타") == _values(source, "기타")
+
+
+def test_folder_zip_skips_internal_files(tmp_path):
+    for name in [
+        "ledger.xlsx", "metadata.json", ".ledger.xlsx.snapshot", "journal.jsonl", "journal.jsonl.compacting",
+        "changes.jsonl", ".ledger.xlsx.0123abcd.tmp",
+    ]:
+        (tmp_path / name).write_text("x", encoding="utf-8")
+
+    names = zipfile.ZipFile(io.BytesIO(b"".join(iter_folder_zip(str(tmp_path))))).namelist()
+
+    assert sorted(names) == ["ledger.xlsx", "metadata.json"]
@@ -0,0 +1,54 @@
+import os
+import time
+import threading
+
+import pytest
+
+from backend.folder_lock import (
+    folder_lock, remove_folder_locks, FolderLockTimeout, _FolderLock, _lock_path, LOCK_NAMES
+)
+
+
+def test_remove_folder_locks_deletes_lock_files(tmp_path):
+    folder_path = str(tmp_path / "folder")
+    for name in LOCK_NAMES:
+        with folder_lock(folder_path, name):
+            pass
+    paths = [_lock_path(folder_path, name) for name in LOCK_NAMES]
+    assert all(os.path.exists(path) for path in paths)
+
+    remove_folder_locks(folder_path)
+
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def test_waiter_on_removed_lock_file_relocks_the_new_file(tmp_path):
+    folder_path = str(tmp_path / "folder")
+    path = _lock_path(folder_path, None)
+    # 다른 프로세스처럼 같은 잠금 파일을 따로 열어 기다리는 잠금
+    other = _FolderLock(path)
+    acquired = threading.Event()
+    done = threading.Event()
+
+    def wait_for_lock():
+        other.acquire(10)
+        acquired.set()
+        done.wait(10)
+        other.release()
+
+    thread = threading.Thread(target=wait_for_lock)
+    with folder_lock(folder_path):
+        thread.start()
+        time.sleep(0.05)
+        remove_folder_locks(folder_path)
+        assert not os.path.exists(path)
+    try:
+        assert acquired.wait(10)
+        # 기다리던 쪽은 새로 만든 잠금 파일을 잡고 있으므로 다른 쪽은 잡을 수 없음
+        assert os.path.samestat(os.fstat(other.fd), os.stat(path))
+        with pytest.raises(FolderLockTimeout):
+            with folder_lock(folder_path, timeout=0):
+                pass
+    finally:
+        done.set()
+        thread.join(10)
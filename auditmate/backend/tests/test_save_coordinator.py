@@ -0,0 +1,141 @@
+import os
+import time
+import threading
+
+import pytest
+from django.conf import settings
+
+from backend import save_coordinator
+from backend.save_coordinator import submit_save, save_stats
+from backend.metadata import load_metadata, get_file_fingerprint
+from backend.workbook_cache import get_sheet_data, parse_sheet_data, invalidate_sheet_data, cache_stats
+
+from .conftest import HEADERS, read_data_rows
+
+
+@pytest.fixture(autouse=True)
+def no_min_interval(monkeypatch):
+    monkeypatch.setattr(settings, "SAVE_MIN_INTERVAL", 0, raising=False)
+
+
+def _patch(row_index, column, value):
+    def merge(batch):
+        batch.add_changes([{"row_index": row_index, "column": column, "value": value}], None)
+    return merge
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_saves_during_a_write_are_coalesced_into_one_write(ledger_folder, monkeypatch):
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    release = threading.Event()
+    batches = []
+    write_batch = save_coordinator.write_batch
+
+    def blocking_write_batch(folder_path, path, batch):
+        batches.append(batch)
+        if len(batches) == 1:
+            release.wait(10)
+        return write_batch(folder_path, path, batch)
+
+    monkeypatch.setattr(save_coordinator, "write_batch", blocking_write_batch)
+    before = save_stats()
+    results = {}
+
+    def save(name, merge):
+        results[name] = submit_save(ledger_folder, file_path, merge)
+
+    threads = [threading.Thread(target=save, args=("first", _patch(0, "메모", "첫 요청")))]
+    threads[0].start()
+    _wait_for(lambda: len(batches) == 1)
+    # 첫 쓰기가 끝나기 전에 들어온 요청 (같은 셀은 나중 요청이 이김)
+    for name, merge in [
+        ("a", _patch(1, "메모", "a")),
+        ("b", _patch(2, "메모", "b")),
+        ("c", _patch(1, "메모", "c")),
+    ]:
+        thread = threading.Thread(target=save, args=(name, merge))
+        thread.start()
+        threads.append(thread)
+    _wait_for(lambda: save_stats()["requests"] - before["requests"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    after = save_stats()
+    assert after["writes"] - before["writes"] == 2
+    assert after["coalesced"] - before["coalesced"] == 2
+    assert len(batches) == 2 and batches[1].requests == 3
+    assert results["first"]["coalesced"] is False
+    assert sorted(results[name]["coalesced"] for name in "abc") == [False, True, True]
+    # 합쳐진 요청은 같은 쓰기의 결과(버전)를 받음
+    assert len({results[name]["version"] for name in "abc"}) == 1
+
+    memo = [row[HEADERS.index("메모")] for row in read_data_rows(file_path, 1)]
+    assert memo[:3] == ["첫 요청", "c", "b"]
+    assert load_metadata(ledger_folder)["version"] == 2
+
+
+def test_full_save_merges_later_cell_changes(ledger_folder):
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    data = [dict(zip(HEADERS, row)) for row in read_data_rows(file_path, 1)]
+    data[0]["메모"] = "전체 저장"
+
+    def merge(batch):
+        batch.add_rows(data, {0: {"메모": [None, "전체 저장"]}}, None)
+        batch.add_changes([{"row_index": 1, "column": "검토사항", "value": "계약서"}], None)
+
+    result = submit_save(ledger_folder, file_path, merge)
+
+    rows = read_data_rows(file_path, 1)
+    assert rows[0][HEADERS.index("메모")] == "전체 저장"
+    assert rows[1][HEADERS.index("검토사항")] == "계약서"
+    assert result["coalesced"] is False
+
+
+def test_failed_write_is_counted_separately(ledger_folder, monkeypatch):
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+
+    def failing_write_batch(folder_path, path, batch):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(save_coordinator, "write_batch", failing_write_batch)
+    before = save_stats()
+    with pytest.raises(OSError):
+        submit_save(ledger_folder, file_path, _patch(0, "메모", "실패"))
+
+    after = save_stats()
+    assert after["writes"] == before["writes"]
+    assert after["failed"] - before["failed"] == 1
+
+
+@pytest.mark.parametrize("account, parses", [
+    (1234567890123456, 0),
+    # 17자리 계좌번호는 반올림된 실수로 읽히므로 새 파일을 다시 파싱
+    (12345678901234567, 1),
+])
+def test_full_save_carries_saved_rows_into_cache(ledger_folder, account, parses):
+    file_path = os.path.join(ledger_folder, "ledger.xlsx")
+    data = [dict(zip(HEADERS, row)) for row in read_data_rows(file_path, 1)]
+    data[0]["메모"] = "전체 저장"
+    data[1]["적요"] = account
+    data[2] = {header: "" for header in HEADERS}
+    get_sheet_data(file_path, 1)
+    before = cache_stats()
+
+    submit_save(ledger_folder, file_path, lambda batch: batch.add_rows(data, {}, None))
+
+    # 저장 후 xlsx를 다시 파싱하지 않고 저장한 행이 캐시에 들어감
+    assert cache_stats()["parses"] - before["parses"] == parses
+    carried = get_sheet_data(file_path, 1)
+    invalidate_sheet_data(file_path)
+    parsed = parse_sheet_data(file_path, get_file_fingerprint(file_path), 1)
+    assert carried.headers == parsed.headers
+    assert carried.rows == parsed.rows
+    assert list(carried.sheet_rows) == list(parsed.sheet_rows)
+    assert carried.stats == parsed.stats
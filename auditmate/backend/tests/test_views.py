@@ -0,0 +1,81 @@
+import os
+import json
+
+import pytest
+from django.conf import settings
+from django.test import RequestFactory
+
+from backend import views
+from backend.edit_journal import append_entry, compact_journal
+
+from .conftest import HEADERS, read_data_rows
+
+
+@pytest.fixture
+def upload_folder(ledger_folder, monkeypatch):
+    monkeypatch.setattr(views, "UPLOAD_DIR", os.path.dirname(ledger_folder))
+    monkeypatch.setattr(settings, "EDIT_JOURNAL_ENABLED", False, raising=False)
+    monkeypatch.setattr(settings, "SAVE_MIN_INTERVAL", 0, raising=False)
+    return ledger_folder
+
+
+def _save(folder_path, data, base_version=None):
+    body = {"folderName": os.path.basename(folder_path), "xlsxFile": "ledger.xlsx", "data": data}
+    if base_version is not None:
+        body["baseVersion"] = base_version
+    request = RequestFactory().post("/api/save-xlsx/", json.dumps(body), content_type="application/json")
+    response = views.save_xlsx(request)
+    return response.status_code, json.loads(response.content)
+
+
+def test_stale_save_with_list_review_values_is_not_a_conflict(upload_folder):
+    file_path = os.path.join(upload_folder, "ledger.xlsx")
+    base = [dict(zip(HEADERS, row)) for row in read_data_rows(file_path, 1)]
+
+    # 다른 클라이언트가 1번째 행 메모를 바꿈 (버전 1)
+    server = [dict(row) for row in base]
+    server[0]["메모"] = "서버에서 수정"
+    status, _ = _save(upload_folder, server, base_version=0)
+    assert status == 200
+
+    # 버전 0을 가진 클라이언트가 검토사항을 목록으로 보내며 3번째 행만 고침
+    client = [dict(row) for row in base]
+    for row in client:
+        row["검토사항"] = [row["검토사항"]] if row["검토사항"] else []
+    client[2]["메모"] = "클라이언트 수정"
+    status, result = _save(upload_folder, client, base_version=0)
+
+    assert status == 200, result
+    rows = read_data_rows(file_path, 1)
+    memo = HEADERS.index("메모")
+    assert rows[0][memo] == "서버에서 수정"
+    assert rows[2][memo] == "클라이언트 수정"
+    assert rows[0][HEADERS.index("검토사항")] == "영수증"
+
+
+def _post(view, path, body):
+    request = RequestFactory().post(path, json.dumps(body), content_type="application/json")
+    response = view(request)
+    content = b"".join(response.streaming_content) if response.streaming else response.content
+    return json.loads(content)
+
+
+@pytest.mark.parametrize("view, path", [
+    (views.read_xlsx, "/api/read-xlsx/"),
+    (views.query_xlsx, "/api/query-xlsx/"),
+])
+def test_read_keeps_journal_edits_when_compaction_finishes_between_reads(upload_folder, monkeypatch, view, path):
+    monkeypatch.setattr(settings, "EDIT_JOURNAL_ENABLED", True, raising=False)
+    append_entry(upload_folder, {"op": "patch", "changes": [{"row_index": 0, "column": "메모", "value": "저널"}]})
+    get_sheet_data = views.get_sheet_data
+
+    def get_sheet_data_then_compact(file_path, column_line, **kwargs):
+        # 압축 전 시트를 읽은 직후 압축이 끝남 (xlsx 교체 후 압축용 저널 삭제)
+        sheet_data = get_sheet_data(file_path, column_line, **kwargs)
+        compact_journal(upload_folder)
+        return sheet_data
+
+    monkeypatch.setattr(views, "get_sheet_data", get_sheet_data_then_compact)
+    result = _post(view, path, {"folderName": os.path.basename(upload_folder), "xlsxFile": "ledger.xlsx"})
+
+    assert result["data"][0]["메모"] == "저널"
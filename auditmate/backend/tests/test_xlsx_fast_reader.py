@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from backend.benchmarks.conformance import build_conformance_workbooks, compare_backends
+
+# build_conformance_workbooks가 만드는 검사 파일 (check_reader_conformance 명령과 같은 파일)
+WORKBOOKS = ["package.xlsx", "package_1904.xlsx", "package_fallback.xlsx", "openpyxl.xlsx", "ledger.xlsx"]
+
+
+@pytest.fixture(scope="module")
+def conformance_workbooks(tmp_path_factory):
+    paths = build_conformance_workbooks(str(tmp_path_factory.mktemp("conformance")))
+    return {os.path.basename(path): path for path in paths}
+
+
+def test_all_conformance_workbooks_are_covered(conformance_workbooks):
+    assert sorted(conformance_workbooks) == sorted(WORKBOOKS)
+
+
+@pytest.mark.parametrize("name", WORKBOOKS)
+def test_fast_reader_matches_openpyxl(conformance_workbooks, name):
+    assert compare_backends(conformance_workbooks[name]) == []
@@ -0,0 +1,112 @@
+import re
+import zipfile
+
+import openpyxl
+
+from backend.xlsx_writer import rewrite_data_rows
+from backend.xlsx_zip_writer import write_data_rows
+
+from .conftest import HEADERS, make_ledger, ledger_rows
+
+CALC_CHAIN = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><c r="H3" i="1"/></calcChain>'
+)
+
+
+def _add_calc_chain(path):
+    """
+    openpyxl은 calcChain.xml을 쓰지 않으므로 Excel이 저장한 파일처럼 calcChain 항목과 관계를 넣습니다.
+    """
+    with zipfile.ZipFile(path) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    members["xl/calcChain.xml"] = CALC_CHAIN
+    members["[Content_Types].xml"] = members["[Content_Types].xml"].replace(
+        b"</Types>",
+        b'<Override PartName="/xl/calcChain.xml" '
+        b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/></Types>',
+    )
+    members["xl/_rels/workbook.xml.rels"] = members["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>",
+        b'<Relationship Id="rIdCalc" Target="calcChain.xml" '
+        b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain"/></Relationships>',
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+
+
+def _sheet_values(path):
+    workbook = openpyxl.load_workbook(path)
+    return {
+        sheet_name: [list(row) for row in workbook[sheet_name].iter_rows(values_only=True)]
+        for sheet_name in workbook.sheetnames
+    }
+
+
+def _dimension(path):
+    with zipfile.ZipFile(path) as archive:
+        sheet_xml = archive.read("xl/worksheets/sheet1.xml")
+    return re.search(rb'<dimension ref="([^"]+)"', sheet_xml).group(1).decode()
+
+
+def _save_both(tmp_path, data, column_line):
+    source = tmp_path / "source.xlsx"
+    zip_path, openpyxl_path = tmp_path / "zip.xlsx", tmp_path / "openpyxl.xlsx"
+    assert write_data_rows(str(source), str(zip_path), column_line, data)
+    workbook = openpyxl.load_workbook(source)
+    rewrite_data_rows(workbook["집행내역"], column_line, data)
+    workbook.save(openpyxl_path)
+    return zip_path, openpyxl_path
+
+
+def test_round_trip_matches_openpyxl(tmp_path):
+    rows = ledger_rows(8)
+    rows[2] = rows[2] + ["=D4*2"]  # 수식 (calcChain에 등록된 셀)
+    column_line = make_ledger(tmp_path / "source.xlsx", rows, title_rows=2)
+    _add_calc_chain(tmp_path / "source.xlsx")
+
+    data = [dict(zip(HEADERS, row)) for row in ledger_rows(5)]
+    data[0]["메모"] = "  앞뒤 공백  "
+    data[1]["금액"] = 1234.5
+    data[2]["비고"] = "=D5+1"
+    data[3]["검토사항"] = "<영수증> & 계약서"
+    zip_path, openpyxl_path = _save_both(tmp_path, data, column_line)
+
+    assert _sheet_values(zip_path) == _sheet_values(openpyxl_path)
+    values = _sheet_values(zip_path)["집행내역"]
+    assert values[column_line + 3][HEADERS.index("메모") + 1] == "=D5+1"
+    assert values[column_line][:len(HEADERS)] == HEADERS
+    assert _sheet_values(zip_path)["기타"] == [["keep me"]]
+
+
+def test_calc_chain_is_removed(tmp_path):
+    rows = ledger_rows(3)
+    rows[0] = rows[0] + ["=D3*2"]
+    column_line = make_ledger(tmp_path / "source.xlsx", rows)
+    _add_calc_chain(tmp_path / "source.xlsx")
+
+    zip_path, _ = _save_both(tmp_path, [dict(zip(HEADERS, row)) for row in ledger_rows(3)], column_line)
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert "xl/calcChain.xml" not in archive.namelist()
+        assert b"calcChain" not in archive.read("[Content_Types].xml")
+        assert b"calcChain" not in archive.read("xl/_rels/workbook.xml.rels")
+        assert b'fullCalcOnLoad="1"' in archive.read("xl/workbook.xml")
+    # 관계가 정리되어 있어야 openpyxl로 다시 열 수 있음
+    openpyxl.load_workbook(zip_path)
+
+
+def test_dimension_matches_openpyxl_when_rows_shrink_and_grow(tmp_path):
+    column_line = make_ledger(tmp_path / "source.xlsx", ledger_rows(10), title_rows=3)
+    for count in (2, 15):
+        data = [dict(zip(HEADERS, row)) for row in ledger_rows(count)]
+        zip_path, openpyxl_path = _save_both(tmp_path, data, column_line)
+        assert _dimension(zip_path) == _dimension(openpyxl_path) == f"A1:G{column_line + 1 + count}"
+
+
+def test_missing_sheet_returns_false(tmp_path):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "다른 시트"
+    workbook.save(tmp_path / "other.xlsx")
+    assert write_data_rows(str(tmp_path / "other.xlsx"), str(tmp_path / "out.xlsx"), 0, []) is False
@@ -0,0 +1,172 @@
+"""
+여러 집행내역 파일을 한 번에 업로드하는 배치 파이프라인
+
+요청 스레드는 파일 저장만 하고, 헤더 행 탐지와 진행도 계산은 프로세스 풀에서 병렬로 처리합니다.
+zip으로 묶인 업로드는 안의 .xlsx 파일을 하나씩 풀어 같은 방식으로 처리합니다.
+"""
+import os
+import uuid
+import shutil
+import zipfile
+import datetime
+import threading
+from concurrent.futures import as_completed
+
+from .constants import WORKSHEET_NAME, ALLOWED_EXTENSIONS, Messages
+from .process_pool import create_process_pool
+from .metadata import get_file_fingerprint, apply_progress_stats, save_metadata
+from .xlsx_reader import open_worksheet
+from .workbook_cache import analyze_sheet, store_sheet_data
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def new_folder_name():
+    """
+    업로드 폴더명 (같은 초에 여러 파일이 올라와도 겹치지 않도록 타임스탬프 뒤에 임의 접미사를 붙임)
+    """
+    return f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def default_rule_name(rule_dir):
+    """
+    새 업로드에 지정할 기본 규칙명 (규칙 폴더명 순으로 첫 번째, 없으면 None)
+    """
+    if not os.path.exists(rule_dir):
+        return None
+    rule_folders = sorted(f for f in os.listdir(rule_dir) if os.path.isdir(os.path.join(rule_dir, f)))
+    return rule_folders[0] if rule_folders else None
+
+
+def analyze_workbook(file_path, keep_in_cache=False):
+    """
+    읽기 전용으로 한 번 열어 한 번의 스트리밍으로 컬럼 행, 진행도 통계, 열별 채움 수를 구하고,
+    이후 읽기 요청이 xlsx를 다시 파싱하지 않도록 시트 데이터 스냅숏을 저장합니다.
+    (워커 프로세스에서 실행할 때는 keep_in_cache=False로 두어 워커에 시트 데이터를 남기지 않음)
+    """
+    try:
+        fingerprint = get_file_fingerprint(file_path)
+        with open_worksheet(file_path) as worksheet:
+            if worksheet is None:
+                return {"error": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME),
+                        "error_detail": "집행내역 시트 없음"}
+            analysis = analyze_sheet(worksheet)
+        store_sheet_data(file_path, fingerprint, analysis.sheet_data, keep_in_cache)
+        return {
+            "columnLine": analysis.column_line,
+            "stats": analysis.sheet_data.stats,
+            "columnFill": analysis.column_fill,
+            "fingerprint": fingerprint,
+        }
+    except Exception as e:
+        return {"error": Messages.UPLOAD_FAILED, "error_detail": str(e)}
+
+
+def get_executor():
+    """
+    분석용 프로세스 풀 (처음 사용할 때 한 번만 만듭니다)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_process_pool("UPLOAD_WORKERS")
+        return _executor
+
+
+def is_workbook_name(file_name):
+    base_name = os.path.basename(file_name)
+    return (
+        base_name.lower().endswith(ALLOWED_EXTENSIONS[0])
+        and not base_name.startswith(("~$", "."))
+    )
+
+
+def save_upload(upload_dir, file_name, source):
+    """
+    파일 객체 하나를 새 업로드 폴더에 저장하고 (폴더명, 파일 경로)를 반환합니다.
+    """
+    folder_name = new_folder_name()
+    folder_path = os.path.join(upload_dir, folder_name)
+    os.makedirs(folder_path)
+    file_path = os.path.join(folder_path, os.path.basename(file_name))
+    with open(file_path, "wb") as f:
+        if hasattr(source, "chunks"):
+            for chunk in source.chunks():
+                f.write(chunk)
+        else:
+            shutil.copyfileobj(source, f, 1024 * 1024)
+    return folder_name, file_path
+
+
+def save_batch(upload_dir, uploaded_files):
+    """
+    업로드된 파일들을 각각의 폴더에 저장합니다. zip 파일은 안의 .xlsx 파일을 풀어 저장합니다.
+    [(원본 파일명, 폴더명, 파일 경로)] 목록과, 처리하지 못한 파일의 결과 목록을 반환합니다.
+    """
+    saved = []
+    rejected = []
+    for uploaded in uploaded_files:
+        if uploaded.name.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(uploaded) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                            continue
+                        if not is_workbook_name(member.filename):
+                            continue
+                        with archive.open(member) as source:
+                            folder_name, file_path = save_upload(upload_dir, member.filename, source)
+                        saved.append((f"{uploaded.name}/{member.filename}", folder_name, file_path))
+            except zipfile.BadZipFile as e:
+                rejected.append({"fileName": uploaded.name, "status": "error", "message": str(e)})
+        elif is_workbook_name(uploaded.name):
+            folder_name, file_path = save_upload(upload_dir, uploaded.name, uploaded)
+            saved.append((uploaded.name, folder_name, file_path))
+        else:
+            rejected.append({"fileName": uploaded.name, "status": "error", "message": Messages.UNSUPPORTED_FILE_TYPE})
+    return saved, rejected
+
+
+def build_metadata(folder_name, file_path, analysis, rule_name):
+    metadata = {
+        "folderName": folder_name,
+        "xlsxFile": os.path.basename(file_path),
+        "lastModified": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "progress": 0,
+        "ruleName": rule_name,
+        "columnLine": analysis["columnLine"],
+        "fingerprint": analysis["fingerprint"],
+        "version": 0,
+    }
+    apply_progress_stats(metadata, analysis["stats"])
+    return metadata
+
+
+def run_batch(saved, rule_name):
+    """
+    저장된 파일들을 프로세스 풀에서 분석하고, 끝나는 순서대로 파일별 결과를 yield합니다.
+    성공한 파일은 metadata.json을 만들고, 실패한 파일은 업로드 폴더를 지웁니다.
+    """
+    executor = get_executor()
+    futures = {
+        executor.submit(analyze_workbook, file_path): (file_name, folder_name, file_path)
+        for file_name, folder_name, file_path in saved
+    }
+    for future in as_completed(futures):
+        file_name, folder_name, file_path = futures[future]
+        try:
+            analysis = future.result()
+        except Exception as e:
+            analysis = {"error": Messages.UPLOAD_FAILED, "error_detail": str(e)}
+
+        folder_path = os.path.dirname(file_path)
+        if "error" in analysis:
+            shutil.rmtree(folder_path, ignore_errors=True)
+            yield {"fileName": file_name, "status": "error", "message": analysis["error"],
+                   "error_detail": analysis.get("error_detail", "")}
+            continue
+
+        metadata = build_metadata(folder_name, file_path, analysis, rule_name)
+        save_metadata(folder_path, metadata)
+        yield {"fileName": file_name, "status": "success", "metadata": metadata, "columnFill": analysis["columnFill"]}
@@ -17,7 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from .views import (
-    list_files, list_rules, download_file, upload_files, read_xlsx, save_xlsx, download_rule_zip,
+    list_files, list_rules, download_file, upload_files, read_xlsx, save_xlsx, patch_xlsx, list_changes, download_rule_zip, workbook_cache_stats, metrics,
+    evaluate_rules, upload_batch, query_xlsx, job_status, job_result,
     save_rule, update_rule_name, delete_file, delete_rule, upload_rules
 )
 
@@ -27,8 +28,17 @@ urlpatterns = [
     path('api/rules/', list_rules, name='list_rules'),
     path("api/download/<str:folder_name>/<str:file_name>/", download_file, name="download_file"),
     path('api/upload/', upload_files, name='upload_files'), 
+    path('api/upload-batch/', upload_batch, name='upload_batch'),
     path('api/read-xlsx/', read_xlsx, name='read_xlsx'),
     path('api/save-xlsx/', save_xlsx, name='save_xlsx'),
+    path('api/patch-xlsx/', patch_xlsx, name='patch_xlsx'),
+    path('api/changes/<str:folder_name>/', list_changes, name='list_changes'),
+    path('api/query-xlsx/', query_xlsx, name='query_xlsx'),
+    path('api/evaluate-rules/', evaluate_rules, name='evaluate_rules'),
+    path('api/jobs/<str:job_id>/', job_status, name='job_status'),
+    path('api/jobs/<str:job_id>/result/', job_result, name='job_result'),
+    path('api/cache-stats/', workbook_cache_stats, name='workbook_cache_stats'),
+    path('api/metrics/', metrics, name='metrics'),
     path('api/download_rule/<str:folder_name>/', download_rule_zip, name='download_rule_zip'),
     path('api/upload_rules/', upload_rules, name='upload_rules'),
     path('api/save_rule/', save_rule, name='save_rule'),
@@ -1,98 +1,209 @@
 import os
 import json
 import datetime
-import zipfile
-import pandas as pd
-import numpy as np
-import openpyxl
-from django.http import JsonResponse, FileResponse, Http404
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404, StreamingHttpResponse
+from django.utils.http import content_disposition_header
 from django.conf import settings
+from django.db import DatabaseError
 from django.views.decorators.csrf import csrf_exempt
 from django.core.files.storage import FileSystemStorage
 from django.views.decorators.http import require_http_methods
-import io
 
 from .constants import (
     WORKSHEET_NAME, ALLOWED_EXTENSIONS, METADATA_FILENAME,
-    REVIEW_COLUMNS, CORE_COLUMNS, PROGRESS_COLUMN,
-    COMMON_HEADER_COLUMNS, Messages, DEFAULT_METADATA_STRUCTURE
+    CORE_COLUMNS, PROGRESS_COLUMN, Messages,
+    DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+)
+from .metadata import (
+    get_file_fingerprint, is_fingerprint_current, load_metadata, save_metadata,
+    apply_progress_stats
+)
+from .xlsx_reader import progress_from_rows
+from .xlsx_writer import normalize_review_value, validate_changes, advance_progress_stats
+from .edit_journal import (
+    journal_enabled, append_entry, read_entries, has_pending_entries, apply_patches,
+    apply_patches_to_values, replaced_rows, overlay_rows, compact_journal, start_compactor
+)
+from .rule_engine import evaluate_sheet
+from .sheet_index import SheetIndex, QueryError
+from .rule_registry import get_rule, list_rule_entries, invalidate_rule, rules_etag, rules_last_modified
+from .exports import cached_export, iter_folder_zip, WorksheetNotFound
+from .catalog import sync_with_disk, query_folders, filter_list_items, remove_folder, catalog_ready, normalize_last_modified
+from .job_queue import submit_job, get_job, get_result_path
+from .upload_pipeline import new_folder_name, default_rule_name, analyze_workbook, save_batch, run_batch
+from .workbook_cache import get_sheet_data, cache_stats
+from .instrumentation import span, render_metrics
+from .folder_lock import folder_lock, atomic_write, remove_folder_locks, FolderLockTimeout
+from .json_stream import ROWS_FORMAT, response_format, table_response
+from .conditional import sheet_validators, folder_list_validators, not_modified, set_validators, make_etag
+from .save_coordinator import submit_save, save_stats
+from .change_feed import (
+    CurrentSheet, folder_version, changes_since, summarize, diff_rows, diff_changes, record_changes,
+    reconcile_rows, patch_conflicts, change_feed
 )
 
 UPLOAD_DIR = os.path.join(settings.BASE_DIR, "Upload_file")
 RULE_DIR = os.path.join(settings.BASE_DIR, "Rule_file")
 CONTACT_DIR = os.path.join(settings.BASE_DIR, "Contact_file")
+EXPORT_DIR = os.path.join(settings.BASE_DIR, "Export_file")
 
-def calculate_progress(worksheet, column_line):
+def is_async_request(value):
     """
-    openpyxl 워크시트에서 '검토사항' 열을 기준으로 진행도를 계산합니다.
-    진행도 = 마지막으로 채워진 행의 인덱스 / 전체 행 수 * 100
+    작업 큐 사용 여부 파라미터(async) 해석
     """
-    # 헤더 행 결정 (columnLine 기준)
-    header_row = column_line + 1 if column_line >= 0 else 1
-    
-    # '검토사항' 컬럼 찾기
-    review_col_idx = None
-    for col_idx in range(1, worksheet.max_column + 1):
-        cell_value = worksheet.cell(row=header_row, column=col_idx).value
-        if cell_value and str(cell_value).strip() == PROGRESS_COLUMN:
-            review_col_idx = col_idx
-            break
-    
-    if review_col_idx is None:
-        return 0  # '검토사항' 컬럼이 없으면 0% 반환
-    
-    # 데이터 행 범위 계산 (헤더 다음 행부터)
-    data_start_row = header_row + 1
-    total_rows = 0
-    last_filled_row = 0
-    
-    # 실제 데이터가 있는 행들 확인
-    for row_idx in range(data_start_row, worksheet.max_row + 1):
-        # 해당 행에 데이터가 있는지 확인 (모든 컬럼 체크)
-        has_data = False
-        for col_idx in range(1, worksheet.max_column + 1):
-            cell_value = worksheet.cell(row=row_idx, column=col_idx).value
-            if cell_value is not None and str(cell_value).strip():
-                has_data = True
-                break
-        
-        if has_data:
-            total_rows += 1
-            # '검토사항' 컬럼에 값이 있는지 확인
-            review_value = worksheet.cell(row=row_idx, column=review_col_idx).value
-            if review_value is not None and str(review_value).strip():
-                last_filled_row = total_rows
-    
-    if total_rows == 0:
-        return 0
-    
-    return round(last_filled_row * 100 / total_rows, 2)
+    return value in (True, 1, "1", "true", "True")
 
-def find_column_line(worksheet):
+def zip_stream_response(folder_path, zip_filename):
     """
-    openpyxl 워크시트에서 공통 컬럼 중 하나라도 포함된 가장 첫 번째 행(0-based index)을 찾습니다.
+    폴더를 zip으로 압축하면서 바로 전송하는 응답 (전체 zip을 메모리에 만들지 않음)
     """
-    # 처음 10행만 검사
-    for row_idx in range(1, min(worksheet.max_row + 1, 11)):
-        row_values = []
-        
-        # 해당 행의 모든 셀 값을 가져와서 문자열로 변환
-        for col_idx in range(1, worksheet.max_column + 1):
-            cell_value = worksheet.cell(row=row_idx, column=col_idx).value
-            if cell_value is not None:
-                row_values.append(str(cell_value).strip())
-        
-        # 정확한 매칭 검사
-        matches = [col for col in COMMON_HEADER_COLUMNS if col in row_values]
-        if len(matches) >= 3:  # 최소 3개 이상의 컬럼이 매칭되면 헤더로 판단
-            return row_idx - 1  # 0-based index로 반환
-    
-    return -1
+    response = StreamingHttpResponse(iter_folder_zip(folder_path), content_type="application/zip")
+    response["Content-Disposition"] = content_disposition_header(True, zip_filename)
+    return response
+
+def parse_version(value):
+    """
+    since/baseVersion 파라미터 해석 (없으면 None, 0 이상의 정수가 아니면 ValueError)
+    """
+    if value is None or value == "":
+        return None
+    version = int(value)
+    if version < 0:
+        raise ValueError(value)
+    return version
+
+def parse_page_params(body):
+    """
+    offset/limit 파라미터 해석 (없으면 0과 DEFAULT_PAGE_LIMIT, limit은 MAX_PAGE_LIMIT까지)
+    0 이상의 정수가 아니면 ValueError (limit=0도 그대로 0개를 요청한 것으로 봄)
+    """
+    values = []
+    for name, default in (("offset", 0), ("limit", DEFAULT_PAGE_LIMIT)):
+        value = body.get(name)
+        if value is None or value == "":
+            values.append(default)
+            continue
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        number = int(value)
+        if number < 0:
+            raise ValueError(value)
+        values.append(number)
+    offset, limit = values
+    return offset, min(limit, MAX_PAGE_LIMIT)
+
+def conflict_response(conflicts, version):
+    """
+    baseVersion 이후 다른 요청이 바꾼 행과 겹칠 때의 409 응답 (conflicts가 None이면 기준 버전 기록이 없는 경우)
+    """
+    if conflicts is None:
+        return JsonResponse({"status": "error", "message": Messages.SYNC_RESET_REQUIRED, "reset": True, "version": version}, status=409)
+    rows = ", ".join(str(row_index + 1) for row_index in conflicts)
+    return JsonResponse({
+        "status": "error",
+        "message": Messages.SAVE_CONFLICT.format(rows),
+        "conflicts": conflicts,
+        "version": version,
+    }, status=409)
+
+def job_accepted_response(job_id, **extra):
+    return JsonResponse({"status": "accepted", "message": Messages.JOB_ACCEPTED, "jobId": job_id, **extra}, status=202)
+
+def refresh_progress(folder_path, xlsx_path, metadata_info):
+    """
+    파일 지문이 metadata와 다르면(서버 밖에서 파일이 바뀐 경우) 진행도를 다시 계산해 metadata에 저장하고 반환합니다.
+    """
+    progress = metadata_info.get("progress", 0)
+    if is_fingerprint_current(metadata_info, xlsx_path):
+        return progress
+    try:
+        # metadata에서 columnLine 정보 가져오기
+        column_line = metadata_info.get("columnLine", 0)
+
+        # 시트 데이터 캐시를 거쳐 진행도 계산
+        # ("집행내역" 시트가 없으면 첫 번째 시트 사용)
+        fingerprint = get_file_fingerprint(xlsx_path)
+        sheet_data = get_sheet_data(xlsx_path, column_line, fallback_first=True)
+        if sheet_data is not None:
+            progress = sheet_data.progress
+
+        # metadata.json 업데이트 (저장 중인 폴더면 기다리지 않고 계산한 값만 반환, 다음 조회 때 다시 기록)
+        with folder_lock(folder_path, timeout=0):
+            metadata_info = load_metadata(folder_path)
+            # 그 사이 저장 요청이 metadata를 이미 최신으로 만들었으면 그 값을 사용
+            if is_fingerprint_current(metadata_info, xlsx_path):
+                return metadata_info.get("progress", 0)
+            if sheet_data is not None:
+                apply_progress_stats(metadata_info, sheet_data.stats)
+            metadata_info["progress"] = progress
+            metadata_info["fingerprint"] = fingerprint
+            save_metadata(folder_path, metadata_info)
+
+    except FolderLockTimeout:
+        pass
+    except Exception as e:
+        print(f"Excel 진행도 계산 오류: {e}")
+    return progress
+
+def parse_list_filters(params):
+    """
+    list_files 조회 조건 파라미터 해석 (잘못된 값이면 ValueError)
+    """
+    def to_float(name):
+        value = params.get(name)
+        return float(value) if value not in (None, "") else None
+
+    return {
+        "rule_name": params.get("rule") or None,
+        "progress_min": to_float("progressMin"),
+        "progress_max": to_float("progressMax"),
+        "modified_from": params.get("modifiedFrom") or None,
+        "modified_to": params.get("modifiedTo") or None,
+        "sort": params.get("sort") or None,
+    }
 
 def list_files(request):
+    """
+    업로드 폴더 목록을 반환하는 함수
+    카탈로그(SQLite)에서 조회하며 다음 조건으로 필터링/정렬할 수 있습니다.
+    rule, progressMin, progressMax, modifiedFrom, modifiedTo (YYYY-MM-DD), sort (folderName|lastModified|progress|ruleName, 앞에 '-'면 내림차순)
+    """
     if not os.path.exists(UPLOAD_DIR):
         return JsonResponse({"error": Messages.UPLOAD_DIR_NOT_EXISTS}, status=404)
 
+    # 폴더의 metadata/xlsx가 하나도 바뀌지 않았으면 카탈로그를 조회하지 않고 304 반환
+    etag, last_modified = folder_list_validators(UPLOAD_DIR, sorted(request.GET.items()))
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
+    try:
+        filters = parse_list_filters(request.GET)
+        if not catalog_ready():
+            # migrate 전이면 기존처럼 폴더를 직접 읽고 카탈로그와 같은 조건/정렬을 적용
+            result = filter_list_items(list_files_from_disk(), **filters)
+            return set_validators(JsonResponse(result, safe=False), etag, last_modified)
+
+        # 서버 밖에서 추가/삭제된 폴더만 카탈로그에 반영
+        sync_with_disk(UPLOAD_DIR)
+        folders = list(query_folders(**filters))
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": Messages.INVALID_LIST_PARAMS.format(e)}, status=400)
+
+    result = []
+    for folder in folders:
+        item = folder.to_list_item()
+        if folder.xlsx_file:
+            folder_path = os.path.join(UPLOAD_DIR, folder.folder_name)
+            xlsx_path = os.path.join(folder_path, folder.xlsx_file)
+            fingerprint = {"mtime": folder.fingerprint_mtime, "size": folder.fingerprint_size}
+            if fingerprint["mtime"] is None or not is_fingerprint_current({"fingerprint": fingerprint}, xlsx_path):
+                item["progress"] = refresh_progress(folder_path, xlsx_path, load_metadata(folder_path))
+        result.append(item)
+
+    return set_validators(JsonResponse(result, safe=False), etag, last_modified)
+
+def list_files_from_disk():
     result = []
     for folder_name in os.listdir(UPLOAD_DIR):
         folder_path = os.path.join(UPLOAD_DIR, folder_name)
@@ -100,112 +211,47 @@ def list_files(request):
             xlsx_files = [f for f in os.listdir(folder_path) if f.endswith(ALLOWED_EXTENSIONS[0])]
             xlsx_file = xlsx_files[0] if xlsx_files else None
 
-            metadata_path = os.path.join(folder_path, METADATA_FILENAME)
-            metadata_info = {}
-
             # metadata.json 읽기
-            if os.path.exists(metadata_path):
-                try:
-                    with open(metadata_path, "r", encoding="utf-8") as f:
-                        metadata_info = json.loads(f.read())  
-                except Exception as e:
-                    print(f"Metadata 파일 읽기 오류: {e}")
+            metadata_info = load_metadata(folder_path)
 
-            # 진행도 계산 
-            progress = 0
+            # 진행도는 metadata에 저장된 값을 사용하고, 파일 지문이 달라진 경우에만 다시 계산
+            progress = metadata_info.get("progress", 0)
             if xlsx_file:
-                try:
-                    # metadata에서 columnLine 정보 가져오기
-                    column_line = metadata_info.get("columnLine", 0)
-                    
-                    # openpyxl로 워크북 로드하여 진행도 계산
-                    workbook = openpyxl.load_workbook(os.path.join(folder_path, xlsx_file), data_only=True)
-                    
-                    # "집행내역" 시트 확인
-                    if WORKSHEET_NAME in workbook.sheetnames:
-                        worksheet = workbook[WORKSHEET_NAME]
-                        progress = calculate_progress(worksheet, column_line)
-                    else:
-                        # "집행내역" 시트가 없으면 첫 번째 시트 사용
-                        if workbook.sheetnames:
-                            worksheet = workbook[workbook.sheetnames[0]]
-                            progress = calculate_progress(worksheet, column_line)
-
-                    # metadata.json 업데이트
-                    metadata_info["progress"] = progress
-                    with open(metadata_path, "w", encoding="utf-8") as f:
-                        json.dump(metadata_info, f, ensure_ascii=False, indent=4)
-
-                except Exception as e:
-                    print(f"Excel 진행도 계산 오류: {e}")
+                progress = refresh_progress(folder_path, os.path.join(folder_path, xlsx_file), metadata_info)
 
             result.append({
                 "folderName": folder_name,
                 "xlsxFile": xlsx_file,
-                "lastModified": metadata_info.get("lastModified", ""),
-                "progress": progress,  # 계산된 진행도 반영
-                "ruleName": metadata_info.get("ruleName", ""),
+                "lastModified": normalize_last_modified(metadata_info.get("lastModified")),
+                "progress": progress,
+                "ruleName": metadata_info.get("ruleName"),
             })
-
-    return JsonResponse(result, safe=False)
+    return result
 
 def list_rules(request):
+    """
+    규칙 목록을 반환하는 함수
+    ?summary=1이면 규칙 본문 없이 폴더명, 업로드 시각, 분류 키만 반환합니다.
+    규칙 파일이 바뀌지 않았으면 If-None-Match에 대해 304를 반환합니다.
+    """
     if not os.path.exists(RULE_DIR):
         return JsonResponse({"error": Messages.RULE_DIR_NOT_EXISTS}, status=404)
 
-    result = []
-    
-    for folder_name in os.listdir(RULE_DIR):
-        folder_path = os.path.join(RULE_DIR, folder_name)
-        if not os.path.isdir(folder_path):
-            continue
-            
-        rule_info = load_rule_from_folder(folder_path, folder_name)
-        result.append(rule_info)
-
-    return JsonResponse(result, safe=False, json_dumps_params={'ensure_ascii': False})
-
-def load_rule_from_folder(folder_path, folder_name):
-    """
-    개별 규칙 폴더에서 규칙 정보를 로딩하는 함수
-    """
-    metadata_path = os.path.join(folder_path, METADATA_FILENAME)
-    default_upload_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # 기본값 설정
-    result = {
-        "folderName": folder_name,
-        "documentRule": {},
-        "categoryRule": {},
-        "uploadTime": default_upload_time,
-    }
-    
-    if os.path.exists(metadata_path):
-        try:
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-            
-            # 메타데이터에서 정보 추출
-            result["uploadTime"] = metadata.get("uploadTime", default_upload_time)
-            result["categoryRule"] = metadata.get("categoryRule", {})
-            
-            # documentRule 파일 로딩
-            document_rule_filename = metadata.get("documentRule")
-            if document_rule_filename:
-                document_rule_path = os.path.join(folder_path, document_rule_filename)
-                if os.path.exists(document_rule_path):
-                    with open(document_rule_path, "r", encoding="utf-8") as f:
-                        result["documentRule"] = json.load(f)
-                else:
-                    print(f"Warning: documentRule 파일이 존재하지 않음 - {document_rule_path}")
-            
-        except Exception as e:
-            print(f"Error: 메타데이터 로딩 실패 ({folder_name}): {e}")
+    summary = request.GET.get("summary") in ("1", "true")
+    entries = list_rule_entries(RULE_DIR)
+    etag = rules_etag(entries, "summary" if summary else "full")
+    last_modified = rules_last_modified(RULE_DIR, entries)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
 
+    if summary:
+        result = [entry.summary for entry in entries]
     else:
-        print(f"Warning: metadata.json이 없음 - {folder_name}")
-    
-    return result
+        result = [entry.info for entry in entries]
+
+    response = JsonResponse(result, safe=False, json_dumps_params={'ensure_ascii': False})
+    return set_validators(response, etag, last_modified)
 
 def download_file(request, folder_name, file_name):
     file_path = os.path.join(UPLOAD_DIR, folder_name, file_name)
@@ -213,6 +259,14 @@ def download_file(request, folder_name, file_name):
 
     if not os.path.exists(file_path):
         raise Http404("File not found")
+
+    # 저널에 남은 편집 내용을 먼저 xlsx에 반영
+    folder_path = os.path.join(UPLOAD_DIR, folder_name)
+    if has_pending_entries(folder_path):
+        try:
+            compact_journal(folder_path)
+        except Exception as e:
+            print(f"저널 압축 오류: {e}")
     
     # 메타데이터에서 columnLine 정보 가져오기
     column_line = 0
@@ -228,56 +282,26 @@ def download_file(request, folder_name, file_name):
 
     # xlsx 파일이면 type에 따라 열 제거
     if file_name.lower().endswith('.xlsx'):
+        # async=1이면 작업 큐에서 생성하고 작업 id 반환 (결과는 /api/jobs/<id>/result/)
+        if is_async_request(request.GET.get("async")):
+            job_id = submit_job("export_xlsx", {
+                "folderPath": folder_path, "fileName": file_name, "downloadType": download_type,
+                "cacheDir": os.path.join(EXPORT_DIR, folder_name),
+            })
+            return job_accepted_response(job_id)
+
         try:
-            import tempfile
-            
-            # openpyxl로 워크북 로드
-            workbook = openpyxl.load_workbook(file_path)
-            
-            # "집행내역" 시트 확인
-            if WORKSHEET_NAME not in workbook.sheetnames:
-                return JsonResponse({"error": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
-            
-            worksheet = workbook[WORKSHEET_NAME]
-            
-            if download_type == 'no_review':
-                # '검토사항', '메모' 열 찾아서 제거
-                cols_to_exclude = REVIEW_COLUMNS
-                
-                # 헤더 행 찾기 (column_line 기준)
-                header_row = column_line + 1 if column_line > 0 else 1
-                
-                # 헤더에서 제외할 컬럼의 인덱스 찾기
-                cols_to_delete = []
-                for col_idx in range(1, worksheet.max_column + 1):
-                    cell_value = worksheet.cell(row=header_row, column=col_idx).value
-                    if cell_value and str(cell_value).strip() in cols_to_exclude:
-                        cols_to_delete.append(col_idx)
-                
-                # 뒤에서부터 컬럼 삭제 (인덱스가 변경되지 않도록)
-                for col_idx in reversed(cols_to_delete):
-                    worksheet.delete_cols(col_idx)
-            
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-                workbook.save(tmp.name)
-                response = FileResponse(open(tmp.name, "rb"), as_attachment=True, filename=file_name)
-            return response
+            # 내보낸 파일은 (원본 mtime, type)별로 Export_file에 보관되어 같은 요청에는 바로 응답
+            export_path = cached_export(file_path, column_line, download_type, os.path.join(EXPORT_DIR, folder_name))
+            return FileResponse(open(export_path, "rb"), as_attachment=True, filename=file_name)
+        except WorksheetNotFound as e:
+            return JsonResponse({"error": str(e)}, status=400)
         except Exception as e:
             return JsonResponse({"error": Messages.EXCEL_EXPORT_ERROR.format(str(e))}, status=500)
 
     if os.path.isdir(file_path):
-        # 디렉토리라면 zip으로 압축해서 반환
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for root, _, files in os.walk(file_path):
-                for f in files:
-                    abs_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(abs_path, file_path)
-                    zip_file.write(abs_path, arcname=rel_path)
-        zip_buffer.seek(0)
-        zip_filename = f"{file_name}.zip"
-        return FileResponse(zip_buffer, as_attachment=True, filename=zip_filename)
+        # 디렉토리라면 zip으로 압축하면서 스트리밍으로 반환
+        return zip_stream_response(file_path, f"{file_name}.zip")
     else:
         return FileResponse(open(file_path, "rb"), as_attachment=True, filename=file_name)
 
@@ -285,16 +309,20 @@ def download_file(request, folder_name, file_name):
 def upload_files(request):
     if request.method == "POST":
         upload_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        upload_dir = os.path.join(UPLOAD_DIR, upload_time)
+        folder_name = new_folder_name()
+        upload_dir = os.path.join(UPLOAD_DIR, folder_name)
 
         metadata = {
-            "folderName": upload_time,
+            "folderName": folder_name,
             "xlsxFile": None,
             "lastModified": upload_time,
             "progress": 0,
             "ruleName": None,
             "columnLine": 0,
+            "fingerprint": None,
+            "version": 0,
         }
+        column_fill = None
         
         os.makedirs(upload_dir, exist_ok=True)
 
@@ -306,91 +334,164 @@ def upload_files(request):
             saved_excel_path = fs.save(excel_file.name, excel_file)
             metadata["xlsxFile"] = saved_excel_path
 
-            # 진행도 계산 (Excel 파일에서 "검토사항" 열 기준), 컬럼 행 찾기
-            try:
-                # openpyxl로 워크북 로드하여 컬럼 라인 찾기
-                workbook = openpyxl.load_workbook(os.path.join(upload_dir, metadata["xlsxFile"]), data_only=True)
-                
-                # "집행내역" 시트 확인
-                if WORKSHEET_NAME not in workbook.sheetnames:
-                    return JsonResponse({
-                        "status": "error",
-                        "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME),
-                        "error_detail": "집행내역 시트 없음"
-                    }, status=400)
-                
-                worksheet = workbook[WORKSHEET_NAME]
-                metadata["columnLine"] = find_column_line(worksheet)
-                
-                # openpyxl로 진행도 계산
-                metadata["progress"] = calculate_progress(worksheet, metadata["columnLine"])
-                metadata["lastModified"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            except Exception as e:
-                # 정렬/필터 등으로 읽기 실패 시 에러 메시지 반환
+            # async=1이면 분석과 metadata.json 생성을 작업 큐에 맡기고 바로 응답
+            if is_async_request(request.POST.get("async")):
+                job_id = submit_job("analyze_upload", {
+                    "folderPath": upload_dir,
+                    "folderName": folder_name,
+                    "filePath": os.path.join(upload_dir, saved_excel_path),
+                    "ruleName": default_rule_name(RULE_DIR),
+                })
+                return job_accepted_response(job_id, folderName=folder_name)
+
+            # 컬럼 행 탐지와 진행도 계산을 한 번의 읽기로 처리
+            # (시트 데이터는 캐시와 스냅숏에 남아 이후 read-xlsx에서 재사용)
+            analysis = analyze_workbook(os.path.join(upload_dir, metadata["xlsxFile"]), keep_in_cache=True)
+            if "error" in analysis:
+                # "집행내역" 시트가 없거나 정렬/필터 등으로 읽기 실패 시 에러 메시지 반환
                 return JsonResponse({
                     "status": "error",
-                    "message": Messages.UPLOAD_FAILED,
-                    "error_detail": str(e)
+                    "message": analysis["error"],
+                    "error_detail": analysis["error_detail"]
                 }, status=400)
 
-        # Rule_file에서 첫번째 폴더 이름 가져오기
-        rule_name = None
-        if os.path.exists(RULE_DIR):
-            rule_folders = [f for f in os.listdir(RULE_DIR) if os.path.isdir(os.path.join(RULE_DIR, f))]
-            if rule_folders:
-                rule_name = rule_folders[0]
-            else:
-                rule_name = None  # 폴더가 없으면 None
-        else:
-            rule_name = None  # Rule_file 폴더가 없으면 None
-        
-        metadata["ruleName"] = rule_name
+            metadata["columnLine"] = analysis["columnLine"]
+            column_fill = analysis["columnFill"]
+            apply_progress_stats(metadata, analysis["stats"])
+            metadata["fingerprint"] = analysis["fingerprint"]
+            metadata["lastModified"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Rule_file에서 폴더명 순으로 첫번째 폴더 이름 가져오기 (없으면 None)
+        metadata["ruleName"] = default_rule_name(RULE_DIR)
 
         # metadata.json 생성
-        with open(os.path.join(upload_dir, METADATA_FILENAME), "w", encoding="utf-8") as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=4)
+        save_metadata(upload_dir, metadata)
 
-        return JsonResponse({"message": Messages.UPLOAD_SUCCESS, "metadata": metadata})
+        return JsonResponse({"message": Messages.UPLOAD_SUCCESS, "metadata": metadata, "columnFill": column_fill})
 
     return JsonResponse({"error": Messages.INVALID_REQUEST_METHOD}, status=400)
 
 
+@csrf_exempt
+def upload_batch(request):
+    """
+    여러 Excel 파일(또는 Excel 파일을 묶은 zip)을 한 번에 업로드하는 함수
+    파일은 각각 새 폴더에 저장하고, 분석(컬럼 행 탐지, 진행도 계산)은 프로세스 풀에서 병렬로 처리합니다.
+    응답은 NDJSON 스트림으로, 파일별 결과를 분석이 끝나는 순서대로 한 줄씩 보낸 뒤 마지막 줄에 요약을 보냅니다.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": Messages.INVALID_REQUEST_METHOD}, status=400)
+
+    uploaded_files = request.FILES.getlist("excel_files") + request.FILES.getlist("zip_file")
+    if not uploaded_files:
+        return JsonResponse({"status": "error", "message": Messages.NO_FILES_UPLOADED}, status=400)
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    saved, rejected = save_batch(UPLOAD_DIR, uploaded_files)
+    rule_name = default_rule_name(RULE_DIR)
+
+    def stream():
+        succeeded = 0
+        for result in rejected:
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+        for result in run_batch(saved, rule_name):
+            if result["status"] == "success":
+                succeeded += 1
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+        total = len(saved) + len(rejected)
+        yield json.dumps({
+            "status": "done",
+            "message": Messages.BATCH_UPLOAD_DONE.format(total, succeeded),
+            "total": total,
+            "succeeded": succeeded,
+        }, ensure_ascii=False) + "\n"
+
+    return StreamingHttpResponse(stream(), content_type="application/x-ndjson")
+
+def table_value_rows(sheet_data, entries, pending_rows, offset=0, limit=None):
+    """
+    read-xlsx compact/columnar 응답용 (헤더, 값 튜플 행 목록, 전체 행 수)
+    저널의 전체 교체 데이터가 있으면 그 행을, 없으면 캐시의 행에 patch만 덮어씌운 행을 사용합니다.
+    """
+    end = None if limit is None else offset + limit
+    if pending_rows is not None:
+        # 교체 데이터에만 있는 컬럼도 빠지지 않도록 헤더 뒤에 추가
+        columns = dict.fromkeys(sheet_data.headers)
+        for row in pending_rows:
+            columns.update(dict.fromkeys(row))
+        headers = list(columns)
+        window = pending_rows[offset:end]
+        return headers, [tuple(row.get(column) for column in headers) for row in window], len(pending_rows)
+
+    rows = sheet_data.rows if offset == 0 and end is None else sheet_data.rows[offset:end]
+    headers, rows = apply_patches_to_values(sheet_data.headers, rows, entries, offset)
+    return headers, rows, sheet_data.total_rows
+
 @csrf_exempt
 def read_xlsx(request):
     # 기본적으로 항상 있어야 하는 핵심 컬럼들만 정의
     core_columns = CORE_COLUMNS
 
-    if request.method == 'POST':
+    if request.method in ('GET', 'POST'):
         try:
-            body = json.loads(request.body)
+            # GET은 같은 값을 쿼리 파라미터로 받음 (브라우저 캐시와 If-None-Match 재검증 사용 가능)
+            body = request.GET.dict() if request.method == 'GET' else json.loads(request.body)
             folderName = body.get('folderName')
             xlsxFile = body.get('xlsxFile')
 
             if not folderName:
                 return JsonResponse({'status': 'error', 'message': Messages.MISSING_FILENAME}, status=400)
 
-            file_path = os.path.join(UPLOAD_DIR, folderName, xlsxFile)
-            metadata_path = os.path.join(UPLOAD_DIR, folderName, METADATA_FILENAME)
+            # offset/limit이 있으면 해당 구간의 행만 반환 (구간 조회 모드)
+            windowed = 'offset' in body or 'limit' in body
+            if windowed:
+                try:
+                    offset, limit = parse_page_params(body)
+                except (TypeError, ValueError):
+                    return JsonResponse({'status': 'error', 'message': Messages.INVALID_PAGE_PARAMS}, status=400)
+
+            # 응답 형식 (rows: 행별 dict, compact/columnar: 값 배열을 스트리밍, json_stream 모듈 참고)
+            table_format = response_format(request, body)
+            if table_format is None:
+                return JsonResponse({'status': 'error', 'message': Messages.INVALID_TABLE_FORMAT}, status=400)
+
+            folder_path = os.path.join(UPLOAD_DIR, folderName)
+            file_path = os.path.join(folder_path, xlsxFile)
+            metadata_path = os.path.join(folder_path, METADATA_FILENAME)
 
             if not os.path.exists(file_path):
                 return JsonResponse({'status': 'error', 'message': Messages.FILE_NOT_FOUND}, status=404)
 
+            # 파일/metadata/저널이 그대로면 시트를 읽지 않고 304 반환
+            etag, last_modified = sheet_validators(
+                folder_path, file_path, (table_format, offset, limit) if windowed else (table_format,)
+            )
+            cached = not_modified(request, etag, last_modified)
+            if cached is not None:
+                return cached
+
             # metadata에서 columnLine 정보 가져오기
+            # (version은 시트보다 먼저 읽어야 응답 데이터가 항상 그 버전 이후의 내용이 됨)
             column_line = 0
+            version = 0
             if os.path.exists(metadata_path):
                 try: 
                     with open(metadata_path, "r", encoding="utf-8") as f:
                         metadata = json.load(f)
                     column_line = metadata.get("columnLine", 0)
+                    version = folder_version(metadata)
                 except Exception as e:
                     print(f"Metadata 로드 오류: {e}")
 
             try:
-                # openpyxl로 워크북 로드
-                workbook = openpyxl.load_workbook(file_path, data_only=True)
-                
+                # 아직 xlsx에 반영되지 않은 저널 항목
+                # (xlsx보다 먼저 읽어야 그 사이 압축이 끝나도 반영된 편집이 빠지지 않음, 이미 반영된 항목을 다시 덮어써도 결과는 같음)
+                entries = read_entries(folder_path)
+                # 시트 데이터 캐시를 거쳐 읽기 (캐시에 없을 때만 워크북을 파싱)
+                sheet_data = get_sheet_data(file_path, column_line)
+
                 # "집행내역" 시트 확인
-                if WORKSHEET_NAME not in workbook.sheetnames:
+                if sheet_data is None:
                     return JsonResponse({
                         'status': 'error',
                         'data': None,
@@ -398,39 +499,28 @@ def read_xlsx(request):
                         'core_columns': core_columns,
                         'actual_columns': [],
                     }, status=400, safe=False, json_dumps_params={'ensure_ascii': False})
-                
-                worksheet = workbook[WORKSHEET_NAME]
-                
-                # 헤더 행 결정 (columnLine 기준)
-                header_row = column_line + 1 if column_line >= 0 else 1
-                
-                # 헤더 읽기
-                headers = []
-                for col_idx in range(1, worksheet.max_column + 1):
-                    cell_value = worksheet.cell(row=header_row, column=col_idx).value
-                    if cell_value is not None:
-                        headers.append(str(cell_value).strip())
-                    else:
-                        headers.append(f"Column_{col_idx}")
-                
-                # 데이터 읽기 (헤더 다음 행부터)
-                data_rows = []
-                for row_idx in range(header_row + 1, worksheet.max_row + 1):
-                    row_data = {}
-                    has_data = False
-                    
-                    for col_idx, header in enumerate(headers, 1):
-                        cell_value = worksheet.cell(row=row_idx, column=col_idx).value
-                        if cell_value is not None:
-                            has_data = True
-                            row_data[header] = cell_value
-                        else:
-                            row_data[header] = None
-                    
-                    # 빈 행이 아닌 경우만 추가
-                    if has_data:
-                        data_rows.append(row_data)
-                
+
+                pending_rows = replaced_rows(entries)
+                headers = list(sheet_data.headers)
+
+                if table_format != ROWS_FORMAT:
+                    # 행 dict를 만들지 않고 캐시의 값 튜플을 그대로 사용
+                    headers, data_rows, total_rows = table_value_rows(
+                        sheet_data, entries, pending_rows, offset if windowed else 0, limit if windowed else None
+                    )
+                elif windowed and pending_rows is not None:
+                    # 저널의 전체 교체 데이터에서 구간만 잘라서 반환
+                    data_rows = pending_rows[offset:offset + limit]
+                    total_rows = len(pending_rows)
+                elif windowed:
+                    # 요청한 구간의 행만 반환
+                    data_rows = apply_patches(sheet_data.row_dicts(offset, limit), entries, offset)
+                    total_rows = sheet_data.total_rows
+                else:
+                    # 헤더 다음 행부터 빈 행을 제외한 전체 데이터
+                    data_rows = pending_rows if pending_rows is not None else apply_patches(sheet_data.row_dicts(), entries)
+                    total_rows = len(data_rows)
+
                 # DataFrame과 유사한 구조로 변환
                 actual_columns = headers
                 
@@ -448,30 +538,51 @@ def read_xlsx(request):
             for col in core_columns:
                 if col not in actual_columns:
                     actual_columns.append(col)
-                    # 모든 데이터 행에 해당 컬럼 추가
-                    for row_data in data_rows:
-                        row_data[col] = None
+                    # 모든 데이터 행에 해당 컬럼 추가 (compact/columnar 형식은 인코딩할 때 None으로 채움)
+                    if table_format == ROWS_FORMAT:
+                        for row_data in data_rows:
+                            row_data[col] = None
+
+            # 구간 조회 모드에서는 전체 행 수와 다음 구간 위치를 함께 반환
+            page_info = {}
+            if windowed:
+                next_offset = offset + len(data_rows)
+                page_info = {
+                    'offset': offset,
+                    'limit': limit,
+                    'total_rows': total_rows,
+                    'next_offset': next_offset if next_offset < total_rows else None,
+                }
 
             # 핵심 컬럼 중 없는 것들 체크
             missing_core = [col for col in core_columns if col not in [h for h in headers if h in actual_columns]]
             if missing_core:
-                return JsonResponse({
+                payload = {
                     'status': 'warning',
                     'message': Messages.CORE_COLUMNS_MISSING.format(", ".join(missing_core)),
-                    'data': data_rows,
                     'core_columns': core_columns,
                     'actual_columns': actual_columns,
-                    'missing_core': missing_core
-                }, status=200, safe=False, json_dumps_params={'ensure_ascii': False})
+                    'missing_core': missing_core,
+                    'version': version,
+                    **page_info,
+                }
+            else:
+                payload = {
+                    'status': 'success',
+                    'message': Messages.EXCEL_READ_SUCCESS,
+                    'core_columns': core_columns,
+                    'actual_columns': actual_columns,
+                    'total_columns': len(actual_columns),
+                    'version': version,
+                    **page_info,
+                }
 
-            return JsonResponse({
-                'status': 'success',
-                'data': data_rows,
-                'message': Messages.EXCEL_READ_SUCCESS,
-                'core_columns': core_columns,
-                'actual_columns': actual_columns,
-                'total_columns': len(actual_columns)
-            }, status=200, safe=False, json_dumps_params={'ensure_ascii': False})
+            if table_format != ROWS_FORMAT:
+                response = table_response({**payload, 'format': table_format}, data_rows, len(actual_columns), table_format)
+            else:
+                with span("json_encode"):
+                    response = JsonResponse({**payload, 'data': data_rows}, status=200, safe=False, json_dumps_params={'ensure_ascii': False})
+            return set_validators(response, etag, last_modified)
 
         except Exception as e:
             return JsonResponse({
@@ -503,80 +614,406 @@ def save_xlsx(request):
             if not folder_name or not xlsx_file or not data:
                 return JsonResponse({"status": "error", "message": Messages.MISSING_REQUIRED_INFO}, status=400)
 
-            # 검토사항이 빈값이면 항상 빈 문자열로 저장
-            for row in data:
-                review = row.get(PROGRESS_COLUMN)
-                if not review or (isinstance(review, list) and len(review) == 0):
-                    row[PROGRESS_COLUMN] = ""
-                elif isinstance(review, list):
-                    row[PROGRESS_COLUMN] = ", ".join(str(x) for x in review)
-                else:
-                    row[PROGRESS_COLUMN] = str(review)
+            # baseVersion: 클라이언트가 마지막으로 동기화한 폴더 버전 (있으면 그 뒤 바뀐 행과의 충돌을 검사)
+            try:
+                base_version = parse_version(body.get("baseVersion"))
+            except (TypeError, ValueError):
+                return JsonResponse({"status": "error", "message": Messages.INVALID_VERSION}, status=400)
 
+            # 저널을 쓰지 않을 때 async가 true이면 전체 저장을 작업 큐에서 수행
             file_path = os.path.join(UPLOAD_DIR, folder_name, xlsx_file)
-            metadata_path = os.path.join(UPLOAD_DIR, folder_name, METADATA_FILENAME)
+            if is_async_request(body.get("async")) and not journal_enabled() and os.path.exists(file_path):
+                job_id = submit_job("save_sheet", {
+                    "folderPath": os.path.join(UPLOAD_DIR, folder_name),
+                    "filePath": file_path,
+                    "data": data,
+                    "lastModified": last_modified,
+                    "baseVersion": base_version,
+                })
+                return job_accepted_response(job_id)
+
+            folder_path = os.path.join(UPLOAD_DIR, folder_name)
+            last_modified = last_modified or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # metadata 읽기부터 저장까지 폴더 잠금 안에서 수행 (다른 워커의 저장과 섞이지 않도록)
+            with folder_lock(folder_path):
+                # 메타데이터에서 columnLine 정보 가져오기
+                metadata = load_metadata(folder_path)
+                column_line = metadata.get("columnLine", 0)
 
-            # 메타데이터에서 columnLine 정보 가져오기
-            column_line = 0
-            if os.path.exists(metadata_path):
-                with open(metadata_path, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
+                # 저장 전 현재 데이터 (xlsx 캐시 + 아직 반영되지 않은 저널)와 비교해 바뀐 행을 기록
+                sheet_data = get_sheet_data(file_path, column_line) if os.path.exists(file_path) else None
+                current = CurrentSheet(sheet_data, read_entries(folder_path))
+                # 검토사항이 빈값이면 항상 빈 문자열로 저장 (목록으로 온 검토사항도 저장 형식으로 바꾼 뒤 비교)
+                for row in data:
+                    row[PROGRESS_COLUMN] = normalize_review_value(row.get(PROGRESS_COLUMN))
+                if base_version is not None:
+                    history = changes_since(folder_path, metadata, base_version)
+                    if history is None:
+                        return conflict_response(None, folder_version(metadata))
+                    # 다른 요청이 바꾼 행을 이전 값 그대로 보냈으면 현재 값을 유지하고, 함께 바꾼 행은 충돌
+                    data, conflicts = reconcile_rows(summarize(history), current, data)
+                    if conflicts:
+                        return conflict_response(conflicts, folder_version(metadata))
+
+                changed = diff_rows(current, data)
+
+                # 저널 사용 시: 저널에 추가하고 즉시 응답 (xlsx 반영은 백그라운드 압축기가 수행)
+                if journal_enabled() and os.path.exists(file_path):
+                    append_entry(folder_path, {"op": "replace", "data": data, "lastModified": last_modified})
+                    start_compactor(UPLOAD_DIR)
+
+                    version = record_changes(folder_path, metadata, changed, len(data), last_modified)
+                    apply_progress_stats(metadata, progress_from_rows(data))
+                    metadata["lastModified"] = last_modified
+                    save_metadata(folder_path, metadata)
+
+                    return JsonResponse({"status": "success", "message": Messages.SAVE_SUCCESS, "version": version})
+
+                # 저장할 파일이 없으면 진행도와 수정 시각만 기록
+                if not os.path.exists(file_path):
+                    apply_progress_stats(metadata, progress_from_rows(data))
+                    metadata["fingerprint"] = get_file_fingerprint(file_path)
+                    metadata["lastModified"] = last_modified
+                    save_metadata(folder_path, metadata)
+                    return JsonResponse({"status": "success", "message": Messages.SAVE_SUCCESS, "version": folder_version(metadata)})
+
+            # 같은 파일의 쓰기가 진행 중이면 대기 중인 묶음에 셀 단위로 합쳐 한 번에 씀 (save_coordinator 참고)
+            try:
+                result = submit_save(folder_path, file_path, lambda batch: batch.add_rows(data, changed, last_modified))
+            except WorksheetNotFound:
+                return JsonResponse({"status": "error", "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
+
+            return JsonResponse({"status": "success", "message": Messages.SAVE_SUCCESS, **result})
+        except FolderLockTimeout as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=503)
+        except Exception as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=500)
+    return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
+
+def check_patch_base(folder_path, metadata, base_version, current, changes):
+    """
+    baseVersion 이후 다른 요청이 바꾼 행에 현재와 다른 값을 쓰려 하면 409 응답을, 아니면 None을 반환합니다.
+    """
+    if base_version is None:
+        return None
+    history = changes_since(folder_path, metadata, base_version)
+    conflicts = None if history is None else patch_conflicts(summarize(history), current, changes)
+    if conflicts is None or conflicts:
+        return conflict_response(conflicts, folder_version(metadata))
+    return None
+
+@csrf_exempt
+def patch_xlsx(request):
+    """
+    [{row_index, column, value}, ...] 형태의 변경사항을 받아 해당 셀만 수정하는 함수
+    진행도는 metadata의 통계를 이용해 변경된 검토사항만으로 증분 계산합니다.
+    """
+    if request.method == "POST":
+        try:
+            body = json.loads(request.body)
+            folder_name = body.get("folderName")
+            xlsx_file = body.get("xlsxFile")
+            last_modified = body.get("lastModified")
+            changes = body.get("changes")
+
+            if not folder_name or not xlsx_file or not isinstance(changes, list) or not changes:
+                return JsonResponse({"status": "error", "message": Messages.MISSING_REQUIRED_INFO}, status=400)
+
+            try:
+                base_version = parse_version(body.get("baseVersion"))
+            except (TypeError, ValueError):
+                return JsonResponse({"status": "error", "message": Messages.INVALID_VERSION}, status=400)
+
+            folder_path = os.path.join(UPLOAD_DIR, folder_name)
+            file_path = os.path.join(folder_path, xlsx_file)
+            if not os.path.exists(file_path):
+                return JsonResponse({"status": "error", "message": Messages.FILE_NOT_FOUND}, status=404)
+
+            # metadata/저널/xlsx 읽기부터 저장까지 폴더 잠금 안에서 수행 (다른 워커의 저장과 섞이지 않도록)
+            with folder_lock(folder_path):
+                metadata = load_metadata(folder_path)
                 column_line = metadata.get("columnLine", 0)
-            else:
-                metadata = {}
-
-            # DataFrame 생성
-            df = pd.DataFrame(data)
-            
-            # columnLine 정보에 따라 저장 방식 결정
-            if os.path.exists(file_path):
-                # 기존 파일 구조 유지하면서 데이터만 업데이트
-                workbook = openpyxl.load_workbook(file_path)
-                
-                # "집행내역" 시트 확인
-                if WORKSHEET_NAME not in workbook.sheetnames:
+
+                # 데이터 행 순번 -> 시트 행 번호 (파일이 바뀌지 않았으면 캐시된 시트 데이터 재사용)
+                sheet_data = get_sheet_data(file_path, column_line)
+                if sheet_data is None:
                     return JsonResponse({"status": "error", "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
-                
-                worksheet = workbook[WORKSHEET_NAME]
 
-                # 기존 데이터 영역 삭제 (헤더 아래부터)
-                max_row = worksheet.max_row
-                if max_row > column_line + 1:
-                    worksheet.delete_rows(column_line + 2, max_row - column_line - 1)
-                
-                # 새 데이터 입력 (헤더 다음 행부터)
-                for row_idx, (_, row_data) in enumerate(df.iterrows()):
-                    for col_idx, value in enumerate(row_data):
-                        worksheet.cell(
-                            row=column_line + 2 + row_idx,
-                            column=col_idx + 1,
-                            value=value
-                        )
-                
-                workbook.save(file_path)
+                # 저널 사용 시: 검증 후 저널에 추가하고 즉시 응답
+                if journal_enabled():
+                    entries = read_entries(folder_path)
+                    pending_rows = replaced_rows(entries)
+                    if pending_rows is not None:
+                        total_rows = len(pending_rows)
+                        columns = {column for row in pending_rows for column in row}
+                    else:
+                        total_rows = sheet_data.total_rows
+                        columns = set(sheet_data.headers)
+
+                    try:
+                        changes = validate_changes(changes, total_rows, columns)
+                    except ValueError as e:
+                        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+                    current = CurrentSheet(sheet_data, entries)
+                    conflict = check_patch_base(folder_path, metadata, base_version, current, changes)
+                    if conflict is not None:
+                        return conflict
+                    changed = diff_changes(current, changes)
+
+                    last_modified = last_modified or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    append_entry(folder_path, {"op": "patch", "changes": changes, "lastModified": last_modified})
+                    start_compactor(UPLOAD_DIR)
+                    version = record_changes(folder_path, metadata, changed, total_rows, last_modified)
+
+                    stats = advance_progress_stats(metadata.get("progressStats"), changes)
+                    if stats is None:
+                        # 마지막으로 채워진 검토사항이 비워진 경우 저널을 덮어씌운 전체 행으로 다시 계산
+                        if pending_rows is None:
+                            pending_rows = sheet_data.row_dicts()
+                        stats = progress_from_rows(overlay_rows(pending_rows, entries + [{"op": "patch", "changes": changes}]))
+                    apply_progress_stats(metadata, stats)
+                    metadata["lastModified"] = last_modified
+                    save_metadata(folder_path, metadata)
+
+                    return JsonResponse({
+                        "status": "success",
+                        "message": Messages.SAVE_SUCCESS,
+                        "progress": metadata["progress"],
+                        "applied": len(changes),
+                        "version": version,
+                    })
+
+                try:
+                    changes = validate_changes(changes, sheet_data.total_rows, set(sheet_data.headers))
+                except ValueError as e:
+                    return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+                conflict = check_patch_base(folder_path, metadata, base_version, CurrentSheet(sheet_data, []), changes)
+                if conflict is not None:
+                    return conflict
 
-            # openpyxl로 진행도 계산
+            # 같은 파일의 쓰기가 진행 중이면 대기 중인 묶음에 합쳐 한 번에 씀 (save_coordinator 참고)
             try:
-                workbook = openpyxl.load_workbook(file_path, data_only=True)
-                if WORKSHEET_NAME in workbook.sheetnames:
-                    worksheet = workbook[WORKSHEET_NAME]
-                    metadata["progress"] = calculate_progress(worksheet, column_line)
-                else:
-                    metadata["progress"] = 0
-            except Exception as e:
-                print(f"진행도 계산 오류: {e}")
-                metadata["progress"] = 0
+                result = submit_save(folder_path, file_path, lambda batch: batch.add_changes(changes, last_modified))
+            except WorksheetNotFound:
+                return JsonResponse({"status": "error", "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
 
-            metadata["lastModified"] = last_modified or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return JsonResponse({
+                "status": "success",
+                "message": Messages.SAVE_SUCCESS,
+                "applied": len(changes),
+                **result,
+            })
+        except FolderLockTimeout as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=503)
+        except Exception as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=500)
+    return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
 
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=4)
+def list_changes(request, folder_name):
+    """
+    since 버전 이후 바뀐 행만 반환하는 함수 (?since=<version>)
+    클라이언트는 받은 행의 값을 자기 표에 덮어씌우고 version을 다음 since로 사용합니다.
+    since 버전의 기록이 남아 있지 않으면 reset: true를 반환하며, 이때는 read-xlsx로 전체를 다시 읽어야 합니다.
+    """
+    if request.method != "GET":
+        return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
+    try:
+        since = parse_version(request.GET.get("since")) or 0
+    except (TypeError, ValueError):
+        return JsonResponse({"status": "error", "message": Messages.INVALID_VERSION}, status=400)
+
+    folder_path = os.path.join(UPLOAD_DIR, folder_name)
+    if not os.path.exists(os.path.join(folder_path, METADATA_FILENAME)):
+        return JsonResponse({"status": "error", "message": Messages.FOLDER_NOT_EXISTS}, status=404)
 
-            return JsonResponse({"status": "success", "message": Messages.SAVE_SUCCESS})
+    try:
+        metadata = load_metadata(folder_path)
+        # 폴더 버전이 그대로면 같은 since에 대한 응답도 같으므로 304로 답함 (주기적 조회가 본문 없이 끝남)
+        etag = make_etag("changes", folder_version(metadata), since)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        feed = change_feed(folder_path, metadata, since)
+        response = JsonResponse({"status": "success", **feed}, json_dumps_params={"ensure_ascii": False})
+        return set_validators(response, etag)
+    except Exception as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=500)
+
+@csrf_exempt
+def query_xlsx(request):
+    """
+    집행내역 행을 서버에서 필터링/정렬하여 요청한 구간만 반환하는 함수
+    body: folderName, xlsxFile, filters, sort, offset, limit (형식은 sheet_index 모듈 참고)
+    각 행의 데이터 행 순번(patch-xlsx의 row_index)을 row_indexes로 함께 반환합니다.
+    """
+    if request.method == "POST":
+        try:
+            body = json.loads(request.body)
+            folder_name = body.get("folderName")
+            if not folder_name:
+                return JsonResponse({"status": "error", "message": Messages.MISSING_FOLDER_NAME}, status=400)
+
+            try:
+                offset, limit = parse_page_params(body)
+            except (TypeError, ValueError):
+                return JsonResponse({"status": "error", "message": Messages.INVALID_PAGE_PARAMS}, status=400)
+
+            folder_path = os.path.join(UPLOAD_DIR, folder_name)
+            metadata = load_metadata(folder_path)
+            xlsx_file = body.get("xlsxFile") or metadata.get("xlsxFile")
+            file_path = os.path.join(folder_path, xlsx_file) if xlsx_file else None
+            if not file_path or not os.path.exists(file_path):
+                return JsonResponse({"status": "error", "message": Messages.FILE_NOT_FOUND}, status=404)
+
+            # 저널은 xlsx보다 먼저 읽음 (read_xlsx와 같음)
+            entries = read_entries(folder_path)
+            sheet_data = get_sheet_data(file_path, metadata.get("columnLine", 0))
+            if sheet_data is None:
+                return JsonResponse({"status": "error", "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
+
+            # 저널에 남은 편집이 있으면 그 내용을 반영한 행으로 임시 인덱스를 만들어 조회
+            if entries:
+                headers = list(sheet_data.headers)
+                rows = overlay_rows(sheet_data.row_dicts(), entries)
+                for row in rows:
+                    headers.extend(column for column in row if column not in headers)
+                index = SheetIndex(headers, [tuple(row.get(column) for column in headers) for row in rows])
+            else:
+                headers = sheet_data.headers
+                index = sheet_data.index
+
+            try:
+                row_ids = index.query(body.get("filters"), body.get("sort"))
+            except QueryError as e:
+                return JsonResponse({"status": "error", "message": Messages.INVALID_QUERY.format(e)}, status=400)
+
+            page_ids = row_ids[offset:offset + limit].tolist()
+            data_rows = [dict(zip(headers, index.rows[row_id])) for row_id in page_ids]
+            total_rows = len(row_ids)
+            next_offset = offset + len(page_ids)
+
+            with span("json_encode"):
+                return JsonResponse({
+                    "status": "success",
+                    "data": data_rows,
+                    "row_indexes": page_ids,
+                    "actual_columns": list(headers),
+                    "offset": offset,
+                    "limit": limit,
+                    "total_rows": total_rows,
+                    "next_offset": next_offset if next_offset < total_rows else None,
+                }, json_dumps_params={"ensure_ascii": False})
+        except Exception as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=500)
+    return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
+
+@csrf_exempt
+def evaluate_rules(request):
+    """
+    업로드 폴더의 집행내역 전체를 검토 규칙으로 평가하여 행별 필요 서류와 누락 서류/기입항목을 반환하는 함수
+    ruleName이 없으면 폴더의 metadata에 지정된 규칙을 사용합니다.
+    """
+    if request.method == "POST":
+        try:
+            body = json.loads(request.body)
+            folder_name = body.get("folderName")
+            only_missing = bool(body.get("onlyMissing", False))
+
+            if not folder_name:
+                return JsonResponse({"status": "error", "message": Messages.MISSING_FOLDER_NAME}, status=400)
+
+            folder_path = os.path.join(UPLOAD_DIR, folder_name)
+            metadata = load_metadata(folder_path)
+            xlsx_file = body.get("xlsxFile") or metadata.get("xlsxFile")
+            rule_name = body.get("ruleName") or metadata.get("ruleName")
+
+            if not rule_name:
+                return JsonResponse({"status": "error", "message": Messages.RULE_NOT_SELECTED}, status=400)
+            rule_entry = get_rule(RULE_DIR, rule_name)
+            if rule_entry is None:
+                return JsonResponse({"status": "error", "message": Messages.RULE_FOLDER_NOT_EXISTS}, status=404)
+
+            file_path = os.path.join(folder_path, xlsx_file) if xlsx_file else None
+            if not file_path or not os.path.exists(file_path):
+                return JsonResponse({"status": "error", "message": Messages.FILE_NOT_FOUND}, status=404)
+
+            # 저널은 xlsx보다 먼저 읽음 (read_xlsx와 같음)
+            entries = read_entries(folder_path)
+            sheet_data = get_sheet_data(file_path, metadata.get("columnLine", 0))
+            if sheet_data is None:
+                return JsonResponse({"status": "error", "message": Messages.WORKSHEET_NOT_FOUND.format(WORKSHEET_NAME)}, status=400)
+
+            # 저널에 남은 편집 내용까지 반영된 최신 행으로 평가
+            if entries:
+                rows = overlay_rows(sheet_data.row_dicts(), entries)
+            else:
+                rows = sheet_data.rows
+
+            result = evaluate_sheet(rule_entry.compiled, sheet_data.headers, rows, only_missing=only_missing)
+
+            return JsonResponse(
+                {"status": "success", "ruleName": rule_name, **result},
+                json_dumps_params={"ensure_ascii": False}
+            )
         except Exception as e:
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
     return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
 
+def job_status(request, job_id):
+    """
+    작업 큐에 등록된 작업의 상태, 진행률(%), 결과를 반환하는 함수
+    """
+    job = get_job(job_id)
+    if job is None:
+        return JsonResponse({"status": "error", "message": Messages.JOB_NOT_FOUND}, status=404)
+    if get_result_path(job):
+        job["resultUrl"] = f"/api/jobs/{job_id}/result/"
+    return JsonResponse(job, json_dumps_params={"ensure_ascii": False})
+
+def job_result(request, job_id):
+    """
+    완료된 작업의 결과 파일을 내려받는 함수
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise Http404("Job not found")
+    result_path = get_result_path(job)
+    if result_path is None:
+        return JsonResponse({"status": "error", "message": Messages.JOB_RESULT_NOT_READY}, status=409)
+    return FileResponse(open(result_path, "rb"), as_attachment=True, filename=os.path.basename(result_path))
+
+def workbook_cache_stats(request):
+    """
+    시트 데이터 캐시의 적중/미스 횟수와 메모리 사용량을 반환하는 함수
+    """
+    return JsonResponse(cache_stats())
+
+def metrics(request):
+    """
+    요청 수, 요청/구간별 지연시간 히스토그램, 시트 캐시 통계를 Prometheus 텍스트 형식으로 반환하는 함수
+    """
+    stats = cache_stats()
+    counters = {
+        f"auditmate_workbook_cache_{name}_total": stats[key]
+        for name, key in (("hits", "hits"), ("misses", "misses"), ("evictions", "evictions"),
+                          ("loads", "loads"), ("snapshot_loads", "snapshotLoads"), ("parses", "parses"))
+    }
+    coordinator = save_stats()
+    counters.update({
+        "auditmate_save_requests_total": coordinator["requests"],
+        "auditmate_save_writes_total": coordinator["writes"],
+        "auditmate_save_failed_total": coordinator["failed"],
+        "auditmate_save_coalesced_total": coordinator["coalesced"],
+    })
+    gauges = {
+        "auditmate_workbook_cache_entries": stats["entries"],
+        "auditmate_workbook_cache_bytes": stats["bytes"],
+    }
+    return HttpResponse(render_metrics(counters, gauges), content_type="text/plain; version=0.0.4; charset=utf-8")
+
 @csrf_exempt
 def upload_rules(request):
     if request.method == "POST":
@@ -609,8 +1046,9 @@ def upload_rules(request):
                 metadata["categoryRule"] = {}
 
         # metadata.json 저장
-        with open(os.path.join(rule_dir, METADATA_FILENAME), "w", encoding="utf-8") as f:
+        with atomic_write(os.path.join(rule_dir, METADATA_FILENAME)) as f:
             json.dump(metadata, f, ensure_ascii=False, indent=4)
+        invalidate_rule(rule_name)
 
         return JsonResponse({"message": Messages.RULE_UPLOAD_SUCCESS, "metadata": metadata})
 
@@ -620,16 +1058,10 @@ def download_rule_zip(request, folder_name):
     folder_path = os.path.join(RULE_DIR, folder_name)
     if not os.path.isdir(folder_path):
         raise Http404("Rule folder not found")
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for root, _, files in os.walk(folder_path):
-            for f in files:
-                abs_path = os.path.join(root, f)
-                rel_path = os.path.relpath(abs_path, folder_path)
-                zip_file.write(abs_path, arcname=rel_path)
-    zip_buffer.seek(0)
-    zip_filename = f"{folder_name}.zip"
-    return FileResponse(zip_buffer, as_attachment=True, filename=zip_filename)
+    if is_async_request(request.GET.get("async")):
+        job_id = submit_job("folder_zip", {"folderPath": folder_path, "fileName": f"{folder_name}.zip"})
+        return job_accepted_response(job_id)
+    return zip_stream_response(folder_path, f"{folder_name}.zip")
 
 @csrf_exempt
 def save_rule(request):
@@ -645,23 +1077,27 @@ def save_rule(request):
             rule_folder = os.path.join(RULE_DIR, folder_name)
             os.makedirs(rule_folder, exist_ok=True)
 
-            # documentRule 저장
-            if document_rule is not None:
-                with open(os.path.join(rule_folder, document_rule), "w", encoding="utf-8") as f:
-                    json.dump(document_rule, f, ensure_ascii=False, indent=4)
+            with folder_lock(rule_folder):
+                # documentRule 저장
+                if document_rule is not None:
+                    with atomic_write(os.path.join(rule_folder, document_rule)) as f:
+                        json.dump(document_rule, f, ensure_ascii=False, indent=4)
 
-            # metadata.json의 lastModified만 업데이트
-            metadata_path = os.path.join(rule_folder, METADATA_FILENAME)
-            if os.path.exists(metadata_path):
-                with open(metadata_path, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-            else:
-                metadata = {}
-            metadata["lastModified"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=4)
+                # metadata.json의 lastModified만 업데이트
+                metadata_path = os.path.join(rule_folder, METADATA_FILENAME)
+                if os.path.exists(metadata_path):
+                    with open(metadata_path, "r", encoding="utf-8") as f:
+                        metadata = json.load(f)
+                else:
+                    metadata = {}
+                metadata["lastModified"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                with atomic_write(metadata_path) as f:
+                    json.dump(metadata, f, ensure_ascii=False, indent=4)
+            invalidate_rule(folder_name)
 
             return JsonResponse({"status": "success", "message": Messages.RULE_SAVE_SUCCESS})
+        except FolderLockTimeout as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=503)
         except Exception as e:
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
     return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
@@ -684,15 +1120,18 @@ def update_rule_name(request):
             if not os.path.exists(metadata_path):
                 return JsonResponse({"status": "error", "message": Messages.METADATA_NOT_EXISTS}, status=404)
 
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+            folder_path = os.path.join(UPLOAD_DIR, folder_name)
+            with folder_lock(folder_path):
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
 
-            metadata["ruleName"] = rule_name
+                metadata["ruleName"] = rule_name
 
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=4)
+                save_metadata(folder_path, metadata)
 
             return JsonResponse({"status": "success", "message": Messages.RULE_NAME_UPDATE_SUCCESS})
+        except FolderLockTimeout as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=503)
         except Exception as e:
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
     return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
@@ -710,7 +1149,15 @@ def delete_file(request, folder_name):
         return JsonResponse({"error": Messages.FOLDER_NOT_EXISTS}, status=404)
     try:
         import shutil
-        shutil.rmtree(folder_path)
+        # 저장 중인 폴더를 지우지 않도록 잠금을 잡고 삭제
+        with folder_lock(folder_path):
+            shutil.rmtree(folder_path)
+            remove_folder_locks(folder_path)
+        shutil.rmtree(os.path.join(EXPORT_DIR, folder_name), ignore_errors=True)
+        try:
+            remove_folder(folder_name)
+        except DatabaseError as e:
+            print(f"카탈로그 갱신 오류: {e}")
         return JsonResponse({"status": "success", "message": Messages.DELETE_SUCCESS.format(folder_name)})
     except Exception as e:
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
@@ -727,6 +1174,8 @@ def delete_rule(request, folder_name):
     try:
         import shutil
         shutil.rmtree(rule_folder_path)
+        remove_folder_locks(rule_folder_path)
+        invalidate_rule(folder_name)
         return JsonResponse({"status": "success", "message": Messages.RULE_DELETE_SUCCESS.format(folder_name)})
     except Exception as e:
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
\ No newline at end of file
@@ -0,0 +1,467 @@
+"""
+파싱된 시트 데이터의 프로세스 내 LRU 캐시
+
+같은 xlsx를 요청마다 다시 파싱하지 않도록 헤더, 데이터 행 값, 시트 행 위치, 진행도 통계를
+(절대경로, mtime, size, columnLine) 키로 보관합니다. 파일이 바뀌면 지문이 달라지므로 자연히 다시 읽습니다.
+캐시 미스 때는 먼저 업로드 폴더의 열 단위 스냅숏(sheet_snapshot)을 읽고, 스냅숏이 없거나 지문이 다를 때만
+xlsx를 파싱한 뒤 스냅숏을 새로 저장합니다.
+메모리 사용량 추정치 합계가 WORKBOOK_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+"""
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from django.conf import settings
+from openpyxl.cell.cell import ERROR_CODES
+
+from .constants import WORKSHEET_NAME, PROGRESS_COLUMN
+from .instrumentation import timed
+from .metadata import get_file_fingerprint
+from .sheet_index import SheetIndex
+from .sheet_snapshot import load_snapshot, write_snapshot
+from .xlsx_reader import (
+    HEADER_SCAN_ROWS, open_worksheet, get_header_row, iter_row_values, build_headers, has_value, is_empty_row,
+    is_header_row, compute_progress,
+)
+from .xlsx_zip_writer import data_columns
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# zip 방식으로 저장한 뒤 같은 값으로 다시 읽히는 가장 큰 정수
+MAX_EXACT_INT = 10 ** 16 - 1
+# 메모리 추정 시 실제로 크기를 재는 행 수 (나머지는 평균으로 추정)
+SIZE_SAMPLE_ROWS = 200
+
+
+class SheetData:
+    """
+    한 시트의 헤더와 데이터 행(값 튜플), 각 데이터 행의 시트 행 번호, 진행도 통계
+    """
+
+    def __init__(self, headers, rows, sheet_rows, stats, column_line):
+        self.headers = headers
+        self.rows = rows
+        self.sheet_rows = sheet_rows
+        self.stats = stats
+        self.column_line = column_line
+        self.nbytes = estimate_nbytes(headers, rows)
+        self._index = None
+
+    @property
+    def index(self):
+        """
+        행 조회용 열 인덱스 (처음 사용할 때 만들고 이 객체와 함께 캐시에 보관)
+        """
+        if self._index is None:
+            self._index = SheetIndex(self.headers, self.rows)
+        return self._index
+
+    @property
+    def total_rows(self):
+        return len(self.rows)
+
+    @property
+    def progress(self):
+        return self.stats["progress"]
+
+    def row_dicts(self, offset=0, limit=None):
+        """
+        데이터 행을 {헤더: 값} dict 목록으로 반환합니다. 호출마다 새 dict를 만듭니다.
+        """
+        end = None if limit is None else offset + limit
+        headers = self.headers
+        return [dict(zip(headers, row)) for row in self.rows[offset:end]]
+
+    def with_changes(self, changes):
+        """
+        셀 단위 변경사항이 반영된 새 SheetData를 만듭니다. (행 위치는 그대로라고 가정)
+        """
+        positions = {header: idx for idx, header in enumerate(self.headers)}
+        rows = list(self.rows)
+        for change in changes:
+            col_idx = positions.get(change["column"])
+            if col_idx is None:
+                continue
+            row = list(rows[change["row_index"]])
+            row[col_idx] = change.get("value")
+            rows[change["row_index"]] = tuple(row)
+        return SheetData(self.headers, rows, self.sheet_rows, self.stats, self.column_line)
+
+
+def estimate_nbytes(headers, rows):
+    """
+    행 목록이 차지하는 메모리를 앞쪽 일부 행의 실제 크기로 추정합니다.
+    """
+    if not rows:
+        return sys.getsizeof(headers)
+    sample = rows[:SIZE_SAMPLE_ROWS]
+    sample_bytes = sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row if value is not None)
+        for row in sample
+    )
+    return sys.getsizeof(rows) + sample_bytes * len(rows) // len(sample)
+
+
+class SheetAnalysis:
+    """
+    analyze_sheet 결과: 헤더 행 위치, 시트 데이터, 열별 채움 수({헤더: 값이 있는 데이터 행 수})
+    """
+
+    def __init__(self, column_line, sheet_data, column_fill):
+        self.column_line = column_line
+        self.sheet_data = sheet_data
+        self.column_fill = column_fill
+
+
+class _SheetScanner:
+    """
+    헤더 행 다음부터 한 행씩 받아 데이터 행, 행 위치, 진행도 통계, 열별 채움 수를 모읍니다.
+    """
+
+    def __init__(self, header_values):
+        self.header_values = header_values
+        # 헤더 행 끝의 빈 셀(서식만 있는 열)은 아래 행에 값이 나올 때만 열로 포함
+        self.width = used_width(header_values)
+        self.review_col_idx = None
+        for col_idx, cell_value in enumerate(header_values):
+            if cell_value and str(cell_value).strip() == PROGRESS_COLUMN:
+                self.review_col_idx = col_idx
+                break
+        self.rows = []
+        self.sheet_rows = array("L")
+        self.fill_counts = [0] * self.width
+        self.widened = False
+        self.total_rows = 0
+        self.last_filled_row = 0
+
+    def add(self, sheet_row, row):
+        if is_empty_row(row):
+            return
+        width = self.width
+        header_width = len(self.header_values)
+        if len(row) > width and width < header_width:
+            extra = row[width:header_width]
+            if not is_empty_row(extra):
+                self._widen(width + used_width(extra))
+                width = self.width
+
+        values = tuple(row[:width])
+        if len(values) < width:
+            values += (None,) * (width - len(values))
+        if not is_empty_row(values):
+            self.rows.append(values)
+            self.sheet_rows.append(sheet_row)
+
+        filled = False
+        fill_counts = self.fill_counts
+        for col_idx, cell_value in enumerate(values):
+            if cell_value is not None and has_value(cell_value):
+                fill_counts[col_idx] += 1
+                filled = True
+
+        if self.review_col_idx is None:
+            return
+        if not filled:
+            # 헤더 범위 밖의 값까지 포함해 행 전체 기준 (scan_progress와 같음)
+            tail = row[width:]
+            filled = not is_empty_row(tail) and any(has_value(cell_value) for cell_value in tail)
+        if filled:
+            self.total_rows += 1
+            review_col_idx = self.review_col_idx
+            if review_col_idx < len(row) and has_value(row[review_col_idx]):
+                self.last_filled_row = self.total_rows
+
+    def _widen(self, width):
+        self.fill_counts += [0] * (width - self.width)
+        self.width = width
+        self.widened = True
+
+    def finish(self, column_line):
+        headers = build_headers(self.header_values[:self.width])
+        rows = self.rows
+        if self.widened:
+            width = self.width
+            rows = [row + (None,) * (width - len(row)) if len(row) < width else row for row in rows]
+        stats = {
+            "progress": compute_progress(self.last_filled_row, self.total_rows),
+            "totalRows": self.total_rows,
+            "lastFilledRow": self.last_filled_row,
+        }
+        sheet_data = SheetData(headers, rows, self.sheet_rows, stats, column_line)
+        return SheetAnalysis(column_line, sheet_data, dict(zip(headers, self.fill_counts)))
+
+
+def used_width(values):
+    """
+    마지막으로 값이 있는 열까지의 너비 (끝쪽 None 열 제외)
+    """
+    width = len(values)
+    while width and values[width - 1] is None:
+        width -= 1
+    return width
+
+
+@timed("row_scan")
+def analyze_sheet(worksheet, column_line=None):
+    """
+    시트를 한 번만 스트리밍하여 헤더 행 탐지, 데이터 행과 시트 행 위치, 진행도 통계, 열별 채움 수를 함께 구합니다.
+    column_line이 None이면 처음 HEADER_SCAN_ROWS행에서 is_header_row 기준으로 헤더 행을 찾습니다. (없으면 -1)
+
+    데이터 행 판단은 read-xlsx와 같이 헤더 범위의 값이 하나라도 있으면 포함하고,
+    진행도 통계는 scan_progress와 같이 행 전체의 비어있지 않은 값을 기준으로 계산합니다.
+    헤더 행 끝의 빈 열과 시트 끝쪽의 빈 행(iter_row_values 참고)은 포함하지 않습니다.
+    """
+    with _cache.lock:
+        _cache.parses += 1
+    detect = column_line is None
+    min_row = 1 if detect else get_header_row(column_line)
+    pending = []
+    scanner = None
+
+    for sheet_row, row in enumerate(iter_row_values(worksheet, min_row=min_row), min_row):
+        if scanner is not None:
+            scanner.add(sheet_row, row)
+            continue
+        if not detect:
+            scanner = _SheetScanner(row)
+            continue
+
+        # 헤더를 찾을 때까지 읽은 행은 보관했다가 헤더가 정해지면 이어서 처리
+        pending.append(row)
+        if is_header_row(row):
+            column_line = sheet_row - 1
+        elif sheet_row < HEADER_SCAN_ROWS:
+            continue
+        else:
+            column_line = -1
+        scanner = _start_scanner(pending, column_line)
+        pending = None
+
+    if scanner is None:
+        if not pending:
+            column_line = -1 if detect else column_line
+            return _SheetScanner(()).finish(column_line)
+        column_line = -1
+        scanner = _start_scanner(pending, column_line)
+    return scanner.finish(column_line)
+
+
+def _start_scanner(pending, column_line):
+    header_row = get_header_row(column_line)
+    scanner = _SheetScanner(pending[header_row - 1])
+    for sheet_row, row in enumerate(pending[header_row:], header_row + 1):
+        scanner.add(sheet_row, row)
+    return scanner
+
+
+def load_sheet_data(worksheet, column_line):
+    """
+    columnLine을 알고 있는 시트를 한 번 스트리밍하여 SheetData를 만듭니다.
+    """
+    return analyze_sheet(worksheet, column_line).sheet_data
+
+
+class WorkbookCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 캐시 미스로 실제 워크북을 파싱한 횟수 / 스냅숏에서 읽은 횟수
+        self.loads = 0
+        self.snapshot_loads = 0
+        # 업로드 분석을 포함해 이 프로세스에서 시트를 스트리밍 파싱한 전체 횟수
+        self.parses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            sheet_data = self.entries.get(key)
+            if sheet_data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return sheet_data
+
+    def put(self, key, sheet_data):
+        # 캐시 전체 용량보다 큰 시트는 보관하지 않음
+        if sheet_data.nbytes > self.max_bytes:
+            return
+        with self.lock:
+            self._discard_path(key[0])
+            self.entries[key] = sheet_data
+            self.current_bytes += sheet_data.nbytes
+            while self.current_bytes > self.max_bytes and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, path):
+        with self.lock:
+            self._discard_path(path)
+
+    def _discard_path(self, path):
+        for key in [key for key in self.entries if key[0] == path]:
+            self.current_bytes -= self.entries.pop(key).nbytes
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "loads": self.loads,
+                "snapshotLoads": self.snapshot_loads,
+                "parses": self.parses,
+            }
+
+
+_cache = WorkbookCache(getattr(settings, "WORKBOOK_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def _make_key(file_path, fingerprint, column_line, fallback_first):
+    return (
+        os.path.abspath(file_path),
+        (fingerprint["mtime"], fingerprint["size"]) if fingerprint else None,
+        column_line,
+        fallback_first,
+    )
+
+
+def get_sheet_data(file_path, column_line, fallback_first=False):
+    """
+    캐시를 거쳐 시트 데이터를 반환합니다. "집행내역" 시트가 없으면 None을 반환합니다.
+    (fallback_first=True이면 첫 번째 시트를 대신 사용)
+    """
+    fingerprint = get_file_fingerprint(file_path)
+    key = _make_key(file_path, fingerprint, column_line, fallback_first)
+
+    sheet_data = _cache.get(key)
+    if sheet_data is not None:
+        return sheet_data
+
+    sheet_data = load_snapshot(file_path, fingerprint, column_line, fallback_first)
+    if sheet_data is not None:
+        with _cache.lock:
+            _cache.snapshot_loads += 1
+    else:
+        sheet_data = parse_sheet_data(file_path, fingerprint, column_line, fallback_first)
+        if sheet_data is None:
+            return None
+    _cache.put(key, sheet_data)
+    return sheet_data
+
+
+def parse_sheet_data(file_path, fingerprint, column_line, fallback_first=False):
+    """
+    xlsx를 파싱해 시트 데이터를 만들고 스냅숏으로 저장합니다. (캐시에는 넣지 않음)
+    """
+    with open_worksheet(file_path, fallback_first=fallback_first) as worksheet:
+        if worksheet is None:
+            return None
+        sheet_name = worksheet.title
+        sheet_data = load_sheet_data(worksheet, column_line)
+
+    with _cache.lock:
+        _cache.loads += 1
+    save_snapshot(file_path, sheet_data, fingerprint, sheet_name)
+    return sheet_data
+
+
+def save_snapshot(file_path, sheet_data, fingerprint, sheet_name=WORKSHEET_NAME):
+    # 스냅숏은 다시 만들 수 있는 사본이므로 저장에 실패해도 요청은 계속 처리
+    try:
+        write_snapshot(file_path, sheet_data, fingerprint, sheet_name)
+    except Exception as e:
+        print(f"스냅숏 저장 오류 ({file_path}): {e}")
+
+
+def store_sheet_data(file_path, fingerprint, sheet_data, keep_in_cache=True):
+    """
+    방금 파싱한 시트 데이터를 스냅숏으로 저장하고, keep_in_cache=True이면 캐시에도 넣습니다.
+    """
+    save_snapshot(file_path, sheet_data, fingerprint)
+    if keep_in_cache:
+        _cache.put(_make_key(file_path, fingerprint, sheet_data.column_line, False), sheet_data)
+
+
+def refresh_sheet_data(file_path, column_line):
+    """
+    xlsx를 저장한 직후 호출: 새 파일을 파싱해 스냅숏을 다시 만들고 캐시에 넣습니다.
+    """
+    invalidate_sheet_data(file_path)
+    fingerprint = get_file_fingerprint(file_path)
+    sheet_data = parse_sheet_data(file_path, fingerprint, column_line)
+    if sheet_data is not None:
+        _cache.put(_make_key(file_path, fingerprint, column_line, False), sheet_data)
+    return sheet_data
+
+
+def carry_sheet_data(file_path, column_line, old_fingerprint, new_fingerprint, changes, stats):
+    """
+    행 위치가 바뀌지 않는 셀 단위 저장 후, 캐시된 데이터에 변경사항을 반영해 새 지문으로 옮깁니다.
+    """
+    old_key = _make_key(file_path, old_fingerprint, column_line, False)
+    with _cache.lock:
+        sheet_data = _cache.entries.get(old_key)
+    if sheet_data is None:
+        return
+    updated = sheet_data.with_changes(changes)
+    updated.stats = stats
+    _cache.put(_make_key(file_path, new_fingerprint, column_line, False), updated)
+    # 행 위치가 그대로이므로 xlsx를 다시 파싱하지 않고 반영된 데이터로 스냅숏을 갱신
+    save_snapshot(file_path, updated, new_fingerprint)
+
+
+def _saved_value(value):
+    """
+    zip 방식으로 저장한 값을 다시 읽었을 때의 값 (읽은 값이 같다고 확신할 수 없으면 ValueError)
+    """
+    # 빈 문자열은 셀을 쓰지 않으므로 None으로 읽힘
+    if value is None or value == "":
+        return None
+    # 숫자는 유효숫자 16자리("%.16g")로 쓰므로 그보다 긴 정수는 반올림된 실수로 읽힘
+    if isinstance(value, int) and not isinstance(value, bool) and abs(value) <= MAX_EXACT_INT:
+        return value
+    if isinstance(value, str) and not value.startswith("=") and value not in ERROR_CODES:
+        return value
+    raise ValueError(f"다시 읽은 값을 알 수 없습니다: {value!r}")
+
+
+def carry_saved_rows(file_path, column_line, headers, data, fingerprint):
+    """
+    데이터 영역 전체를 zip 방식으로 저장한 직후 호출: xlsx를 다시 파싱하지 않고 저장한 행으로 시트 데이터를 만들어
+    새 지문으로 캐시와 스냅숏에 넣습니다. 수식, 실수, 날짜처럼 다시 읽은 값을 알 수 없는 값이 있거나
+    데이터가 헤더보다 넓으면 False를 반환합니다. (이때는 refresh_sheet_data로 다시 파싱해야 함)
+    """
+    columns = data_columns(data)
+    if len(columns) > len(headers):
+        return False
+    try:
+        rows = [tuple(_saved_value(row.get(column)) for column in columns) for row in data]
+    except ValueError:
+        return False
+
+    # 파싱할 때와 같은 _SheetScanner로 빈 행 제외, 행 위치, 진행도 통계를 계산
+    scanner = _SheetScanner(tuple(headers))
+    for sheet_row, values in enumerate(rows, get_header_row(column_line) + 1):
+        scanner.add(sheet_row, values)
+    sheet_data = scanner.finish(column_line).sheet_data
+    _cache.put(_make_key(file_path, fingerprint, column_line, False), sheet_data)
+    save_snapshot(file_path, sheet_data, fingerprint)
+    return True
+
+
+def invalidate_sheet_data(file_path):
+    _cache.invalidate(os.path.abspath(file_path))
+
+
+def cache_stats():
+    return _cache.stats()
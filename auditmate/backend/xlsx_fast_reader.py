@@ -0,0 +1,295 @@
+"""
+openpyxl 없이 xlsx(zip) 안의 시트 XML을 직접 읽는 빠른 값 리더 (XLSX_READER_BACKEND = "fast")
+
+openpyxl 읽기 전용 모드도 셀마다 dict와 셀 정보를 만들고 워크북을 열 때 스타일 전체를 객체로 만들지만,
+여기서는 workbook.xml과 관계(rels)로 시트 파일을 찾고, 공유 문자열(sharedStrings)과
+날짜 서식 번호만 한 번 읽은 뒤 해당 시트 XML 하나만 iterparse로 훑어 행 값 튜플을 만듭니다.
+
+iter_rows(values_only=True)의 결과(값 변환, 행 길이, 빠진 행을 빈 행으로 채우는 방식)는
+openpyxl의 read_only + reset_dimensions 결과와 같도록 맞춰져 있습니다. (benchmarks.conformance 참고)
+패키지 구조가 예상과 달라 읽을 수 없으면 UnsupportedWorkbook을 발생시키며, 이때 호출하는 쪽은 openpyxl로 다시 읽습니다.
+"""
+import zipfile
+import posixpath
+from xml.etree.ElementTree import iterparse, fromstring, ParseError
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ROW_TAG = f"{MAIN_NS}row"
+VALUE_TAG = f"{MAIN_NS}v"
+TEXT_TAG = f"{MAIN_NS}t"
+RICH_TEXT_TAG = f"{MAIN_NS}r"
+INLINE_STRING_TAG = f"{MAIN_NS}is"
+STRING_ITEM_TAG = f"{MAIN_NS}si"
+
+DIGITS = "0123456789"
+
+
+class UnsupportedWorkbook(Exception):
+    pass
+
+
+def _read_xml(archive, path):
+    try:
+        return fromstring(archive.read(path))
+    except (KeyError, ParseError) as e:
+        raise UnsupportedWorkbook(f"{path}: {e}")
+
+
+def rels_path_for(part_path):
+    folder, name = posixpath.split(part_path)
+    return posixpath.join(folder, "_rels", f"{name}.rels")
+
+
+def _read_rels(archive, part_path):
+    """
+    part_path의 관계 파일을 읽어 {관계 id: (형식, 대상 경로)}를 반환합니다.
+    """
+    folder = posixpath.dirname(part_path)
+    rels_path = rels_path_for(part_path)
+    if rels_path not in archive.namelist():
+        return {}
+    rels = {}
+    for rel in _read_xml(archive, rels_path).iter(f"{PACKAGE_REL_NS}Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External":
+            continue
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type", ""), target)
+    return rels
+
+
+def rel_target(rels, type_suffix):
+    return next((target for rel_type, target in rels.values() if rel_type.endswith(type_suffix)), None)
+
+
+def _text_content(node):
+    """
+    <si>/<is> 요소의 서식 없는 문자열 (openpyxl Text.content와 같음, 윗주(rPh)는 제외)
+    """
+    snippets = []
+    for child in node:
+        if child.tag == TEXT_TAG:
+            if child.text:
+                snippets.append(child.text)
+        elif child.tag == RICH_TEXT_TAG:
+            text = child.findtext(TEXT_TAG)
+            if text:
+                snippets.append(text)
+    return "".join(snippets)
+
+
+def read_shared_strings(archive, path):
+    if not path or path not in archive.namelist():
+        return []
+    strings = []
+    try:
+        with archive.open(path) as src:
+            for _, node in iterparse(src):
+                if node.tag == STRING_ITEM_TAG:
+                    strings.append(_text_content(node).replace("x005F_", ""))
+                    node.clear()
+    except ParseError as e:
+        raise UnsupportedWorkbook(f"{path}: {e}")
+    return strings
+
+
+def read_date_styles(archive, path):
+    """
+    날짜/시간 서식이 지정된 셀 스타일 번호 집합과 그중 경과 시간 서식([h]:mm 등)인 번호 집합
+    """
+    date_styles, timedelta_styles = set(), set()
+    if not path or path not in archive.namelist():
+        return date_styles, timedelta_styles
+    root = _read_xml(archive, path)
+    custom = {
+        int(num_fmt.get("numFmtId")): num_fmt.get("formatCode")
+        for num_fmt in root.iterfind(f"{MAIN_NS}numFmts/{MAIN_NS}numFmt")
+    }
+    for idx, xf in enumerate(root.iterfind(f"{MAIN_NS}cellXfs/{MAIN_NS}xf")):
+        num_fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[num_fmt_id] if num_fmt_id in custom else BUILTIN_FORMATS.get(num_fmt_id)
+        if is_date_format(fmt):
+            date_styles.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_styles.add(idx)
+    return date_styles, timedelta_styles
+
+
+class FastWorkbook:
+    """
+    xlsx 패키지에서 시트 목록과 값 변환에 필요한 정보만 읽은 워크북
+    """
+
+    def __init__(self, file_path):
+        self.archive = zipfile.ZipFile(file_path)
+        try:
+            self.workbook_path = rel_target(_read_rels(self.archive, ""), "/officeDocument") or "xl/workbook.xml"
+            workbook_root = _read_xml(self.archive, self.workbook_path)
+            self.rels = _read_rels(self.archive, self.workbook_path)
+
+            workbook_pr = workbook_root.find(f"{MAIN_NS}workbookPr")
+            date1904 = workbook_pr is not None and workbook_pr.get("date1904", "").lower() in ("1", "true")
+            self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+            # {시트 이름: 시트 XML 경로} (workbook.xml의 순서 유지)
+            self.sheet_paths = {}
+            for sheet in workbook_root.iterfind(f"{MAIN_NS}sheets/{MAIN_NS}sheet"):
+                rel = self.rels.get(sheet.get(f"{REL_NS}id"))
+                if rel is None:
+                    raise UnsupportedWorkbook(f"시트 관계를 찾을 수 없습니다: {sheet.get('name')}")
+                self.sheet_paths[sheet.get("name")] = rel[1]
+            self._shared_strings = None
+            self._date_styles = None
+        except Exception:
+            self.archive.close()
+            raise
+
+    @property
+    def sheetnames(self):
+        return list(self.sheet_paths)
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = read_shared_strings(self.archive, rel_target(self.rels, "/sharedStrings"))
+        return self._shared_strings
+
+    @property
+    def date_styles(self):
+        if self._date_styles is None:
+            self._date_styles = read_date_styles(self.archive, rel_target(self.rels, "/styles"))
+        return self._date_styles
+
+    def __getitem__(self, name):
+        return FastWorksheet(self, name, self.sheet_paths[name])
+
+    def close(self):
+        self.archive.close()
+
+
+class FastWorksheet:
+    """
+    시트 하나의 값 리더 (openpyxl 읽기 전용 워크시트의 iter_rows(values_only=True)와 title만 제공)
+    """
+
+    def __init__(self, workbook, title, path):
+        self.parent = workbook
+        self.title = title
+        self.path = path
+        if path not in workbook.archive.namelist():
+            raise UnsupportedWorkbook(f"시트 파일이 없습니다: {path}")
+        # 패키지 문제는 행을 읽는 도중이 아니라 시트를 열 때 드러나도록 공유 문자열과 서식을 미리 읽음
+        self.shared_strings = workbook.shared_strings
+        self.date_styles, self.timedelta_styles = workbook.date_styles
+
+    def reset_dimensions(self):
+        # dimension 정보는 처음부터 사용하지 않음 (openpyxl 워크시트와 같은 인터페이스 유지용)
+        pass
+
+    def iter_rows(self, min_row=1, max_row=None, values_only=True):
+        """
+        min_row~max_row 행의 값 튜플을 반환합니다.
+        시트 XML에 없는 중간 행은 openpyxl처럼 빈 리스트로, 셀이 없는 행은 빈 튜플로 채웁니다.
+        """
+        if not values_only:
+            raise ValueError("FastWorksheet는 values_only=True만 지원합니다")
+        counter = min_row
+        idx = 1
+        for idx, row in self._parse_rows(min_row, max_row):
+            if max_row is not None and idx > max_row:
+                break
+            while counter < idx:
+                counter += 1
+                yield []
+            if counter <= idx:
+                counter += 1
+                yield row
+        if max_row is not None and max_row < idx:
+            while counter <= max_row:
+                counter += 1
+                yield []
+
+    def _parse_rows(self, min_row, max_row):
+        shared_strings = self.shared_strings
+        date_styles, timedelta_styles = self.date_styles, self.timedelta_styles
+        epoch = self.parent.epoch
+        column_cache = {}
+        row_counter = 0
+
+        with self.parent.archive.open(self.path) as src:
+            for _, element in iterparse(src):
+                if element.tag != ROW_TAG:
+                    continue
+
+                row_attr = element.get("r")
+                if row_attr is not None:
+                    try:
+                        row_counter = int(row_attr)
+                    except ValueError:
+                        row_counter = int(float(row_attr))
+                else:
+                    row_counter += 1
+
+                # min_row 이전 행은 셀을 해석하지 않고, max_row 다음 행을 만나면 더 읽지 않음
+                if row_counter < min_row:
+                    element.clear()
+                    continue
+                if max_row is not None and row_counter > max_row:
+                    yield row_counter, ()
+                    return
+
+                values = []
+                col_counter = 0
+                for cell in element:
+                    coordinate = cell.get("r")
+                    if coordinate:
+                        letters = coordinate.rstrip(DIGITS)
+                        col_counter = column_cache.get(letters)
+                        if col_counter is None:
+                            col_counter = column_cache[letters] = column_index_from_string(letters)
+                    else:
+                        col_counter += 1
+
+                    data_type = cell.get("t", "n")
+                    if data_type == "inlineStr":
+                        child = cell.find(INLINE_STRING_TAG)
+                        value = _text_content(child) if child is not None else None
+                    else:
+                        value = cell.findtext(VALUE_TAG) or None
+                        if value is not None:
+                            if data_type == "n":
+                                value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                                style_id = int(cell.get("s", 0))
+                                if style_id in date_styles:
+                                    try:
+                                        value = from_excel(value, epoch, timedelta=style_id in timedelta_styles)
+                                    except (OverflowError, ValueError):
+                                        value = "#VALUE!"
+                            elif data_type == "s":
+                                value = shared_strings[int(value)]
+                            elif data_type == "b":
+                                value = bool(int(value))
+                            elif data_type == "d":
+                                value = from_ISO8601(value)
+
+                    # 행 길이는 마지막 셀의 열 번호 (openpyxl과 같음)
+                    width = len(values)
+                    if col_counter > width:
+                        if col_counter > width + 1:
+                            values.extend([None] * (col_counter - width - 1))
+                        values.append(value)
+                    elif col_counter >= 1:
+                        values[col_counter - 1] = value
+                del values[col_counter:]
+                element.clear()
+                yield row_counter, tuple(values)
@@ -0,0 +1,207 @@
+"""
+읽기 전용(read_only) 모드로 워크북을 열어 행 단위로 값을 스트리밍하는 공용 리더
+
+셀 객체를 만들지 않고 iter_rows(values_only=True)로 값 튜플만 읽기 때문에
+메모리 사용량이 시트 크기가 아닌 한 행 크기에 비례합니다.
+
+워크북을 여는 방식(리더 백엔드)은 XLSX_READER_BACKEND 설정으로 고릅니다.
+    fast      시트 XML을 직접 iterparse하는 xlsx_fast_reader (기본값, openpyxl과 같은 값 튜플을 더 빠르게 만듦)
+    openpyxl  openpyxl 읽기 전용 모드 (fast 리더가 읽을 수 없는 파일도 이 리더로 다시 엶)
+백엔드는 sheetnames, [시트 이름], close()를 가진 워크북을 반환하고, 워크북의 시트는
+title과 iter_rows(min_row=, max_row=, values_only=True)를 제공하면 됩니다.
+"""
+from itertools import repeat
+from contextlib import contextmanager
+
+import openpyxl
+from django.conf import settings
+
+from .constants import WORKSHEET_NAME, PROGRESS_COLUMN, COMMON_HEADER_COLUMNS
+from .instrumentation import span, timed
+from .xlsx_fast_reader import FastWorkbook, UnsupportedWorkbook
+
+# 헤더 탐지 시 검사할 최대 행 수
+HEADER_SCAN_ROWS = 10
+
+
+def load_openpyxl_workbook(file_path):
+    return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+
+
+READER_BACKENDS = {
+    "openpyxl": load_openpyxl_workbook,
+    "fast": FastWorkbook,
+}
+
+
+def reader_backend():
+    backend = getattr(settings, "XLSX_READER_BACKEND", "fast")
+    return backend if backend in READER_BACKENDS else "fast"
+
+
+def _select_worksheet(workbook, sheet_name, fallback_first):
+    if sheet_name in workbook.sheetnames:
+        return workbook[sheet_name]
+    if fallback_first and workbook.sheetnames:
+        return workbook[workbook.sheetnames[0]]
+    return None
+
+
+def _open_workbook_sheet(file_path, backend, sheet_name, fallback_first):
+    workbook = READER_BACKENDS[backend](file_path)
+    try:
+        return workbook, _select_worksheet(workbook, sheet_name, fallback_first)
+    except Exception:
+        workbook.close()
+        raise
+
+
+@contextmanager
+def open_worksheet(file_path, sheet_name=WORKSHEET_NAME, fallback_first=False, backend=None):
+    """
+    워크북을 읽기 전용으로 열고 지정한 시트를 반환합니다.
+    시트가 없으면 None을 반환하며, fallback_first=True이면 첫 번째 시트를 대신 사용합니다.
+    backend를 지정하지 않으면 XLSX_READER_BACKEND 설정의 리더를 사용하고,
+    fast 리더가 읽을 수 없는 구조의 파일이면 openpyxl로 다시 엽니다.
+    블록을 벗어나면 워크북 파일 핸들을 닫습니다.
+    """
+    backend = backend or reader_backend()
+    with span("workbook_load"):
+        try:
+            workbook, worksheet = _open_workbook_sheet(file_path, backend, sheet_name, fallback_first)
+        except UnsupportedWorkbook as e:
+            print(f"fast 리더로 읽을 수 없어 openpyxl로 엽니다 ({file_path}): {e}")
+            workbook, worksheet = _open_workbook_sheet(file_path, "openpyxl", sheet_name, fallback_first)
+    try:
+        # 파일에 기록된 dimension 정보는 서식만 있는 빈 셀 때문에 부풀려져 있거나
+        # 누락된 경우가 많으므로 무시하고 실제로 존재하는 셀만 읽습니다.
+        if worksheet is not None and hasattr(worksheet, "reset_dimensions"):
+            worksheet.reset_dimensions()
+
+        yield worksheet
+    finally:
+        workbook.close()
+
+
+def get_header_row(column_line):
+    """
+    columnLine(0-based)을 openpyxl 행 번호(1-based)로 변환합니다.
+    """
+    return column_line + 1 if column_line >= 0 else 1
+
+
+def has_value(value):
+    """
+    셀 값이 비어있지 않은지 확인합니다.
+    """
+    return value is not None and str(value).strip() != ""
+
+
+def is_empty_row(row):
+    """
+    행의 모든 값이 None인지 확인합니다. (서식만 있는 열이 수천 개인 행도 C 수준에서 한 번에 검사)
+    """
+    return row.count(None) == len(row)
+
+
+def iter_row_values(worksheet, min_row=1, max_row=None):
+    """
+    min_row부터 행 값 튜플을 순서대로 반환합니다.
+    값이 없는 행은 뒤에 값이 있는 행이 나올 때 빈 튜플로 반환하므로 (행 번호는 그대로 유지)
+    시트 끝쪽의 서식만 남은 빈 행은 반환하지 않습니다.
+    """
+    empty_run = 0
+    for row in worksheet.iter_rows(min_row=min_row, max_row=max_row, values_only=True):
+        if is_empty_row(row):
+            empty_run += 1
+            continue
+        if empty_run:
+            yield from repeat((), empty_run)
+            empty_run = 0
+        yield row
+
+
+def build_headers(header_values):
+    """
+    헤더 행의 값으로 컬럼명 목록을 만듭니다. 빈 헤더는 Column_{n}으로 채웁니다.
+    """
+    headers = []
+    for col_idx, cell_value in enumerate(header_values, 1):
+        if cell_value is not None:
+            headers.append(str(cell_value).strip())
+        else:
+            headers.append(f"Column_{col_idx}")
+    return headers
+
+
+def is_header_row(row):
+    """
+    공통 컬럼이 3개 이상 정확히 일치하면 헤더 행으로 판단합니다.
+    """
+    row_values = [str(cell_value).strip() for cell_value in row if cell_value is not None]
+    matches = [col for col in COMMON_HEADER_COLUMNS if col in row_values]
+    return len(matches) >= 3
+
+
+@timed("progress_calc")
+def scan_progress(worksheet, column_line):
+    """
+    '검토사항' 열을 기준으로 진행도와 그 계산에 쓰인 통계를 함께 반환합니다.
+    totalRows: 값이 있는 데이터 행 수, lastFilledRow: 검토사항이 채워진 마지막 행의 순번(1-based)
+    """
+    review_col_idx = None
+    total_rows = 0
+    last_filled_row = 0
+
+    for row_number, row in enumerate(iter_row_values(worksheet, min_row=get_header_row(column_line))):
+        if row_number == 0:
+            # '검토사항' 컬럼 찾기
+            for col_idx, cell_value in enumerate(row):
+                if cell_value and str(cell_value).strip() == PROGRESS_COLUMN:
+                    review_col_idx = col_idx
+                    break
+            if review_col_idx is None:
+                break  # '검토사항' 컬럼이 없으면 0% 반환
+            continue
+
+        # 해당 행에 데이터가 있는지 확인 (모든 컬럼 체크)
+        if any(has_value(cell_value) for cell_value in row):
+            total_rows += 1
+            # '검토사항' 컬럼에 값이 있는지 확인
+            if review_col_idx < len(row) and has_value(row[review_col_idx]):
+                last_filled_row = total_rows
+
+    return {
+        "progress": compute_progress(last_filled_row, total_rows),
+        "totalRows": total_rows,
+        "lastFilledRow": last_filled_row,
+    }
+
+
+@timed("progress_calc")
+def progress_from_rows(rows):
+    """
+    {헤더: 값} dict 목록에서 scan_progress와 같은 방식으로 진행도와 통계를 계산합니다.
+    """
+    total_rows = 0
+    last_filled_row = 0
+    for row in rows:
+        if any(has_value(cell_value) for cell_value in row.values()):
+            total_rows += 1
+            if has_value(row.get(PROGRESS_COLUMN)):
+                last_filled_row = total_rows
+
+    return {
+        "progress": compute_progress(last_filled_row, total_rows),
+        "totalRows": total_rows,
+        "lastFilledRow": last_filled_row,
+    }
+
+
+def compute_progress(last_filled_row, total_rows):
+    """
+    진행도 = 마지막으로 채워진 행의 인덱스 / 전체 행 수 * 100
+    """
+    if total_rows == 0:
+        return 0
+    return round(last_filled_row * 100 / total_rows, 2)
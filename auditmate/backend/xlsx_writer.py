@@ -0,0 +1,240 @@
+"""
+집행내역 시트에 전체 데이터 또는 셀 단위 변경사항(patch)을 기록하는 함수들
+
+데이터 영역 전체 교체 저장(save_data_rows)은 XLSX_WRITER_BACKEND 설정으로 방식을 고릅니다.
+    zip       집행내역 시트 XML만 다시 만들고 나머지 zip 항목은 그대로 복사 (기본값, xlsx_zip_writer)
+    openpyxl  워크북 전체를 읽어 rewrite_data_rows로 바꾼 뒤 다시 저장 (zip 방식으로 쓸 수 없는 파일도 이 방식으로 저장)
+"""
+import os
+
+import openpyxl
+import pandas as pd
+from django.conf import settings
+
+from .constants import PROGRESS_COLUMN, CORE_COLUMNS, WORKSHEET_NAME
+from .instrumentation import span, timed
+from .folder_lock import temp_path_for, replace_file
+from .xlsx_reader import get_header_row, has_value, compute_progress, scan_progress, iter_row_values
+from .xlsx_fast_reader import UnsupportedWorkbook
+from .xlsx_zip_writer import write_data_rows
+
+WRITER_BACKENDS = ("openpyxl", "zip")
+
+
+def normalize_review_value(review):
+    """
+    검토사항 값을 저장 형식(쉼표로 구분된 문자열)으로 변환합니다. 빈값은 빈 문자열로 저장합니다.
+    """
+    if not review or (isinstance(review, list) and len(review) == 0):
+        return ""
+    if isinstance(review, list):
+        return ", ".join(str(x) for x in review)
+    return str(review)
+
+
+def rewrite_data_rows(worksheet, column_line, data):
+    """
+    기존 파일 구조(헤더 위 영역)는 유지하면서 헤더 아래 데이터 영역 전체를 data로 교체합니다.
+    """
+    df = pd.DataFrame(data)
+
+    # 기존 데이터 영역 삭제 (헤더 아래부터)
+    max_row = worksheet.max_row
+    if max_row > column_line + 1:
+        worksheet.delete_rows(column_line + 2, max_row - column_line - 1)
+
+    # 새 데이터 입력 (헤더 다음 행부터)
+    for row_idx, (_, row_data) in enumerate(df.iterrows()):
+        for col_idx, value in enumerate(row_data):
+            worksheet.cell(
+                row=column_line + 2 + row_idx,
+                column=col_idx + 1,
+                value=value
+            )
+
+
+def writer_backend():
+    backend = getattr(settings, "XLSX_WRITER_BACKEND", "zip")
+    return backend if backend in WRITER_BACKENDS else "zip"
+
+
+def _save_data_rows_openpyxl(file_path, dest_path, column_line, data):
+    with span("workbook_load"):
+        workbook = openpyxl.load_workbook(file_path)
+    if WORKSHEET_NAME not in workbook.sheetnames:
+        return False
+    rewrite_data_rows(workbook[WORKSHEET_NAME], column_line, data)
+    with span("workbook_save"):
+        workbook.save(dest_path)
+    return True
+
+
+def save_data_rows(file_path, column_line, data, dest_path=None):
+    """
+    집행내역 시트의 데이터 영역 전체를 data로 바꿔 저장하고 저장한 방식("zip" 또는 "openpyxl")을 반환합니다.
+    시트가 없으면 False를 반환합니다.
+    dest_path를 지정하면 그 경로에 쓰고, 지정하지 않으면 임시 파일에 쓴 뒤 file_path를 교체합니다.
+    zip 방식으로 쓸 수 없는 파일이면 openpyxl로 저장합니다.
+    """
+    target_path = dest_path or temp_path_for(file_path)
+    try:
+        written = backend = None
+        if writer_backend() == "zip":
+            try:
+                with span("workbook_save"):
+                    written = write_data_rows(file_path, target_path, column_line, data)
+                backend = "zip"
+            except UnsupportedWorkbook as e:
+                print(f"zip 방식으로 저장할 수 없어 openpyxl로 저장합니다 ({file_path}): {e}")
+        if written is None:
+            written = _save_data_rows_openpyxl(file_path, target_path, column_line, data)
+            backend = "openpyxl"
+        if not written:
+            return False
+        if dest_path is None:
+            replace_file(target_path, file_path)
+        return backend
+    finally:
+        if dest_path is None and os.path.exists(target_path):
+            os.remove(target_path)
+
+
+def data_row_positions(worksheet, column_line, width):
+    """
+    메모리에 로드된 시트에서 비어있지 않은 데이터 행의 시트 행 번호 목록을 만듭니다.
+    """
+    header_row = get_header_row(column_line)
+    positions = []
+    # 읽기(SheetData)와 같은 iter_row_values를 써야 행 순번이 일치함
+    for sheet_row, row in enumerate(iter_row_values(worksheet, min_row=header_row + 1), header_row + 1):
+        if any(cell_value is not None for cell_value in row[:width]):
+            positions.append(sheet_row)
+    return positions
+
+
+def get_column_map(worksheet, column_line):
+    """
+    헤더 행을 읽어 {컬럼명: 열 번호(1-based)} dict를 만듭니다.
+    """
+    header_row = get_header_row(column_line)
+    column_map = {}
+    for row in worksheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True):
+        for col_idx, cell_value in enumerate(row, 1):
+            if cell_value is not None:
+                column_map.setdefault(str(cell_value).strip(), col_idx)
+            else:
+                column_map.setdefault(f"Column_{col_idx}", col_idx)
+    return column_map
+
+
+def resolve_column(worksheet, column_line, column_map, column):
+    """
+    컬럼명의 열 번호를 반환합니다.
+    시트에 없는 핵심 컬럼(검토사항, 메모, 보완사항)은 헤더 끝에 새로 만듭니다.
+    """
+    if column in column_map:
+        return column_map[column]
+    if column not in CORE_COLUMNS:
+        raise ValueError(f"알 수 없는 컬럼입니다: {column}")
+    col_idx = max(column_map.values(), default=0) + 1
+    worksheet.cell(row=get_header_row(column_line), column=col_idx, value=column)
+    column_map[column] = col_idx
+    return col_idx
+
+
+def apply_cell_changes(worksheet, column_line, sheet_rows, changes):
+    """
+    [{row_index, column, value}, ...] 변경사항을 해당 셀에만 기록합니다.
+    row_index는 read-xlsx가 반환한 데이터 행 순번(0-based)이며 sheet_rows로 시트 행 번호를 찾습니다.
+    변경된 시트 행 번호 목록을 반환합니다.
+    """
+    column_map = get_column_map(worksheet, column_line)
+    touched_rows = []
+
+    for change in changes:
+        try:
+            row_index = int(change["row_index"])
+            column = change["column"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"잘못된 변경사항 형식입니다: {change}")
+        if not 0 <= row_index < len(sheet_rows):
+            raise ValueError(f"행 번호가 범위를 벗어났습니다: {row_index}")
+
+        value = change.get("value")
+        if column == PROGRESS_COLUMN:
+            value = normalize_review_value(value)
+
+        sheet_row = sheet_rows[row_index]
+        col_idx = resolve_column(worksheet, column_line, column_map, column)
+        worksheet.cell(row=sheet_row, column=col_idx, value=value)
+        touched_rows.append(sheet_row)
+
+    return touched_rows
+
+
+def validate_changes(changes, total_rows, columns):
+    """
+    변경사항의 형식과 행 번호/컬럼명을 검사하고, 검토사항 값을 저장 형식으로 바꾼 목록을 반환합니다.
+    """
+    validated = []
+    for change in changes:
+        try:
+            row_index = int(change["row_index"])
+            column = change["column"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"잘못된 변경사항 형식입니다: {change}")
+        if not 0 <= row_index < total_rows:
+            raise ValueError(f"행 번호가 범위를 벗어났습니다: {row_index}")
+        if column not in columns and column not in CORE_COLUMNS:
+            raise ValueError(f"알 수 없는 컬럼입니다: {column}")
+
+        value = change.get("value")
+        if column == PROGRESS_COLUMN:
+            value = normalize_review_value(value)
+        validated.append({"row_index": row_index, "column": column, "value": value})
+    return validated
+
+
+def advance_progress_stats(stats, changes):
+    """
+    변경사항 중 검토사항 변경만 반영하여 진행도 통계를 증분 갱신합니다.
+    통계가 없거나 마지막으로 채워진 행이 비워져 앞쪽 행을 다시 확인해야 하면 None을 반환합니다.
+    """
+    if not stats or "totalRows" not in stats:
+        return None
+
+    total_rows = stats["totalRows"]
+    last_filled_row = stats.get("lastFilledRow", 0)
+    for change in changes:
+        if change.get("column") != PROGRESS_COLUMN:
+            continue
+        position = int(change["row_index"]) + 1
+        if has_value(normalize_review_value(change.get("value"))):
+            last_filled_row = max(last_filled_row, position)
+        elif position == last_filled_row:
+            return None
+
+    return {
+        "progress": compute_progress(last_filled_row, total_rows),
+        "totalRows": total_rows,
+        "lastFilledRow": last_filled_row,
+    }
+
+
+@timed("progress_calc")
+def update_progress_stats(worksheet, column_line, stats, changes):
+    """
+    변경사항으로 진행도 통계를 증분 갱신하고, 불가능한 경우에만 메모리에 로드된 시트를 다시 스캔합니다.
+    """
+    return advance_progress_stats(stats, changes) or scan_progress(worksheet, column_line)
+
+
+def has_emptied_rows(worksheet, sheet_rows, width):
+    """
+    변경으로 인해 모든 값이 비워진 행이 있는지 확인합니다.
+    (이 경우 데이터 행 순번이 달라지므로 행 인덱스를 다시 만들어야 합니다)
+    """
+    for sheet_row in set(sheet_rows):
+        if all(worksheet.cell(row=sheet_row, column=col_idx).value is None for col_idx in range(1, width + 1)):
+            return True
+    return False
@@ -0,0 +1,341 @@
+"""
+집행내역 시트 XML만 다시 만들어 저장하는 xlsx 쓰기 (XLSX_WRITER_BACKEND = "zip")
+
+openpyxl로 저장하면 워크북 전체(다른 시트, 스타일, 그림 등)를 읽고 다시 직렬화하므로
+꾸며진 원본 파일에서는 몇 초씩 걸리고, openpyxl이 지원하지 않는 기능은 저장할 때 사라집니다.
+여기서는 xlsx(zip)의 다른 항목을 압축된 바이트 그대로 복사하고, 집행내역 시트 XML에서
+헤더 행까지는 원본 바이트를 유지한 채 그 아래 sheetData 행만 새 데이터로 만들어 넣습니다.
+
+    - 값 변환은 openpyxl(rewrite_data_rows)과 같음: 숫자는 %.16g, "="로 시작하는 문자열은 수식,
+      오류 코드는 오류 값, 나머지 문자열은 인라인 문자열(sharedStrings.xml은 건드리지 않음), 빈값은 셀을 쓰지 않음
+    - 데이터 행에 있던 수식이 사라지므로 calcChain.xml은 빼고(관계/콘텐츠 형식 포함) 열 때 다시 계산하도록 표시
+    - 날짜 값처럼 셀 서식이 필요한 값이나 접두사 네임스페이스를 쓰는 시트는 UnsupportedWorkbook을 발생시키며,
+      이때 호출하는 쪽은 openpyxl로 저장합니다.
+
+write_sheet_values는 시트 하나를 값 행만 담은 새 시트 XML로 통째로 바꿉니다. (no_review 내보내기)
+새 시트에는 셀 서식이 없으므로 날짜 값에 쓸 기본 날짜 서식 스타일을 styles.xml 끝에 추가합니다.
+"""
+import re
+import math
+import time
+import struct
+import zipfile
+import datetime
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE, ERROR_CODES
+from openpyxl.utils.cell import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from openpyxl.utils.exceptions import IllegalCharacterError
+
+from .constants import WORKSHEET_NAME
+from .xlsx_fast_reader import FastWorkbook, UnsupportedWorkbook, rel_target, rels_path_for
+
+CONTENT_TYPES_PATH = "[Content_Types].xml"
+
+ROOT_TAG_RE = re.compile(rb"<([\w.-]+:)?worksheet\b")
+SHEET_DATA_RE = re.compile(rb"<sheetData\b[^>]*?(/?)>")
+SHEET_DATA_END = b"</sheetData>"
+ROW_TAG_RE = re.compile(rb"<row\b([^>]*)>")
+ROW_NUMBER_RE = re.compile(rb"""\br=["'](\d+)["']""")
+CELL_REF_RE = re.compile(rb"""<c\b[^>]*?\br=["']([A-Z]+)(\d+)["']""")
+DIMENSION_RE = re.compile(rb"<dimension\b[^>]*/>")
+CALC_PR_RE = re.compile(rb"<calcPr\b([^>]*?)(/?)>")
+CELL_XFS_RE = re.compile(rb"<cellXfs\b[^>]*?(/?)>")
+CELL_XFS_END = b"</cellXfs>"
+XF_RE = re.compile(rb"<xf\b")
+COUNT_RE = re.compile(rb"""\bcount=["']\d+["']""")
+
+# 새 시트의 날짜/시간 값에 쓸 기본 제공 서식 번호 (datetime은 date의 하위 클래스이므로 먼저 확인)
+DATE_NUMBER_FORMATS = (
+    (datetime.datetime, 22),  # m/d/yy h:mm
+    (datetime.date, 14),  # m/d/yy
+    (datetime.time, 21),  # h:mm:ss
+    (datetime.timedelta, 46),  # [h]:mm:ss
+)
+SHEET_XML_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    b'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheetData>'
+)
+SHEET_XML_TAIL = b"</sheetData></worksheet>"
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class DateStyles:
+    """
+    styles.xml에 추가한 날짜 서식 스타일 번호와 워크북의 날짜 기준(1900/1904)
+    """
+
+    def __init__(self, epoch, style_ids):
+        self.epoch = epoch
+        self.style_ids = style_ids
+
+    def cell_xml(self, ref, value):
+        style_id = next(style_id for value_type, style_id in self.style_ids if isinstance(value, value_type))
+        return f'<c r="{ref}" s="{style_id}"><v>{"%.16g" % to_excel(value, self.epoch)}</v></c>'
+
+
+def _cell_xml(ref, value, date_styles=None):
+    """
+    셀 하나의 XML (쓸 값이 없으면 None)
+    날짜 값은 date_styles(DateStyles)가 있을 때만 쓸 수 있습니다.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return f'<c r="{ref}"><v>{"%.16g" % value}</v></c>'
+    if isinstance(value, str):
+        if ILLEGAL_CHARACTERS_RE.search(value):
+            raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+        if not value:
+            return None
+        if len(value) > 1 and value.startswith("="):
+            return f'<c r="{ref}"><f>{escape(value[1:])}</f></c>'
+        if value in ERROR_CODES:
+            return f'<c r="{ref}" t="e"><v>{value}</v></c>'
+        stripped = value.strip()
+        space = ' xml:space="preserve"' if stripped and stripped != value else ""
+        return f'<c r="{ref}" t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        if date_styles is None:
+            raise UnsupportedWorkbook("날짜 값은 셀 서식이 필요합니다")
+        return date_styles.cell_xml(ref, value)
+    raise ValueError(f"Cannot convert {value!r} to Excel")
+
+
+def data_columns(data):
+    """
+    데이터 dict 목록의 컬럼 순서 (pd.DataFrame(data)와 같이 처음 나온 순서)
+    """
+    return list(dict.fromkeys(key for row in data for key in row))
+
+
+def build_data_rows(data, first_row):
+    """
+    first_row 행부터 data를 기록하는 <row> XML 조각과 (마지막 행 번호, 마지막 열 번호)를 반환합니다.
+    """
+    columns = data_columns(data)
+    letters = [get_column_letter(col_idx) for col_idx in range(1, len(columns) + 1)]
+    parts = []
+    last_row = last_col = 0
+    for row_number, row in enumerate(data, first_row):
+        cells = []
+        for col_idx, column in enumerate(columns):
+            cell = _cell_xml(f"{letters[col_idx]}{row_number}", row.get(column))
+            if cell is not None:
+                cells.append(cell)
+                last_col = max(last_col, col_idx + 1)
+        if cells:
+            parts.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+            last_row = row_number
+    return "".join(parts).encode("utf-8"), last_row, last_col
+
+
+def rewrite_sheet_xml(sheet_xml, first_row, data):
+    """
+    시트 XML에서 first_row 이전 행은 그대로 두고 그 뒤 행을 data로 바꾼 XML을 반환합니다.
+    """
+    root = ROOT_TAG_RE.search(sheet_xml)
+    if root is None or root.group(1):
+        raise UnsupportedWorkbook("접두사 네임스페이스를 쓰는 시트입니다")
+    match = SHEET_DATA_RE.search(sheet_xml, root.end())
+    if match is None:
+        raise UnsupportedWorkbook("sheetData가 없는 시트입니다")
+
+    head = sheet_xml[:match.start()]
+    if match.group(1):
+        kept, tail = b"", sheet_xml[match.end():]
+    else:
+        end = sheet_xml.rfind(SHEET_DATA_END)
+        if end < match.end():
+            raise UnsupportedWorkbook("sheetData가 닫히지 않았습니다")
+        rows = sheet_xml[match.end():end]
+        tail = sheet_xml[end + len(SHEET_DATA_END):]
+
+        # first_row 이전 행(헤더 위 제목 행과 헤더)까지만 원본 바이트 그대로 유지
+        cut = len(rows)
+        row_counter = 0
+        for row_match in ROW_TAG_RE.finditer(rows):
+            number = ROW_NUMBER_RE.search(row_match.group(1))
+            row_counter = int(number.group(1)) if number else row_counter + 1
+            if row_counter >= first_row:
+                cut = row_match.start()
+                break
+        kept = rows[:cut]
+
+    new_rows, last_row, last_col = build_data_rows(data, first_row)
+    for letters, number in CELL_REF_RE.findall(kept):
+        last_row = max(last_row, int(number))
+        last_col = max(last_col, _column_index(letters))
+    if last_row and last_col:
+        dimension = f'<dimension ref="A1:{get_column_letter(last_col)}{last_row}"/>'.encode()
+        head = DIMENSION_RE.sub(dimension, head, count=1)
+
+    return b"".join((head, b"<sheetData>", kept, new_rows, SHEET_DATA_END, tail))
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + letter - 64
+    return index
+
+
+def _without_calc_chain(part_path, content, calc_chain_path, workbook_path):
+    """
+    calcChain.xml을 뺄 때 함께 고쳐야 하는 항목의 새 내용 (고칠 필요가 없으면 None)
+    """
+    if part_path == CONTENT_TYPES_PATH:
+        return re.sub(
+            rb"""<Override\b[^>]*PartName=["']/""" + re.escape(calc_chain_path.encode()) + rb"""["'][^>]*/>""",
+            b"", content,
+        )
+    if part_path == rels_path_for(workbook_path):
+        return re.sub(rb"<Relationship\b[^>]*/calcChain[\"'][^>]*/>", b"", content)
+    if part_path == workbook_path:
+        # 다른 시트의 수식 캐시 값이 오래되었으므로 Excel이 열 때 전체 다시 계산
+        def full_calc(match):
+            attrs = match.group(1)
+            if b"fullCalcOnLoad" not in attrs:
+                attrs += b' fullCalcOnLoad="1"'
+            return b"<calcPr" + attrs + match.group(2) + b">"
+        return CALC_PR_RE.sub(full_calc, content, count=1)
+    return None
+
+
+def _copy_member(source, info, target):
+    """
+    zip 항목을 압축을 풀지 않고 압축된 바이트 그대로 target에 복사합니다.
+    """
+    source.seek(info.header_offset)
+    fields = struct.unpack(zipfile.structFileHeader, source.read(zipfile.sizeFileHeader))
+    source.seek(fields[10] + fields[11], 1)  # 파일 이름, extra 필드 건너뛰기
+
+    copied = zipfile.ZipInfo(info.filename, info.date_time)
+    copied.compress_type = info.compress_type
+    copied.CRC = info.CRC
+    copied.compress_size = info.compress_size
+    copied.file_size = info.file_size
+    copied.external_attr = info.external_attr
+    copied.header_offset = target.fp.tell()
+    target.fp.write(copied.FileHeader())
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = source.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise zipfile.BadZipFile(f"잘린 zip 항목입니다: {info.filename}")
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+    target.filelist.append(copied)
+    target.NameToInfo[copied.filename] = copied
+    target.start_dir = target.fp.tell()
+
+
+def write_data_rows(src_path, dest_path, column_line, data, sheet_name=WORKSHEET_NAME):
+    """
+    src_path의 sheet_name 시트 데이터 영역(헤더 아래) 전체를 data로 바꾼 xlsx를 dest_path에 씁니다.
+    시트가 없으면 False를 반환합니다. (rewrite_data_rows + save와 같은 결과)
+    """
+    workbook = FastWorkbook(src_path)
+    try:
+        if sheet_name not in workbook.sheet_paths:
+            return False
+        sheet_path = workbook.sheet_paths[sheet_name]
+        sheet_xml = rewrite_sheet_xml(workbook.archive.read(sheet_path), column_line + 2, data)
+
+        with open(src_path, "rb") as source, zipfile.ZipFile(dest_path, "w") as target:
+            _copy_members(workbook, source, target, {sheet_path: sheet_xml})
+        return True
+    finally:
+        workbook.close()
+
+
+def _copy_members(workbook, source, target, replaced, skipped=()):
+    """
+    원본 zip 항목을 target에 복사합니다. replaced의 항목은 새 내용으로 쓰고 skipped의 항목은 뺍니다.
+    calcChain.xml은 빼고 관계/콘텐츠 형식/calcPr을 함께 고칩니다.
+    """
+    calc_chain_path = rel_target(workbook.rels, "/calcChain")
+    for info in workbook.archive.infolist():
+        if info.filename == calc_chain_path or info.filename in skipped:
+            continue
+        content = replaced.get(info.filename)
+        if content is None and calc_chain_path:
+            content = _without_calc_chain(
+                info.filename, workbook.archive.read(info.filename), calc_chain_path, workbook.workbook_path,
+            )
+        if content is not None:
+            target.writestr(info.filename, content, zipfile.ZIP_DEFLATED)
+        else:
+            _copy_member(source, info, target)
+
+
+def add_date_styles(styles_xml, epoch):
+    """
+    styles.xml의 cellXfs 끝에 DATE_NUMBER_FORMATS 스타일을 추가하고 (새 styles.xml, DateStyles)를 반환합니다.
+    """
+    start = CELL_XFS_RE.search(styles_xml)
+    end = styles_xml.find(CELL_XFS_END, start.end()) if start is not None else -1
+    if start is None or start.group(1) or end < 0:
+        raise UnsupportedWorkbook("styles.xml의 cellXfs를 찾을 수 없습니다")
+
+    first_id = len(XF_RE.findall(styles_xml, start.end(), end))
+    count = f'count="{first_id + len(DATE_NUMBER_FORMATS)}"'.encode()
+    open_tag = start.group(0)
+    open_tag = COUNT_RE.sub(count, open_tag) if COUNT_RE.search(open_tag) else open_tag[:-1] + b" " + count + b">"
+    new_xfs = "".join(
+        f'<xf numFmtId="{num_fmt_id}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        for _, num_fmt_id in DATE_NUMBER_FORMATS
+    ).encode()
+    styles_xml = b"".join((styles_xml[:start.start()], open_tag, styles_xml[start.end():end], new_xfs, styles_xml[end:]))
+    style_ids = [(value_type, first_id + idx) for idx, (value_type, _) in enumerate(DATE_NUMBER_FORMATS)]
+    return styles_xml, DateStyles(epoch, style_ids)
+
+
+def write_sheet_values(src_path, dest_path, rows, sheet_name=WORKSHEET_NAME):
+    """
+    src_path의 sheet_name 시트를 rows(1행부터의 값 튜플)만 담은 새 시트로 바꾼 xlsx를 dest_path에 씁니다.
+    시트가 없으면 False를 반환합니다. 다른 시트, 스타일, 그림 등 나머지 항목은 원본 그대로 복사하며,
+    새 시트에는 셀 서식 없이 값과 수식만 들어갑니다. (원본 시트의 관계(그림, 메모 등)는 빠짐)
+    rows는 한 번만 순서대로 읽으므로 시트 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    workbook = FastWorkbook(src_path)
+    try:
+        if sheet_name not in workbook.sheet_paths:
+            return False
+        sheet_path = workbook.sheet_paths[sheet_name]
+        styles_path = rel_target(workbook.rels, "/styles")
+        if not styles_path or styles_path not in workbook.archive.namelist():
+            raise UnsupportedWorkbook("styles.xml이 없습니다")
+        styles_xml, date_styles = add_date_styles(workbook.archive.read(styles_path), workbook.epoch)
+
+        with open(src_path, "rb") as source, zipfile.ZipFile(dest_path, "w") as target:
+            _copy_members(workbook, source, target, {styles_path: styles_xml}, {sheet_path, rels_path_for(sheet_path)})
+            sheet_info = zipfile.ZipInfo(sheet_path, time.localtime()[:6])
+            sheet_info.compress_type = zipfile.ZIP_DEFLATED
+            with target.open(sheet_info, "w", force_zip64=True) as dest:
+                dest.write(SHEET_XML_HEAD)
+                parts, size = [], 0
+                for row_number, row in enumerate(rows, 1):
+                    cells = []
+                    for col_idx, value in enumerate(row, 1):
+                        cell = _cell_xml(f"{get_column_letter(col_idx)}{row_number}", value, date_styles)
+                        if cell is not None:
+                            cells.append(cell)
+                    if cells:
+                        part = f'<row r="{row_number}">{"".join(cells)}</row>'.encode("utf-8")
+                        parts.append(part)
+                        size += len(part)
+                    if size >= WRITE_CHUNK_SIZE:
+                        dest.write(b"".join(parts))
+                        parts, size = [], 0
+                dest.write(b"".join(parts))
+                dest.write(SHEET_XML_TAIL)
+        return True
+    finally:
+        workbook.close()